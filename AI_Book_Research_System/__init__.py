@@ -0,0 +1 @@
+"""AI Book Research System: research, writing, expansion and export engines."""
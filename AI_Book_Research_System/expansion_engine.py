@@ -20,6 +20,8 @@ from typing import Dict, List, Optional, Tuple
 import requests
 import aiohttp
 
+from rate_limiter import RateLimiter, get_shared_rate_limiter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,9 +33,10 @@ logger = logging.getLogger(__name__)
 class AIExpansionEngine:
     """AI-powered expansion engine for book content."""
     
-    def __init__(self, project_dir: str, config_file: str):
+    def __init__(self, project_dir: str, config_file: str, rate_limiter: Optional[RateLimiter] = None):
         self.project_dir = Path(project_dir)
         self.config_file = Path(config_file)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
         
         # Load configuration
         with open(self.config_file, 'r') as f:
@@ -127,6 +130,8 @@ class AIExpansionEngine:
         if self.config["apis"]["ollama"]["enabled"]:
             self.ollama_base_url = self.config["apis"]["ollama"]["base_url"]
             logger.info("Ollama client configured")
+        
+        self.rate_limiter.configure_from_api_config(self.config["apis"])
     
     def load_chapter_content(self, chapter_file: str) -> str:
         """Load chapter content from file."""
@@ -272,6 +277,7 @@ Structure:
 3. Specific examples and applications
 4. Contemplative conclusion"""
 
+            await self.rate_limiter.acquire("openai", self.config["apis"]["openai"]["max_tokens"])
             response = await self.api_clients["openai"].ChatCompletion.acreate(
                 model=self.config["apis"]["openai"]["model"],
                 messages=[
@@ -312,6 +318,7 @@ Requirements:
                 "stream": False
             }
             
+            await self.rate_limiter.acquire("ollama", len(data["prompt"]) // 4)
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data) as response:
                     if response.status == 200:
@@ -397,6 +404,7 @@ Structure:
 3. Contemplative reflection
 4. Integration with broader themes"""
 
+            await self.rate_limiter.acquire("openai", self.config["apis"]["openai"]["max_tokens"])
             response = await self.api_clients["openai"].ChatCompletion.acreate(
                 model=self.config["apis"]["openai"]["model"],
                 messages=[
@@ -434,6 +442,7 @@ Requirements:
                 "stream": False
             }
             
+            await self.rate_limiter.acquire("ollama", len(data["prompt"]) // 4)
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data) as response:
                     if response.status == 200:
@@ -528,9 +537,6 @@ Requirements:
                     })
                     
                     logger.info(f"Chapter {chapter['number']} expanded: {original_words} → {expanded_words} words ({expansion_ratio:.2f}x)")
-                    
-                    # Small delay to avoid overwhelming APIs
-                    await asyncio.sleep(1)
             
             # Calculate overall expansion ratio
             overall_expansion_ratio = total_expanded_words / total_original_words if total_original_words > 0 else 0
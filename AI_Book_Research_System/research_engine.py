@@ -20,6 +20,8 @@ from typing import Dict, List, Optional, Tuple
 import requests
 import aiohttp
 
+from rate_limiter import RateLimiter, get_shared_rate_limiter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,9 +33,10 @@ logger = logging.getLogger(__name__)
 class AIResearchEngine:
     """AI-powered research engine for book content."""
     
-    def __init__(self, project_dir: str, config_file: str):
+    def __init__(self, project_dir: str, config_file: str, rate_limiter: Optional[RateLimiter] = None):
         self.project_dir = Path(project_dir)
         self.config_file = Path(config_file)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
         
         # Load configuration
         with open(self.config_file, 'r') as f:
@@ -99,6 +102,8 @@ class AIResearchEngine:
             self.ollama_base_url = self.config["apis"]["ollama"]["base_url"]
             logger.info("Ollama client configured")
         
+        self.rate_limiter.configure_from_api_config(self.config["apis"])
+        
         # Web search client
         if self.config["apis"]["web_search"]["enabled"]:
             logger.info("Web search client configured")
@@ -284,6 +289,7 @@ class AIResearchEngine:
     async def openai_analyze(self, topic: str, context: str) -> Dict:
         """Analyze using OpenAI API."""
         try:
+            await self.rate_limiter.acquire("openai", self.config["apis"]["openai"]["max_tokens"])
             response = await self.api_clients["openai"].ChatCompletion.acreate(
                 model=self.config["apis"]["openai"]["model"],
                 messages=[
@@ -313,6 +319,7 @@ class AIResearchEngine:
                 "stream": False
             }
             
+            await self.rate_limiter.acquire("ollama", len(data["prompt"]) // 4)
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data) as response:
                     if response.status == 200:
@@ -430,9 +437,6 @@ class AIResearchEngine:
             logger.info(f"Researching topic: {topic}")
             topic_research = await self.research_topic(topic)
             research_results["topics"][topic] = topic_research
-            
-            # Small delay to avoid overwhelming APIs
-            await asyncio.sleep(1)
         
         # Calculate overall quality
         quality_scores = [data["quality_score"] for data in research_results["topics"].values()]
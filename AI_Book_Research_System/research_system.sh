@@ -7,6 +7,7 @@ set -e
 
 # Configuration
 SYSTEM_DIR="$(dirname "$0")"
+REPO_ROOT="$(cd "$SYSTEM_DIR/.." && pwd)"
 PROJECTS_DIR="$SYSTEM_DIR/projects"
 TEMPLATES_DIR="$SYSTEM_DIR/templates"
 LOGS_DIR="$SYSTEM_DIR/logs"
@@ -263,7 +264,7 @@ research_project() {
     log "Starting research phase for project: $project_name"
     
     # Run Python research script
-    python3 "$SYSTEM_DIR/research_engine.py" \
+    PYTHONPATH="$REPO_ROOT${PYTHONPATH:+:$PYTHONPATH}" python3 -m AI_Book_Research_System.research_engine \
         --project-dir "$project_dir" \
         --config-file "$CONFIG_FILE" \
         --phase research
@@ -295,7 +296,7 @@ write_project() {
     log "Starting writing phase for project: $project_name"
     
     # Run Python writing script
-    python3 "$SYSTEM_DIR/writing_engine.py" \
+    PYTHONPATH="$REPO_ROOT${PYTHONPATH:+:$PYTHONPATH}" python3 -m AI_Book_Research_System.writing_engine \
         --project-dir "$project_dir" \
         --config-file "$CONFIG_FILE" \
         --phase writing
@@ -327,7 +328,7 @@ expand_project() {
     log "Starting expansion phase for project: $project_name"
     
     # Run Python expansion script
-    python3 "$SYSTEM_DIR/expansion_engine.py" \
+    PYTHONPATH="$REPO_ROOT${PYTHONPATH:+:$PYTHONPATH}" python3 -m AI_Book_Research_System.expansion_engine \
         --project-dir "$project_dir" \
         --config-file "$CONFIG_FILE" \
         --phase expansion
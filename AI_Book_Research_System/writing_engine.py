@@ -20,6 +20,8 @@ from typing import Dict, List, Optional, Tuple
 import requests
 import aiohttp
 
+from rate_limiter import RateLimiter, get_shared_rate_limiter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -31,9 +33,10 @@ logger = logging.getLogger(__name__)
 class AIWritingEngine:
     """AI-powered writing engine for book content."""
     
-    def __init__(self, project_dir: str, config_file: str):
+    def __init__(self, project_dir: str, config_file: str, rate_limiter: Optional[RateLimiter] = None):
         self.project_dir = Path(project_dir)
         self.config_file = Path(config_file)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
         
         # Load configuration
         with open(self.config_file, 'r') as f:
@@ -88,6 +91,8 @@ class AIWritingEngine:
         if self.config["apis"]["ollama"]["enabled"]:
             self.ollama_base_url = self.config["apis"]["ollama"]["base_url"]
             logger.info("Ollama client configured")
+        
+        self.rate_limiter.configure_from_api_config(self.config["apis"])
     
     def get_chapter_outline(self, theme: str, target_chapters: int) -> List[Dict]:
         """Generate chapter outline based on theme."""
@@ -283,6 +288,7 @@ Structure:
 3. Personal reflection
 4. Contemplative closing"""
 
+            await self.rate_limiter.acquire("openai", self.config["apis"]["openai"]["max_tokens"])
             response = await self.api_clients["openai"].ChatCompletion.acreate(
                 model=self.config["apis"]["openai"]["model"],
                 messages=[
@@ -324,6 +330,7 @@ Requirements:
                 "stream": False
             }
             
+            await self.rate_limiter.acquire("ollama", len(data["prompt"]) // 4)
             async with aiohttp.ClientSession() as session:
                 async with session.post(url, json=data) as response:
                     if response.status == 200:
@@ -423,9 +430,6 @@ Requirements:
                 })
                 
                 logger.info(f"Chapter {chapter['number']} written: {word_count} words")
-                
-                # Small delay to avoid overwhelming APIs
-                await asyncio.sleep(1)
             
             # Update project config
             self.project_config["writing"]["chapters"] = written_chapters
@@ -6,22 +6,29 @@ Coordinates research, writer, editor, and tool agents.
 
 Chosen libraries:
 - asyncio: Asynchronous agent orchestration
+- heapq: Priority-ordered queue of ready tasks
 - pydantic: Data validation and type safety
 - logging: Comprehensive audit logging
 
 Adapted from: LangGraph (https://github.com/langchain-ai/langgraph)
-Pattern: Graph-based orchestration with state management
+Pattern: Graph-based orchestration with state management and an
+event-driven dependency scheduler
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
+import time
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import pydantic
 
+from audit_log import AuditLog
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,6 +63,7 @@ class AgentTask(pydantic.BaseModel):
     error_message: Optional[str] = None
     dependencies: List[str] = []
     priority: int = 0
+    agent_type: Optional[str] = None
 
 
 class AgentInfo(pydantic.BaseModel):
@@ -67,6 +75,8 @@ class AgentInfo(pydantic.BaseModel):
     capabilities: List[str] = []
     created_at: datetime
     last_activity: Optional[datetime] = None
+    max_concurrent_tasks: Optional[int] = None
+    active_tasks: int = 0
 
 
 class WorkflowState(pydantic.BaseModel):
@@ -80,6 +90,22 @@ class WorkflowState(pydantic.BaseModel):
     updated_at: datetime
 
 
+class AgentPool:
+    """Instances, ready queue and utilisation counters for one agent type."""
+    
+    def __init__(self, agent_type: str, max_concurrent_tasks: Optional[int] = None):
+        self.agent_type = agent_type
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self.agent_ids: List[str] = []
+        self.ready_tasks: List[Tuple[int, int, str]] = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.stolen = 0
+        self.busy_seconds = 0.0
+        self.created_at = time.monotonic()
+
+
 class AgentManager:
     """
     Manages agent orchestration and task coordination.
@@ -87,25 +113,46 @@ class AgentManager:
     Responsibilities:
     - Coordinate multiple agents (research, writer, editor, tool)
     - Manage task routing and lifecycle
+    - Run tasks in per-agent-type pools with their own concurrency limits
     - Handle agent communication and delegation
     - Maintain audit logs and state management
     - Support both synchronous and asynchronous workflows
     """
     
-    def __init__(self, max_concurrent_tasks: int = 5):
+    def __init__(
+        self,
+        max_concurrent_tasks: int = 5,
+        pool_limits: Optional[Dict[str, int]] = None,
+        audit_log: Optional[AuditLog] = None
+    ):
         """
         Initialize the agent manager.
         
         Args:
-            max_concurrent_tasks: Maximum number of concurrent tasks
+            max_concurrent_tasks: Maximum number of concurrent tasks overall
+            pool_limits: Maximum concurrent tasks per agent type (defaults to
+                the combined capacity of the type's registered instances)
+            audit_log: Audit log to record events in (defaults to a bounded
+                in-memory log)
         """
         self.max_concurrent_tasks = max_concurrent_tasks
         self.agents: Dict[str, Any] = {}
         self.tasks: Dict[str, AgentTask] = {}
         self.workflows: Dict[str, WorkflowState] = {}
-        self.task_queue = asyncio.Queue()
         self.running_tasks: Dict[str, asyncio.Task] = {}
-        self.audit_log: List[Dict[str, Any]] = []
+        self.audit_log = audit_log if audit_log is not None else AuditLog()
+        
+        # Dependency scheduler state: tasks whose dependencies are all met sit
+        # in their agent type's (-priority, sequence) heap; the rest wait on
+        # their dependencies
+        self.pools: Dict[str, AgentPool] = {}
+        self._task_sequence = itertools.count()
+        self._unmet_dependencies: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        self._ready_event: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        for agent_type, limit in (pool_limits or {}).items():
+            self.set_pool_limit(agent_type, limit)
         
         # Start task processor
         self._task_processor = None
@@ -116,6 +163,8 @@ class AgentManager:
     async def start(self):
         """Start the agent manager and task processor."""
         if self._task_processor is None:
+            self._ready_event = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.max_concurrent_tasks)
             self._task_processor = asyncio.create_task(self._process_tasks())
             logger.info("Agent manager started")
     
@@ -135,30 +184,53 @@ class AgentManager:
             except asyncio.CancelledError:
                 pass
         
+        # Persist audit events still queued for the background writer
+        await asyncio.get_running_loop().run_in_executor(None, self.audit_log.flush)
+        
         logger.info("Agent manager stopped")
     
-    def register_agent(self, agent: Any, agent_id: str, agent_type: str, capabilities: List[str]):
+    def register_agent(
+        self,
+        agent: Any,
+        agent_id: str,
+        agent_type: str,
+        capabilities: List[str],
+        max_concurrent_tasks: Optional[int] = None
+    ):
         """
         Register an agent with the manager.
         
+        Several instances may share an agent type; they form a pool and
+        idle instances pick up tasks queued for any instance of the type.
+        
         Args:
             agent: Agent instance
             agent_id: Unique agent identifier
             agent_type: Type of agent (research, writer, editor, tool)
             capabilities: List of agent capabilities
+            max_concurrent_tasks: Tasks this instance may run at once (None
+                leaves it bounded only by its pool and the global limit)
         """
+        if max_concurrent_tasks is not None and max_concurrent_tasks < 1:
+            raise ValueError("max_concurrent_tasks must be at least 1")
+        
+        if agent_id in self.agents:
+            self._remove_from_pool(agent_id)
+        
         agent_info = AgentInfo(
             agent_id=agent_id,
             agent_type=agent_type,
             status=AgentStatus.IDLE,
             capabilities=capabilities,
-            created_at=datetime.now()
+            created_at=datetime.now(),
+            max_concurrent_tasks=max_concurrent_tasks
         )
         
         self.agents[agent_id] = {
             "instance": agent,
             "info": agent_info
         }
+        self._get_pool(agent_type).agent_ids.append(agent_id)
         
         self._log_audit("agent_registered", {
             "agent_id": agent_id,
@@ -167,14 +239,57 @@ class AgentManager:
         })
         
         logger.info(f"Registered agent: {agent_id} ({agent_type})")
+        self._wake_dispatcher()
     
     def unregister_agent(self, agent_id: str):
         """Unregister an agent."""
         if agent_id in self.agents:
+            self._remove_from_pool(agent_id)
             del self.agents[agent_id]
             self._log_audit("agent_unregistered", {"agent_id": agent_id})
             logger.info(f"Unregistered agent: {agent_id}")
     
+    def set_pool_limit(self, agent_type: str, max_concurrent_tasks: Optional[int]):
+        """
+        Limit how many tasks of one agent type run at once.
+        
+        Args:
+            agent_type: Agent type
+            max_concurrent_tasks: Pool limit, or None for the combined
+                capacity of the type's instances
+        """
+        if max_concurrent_tasks is not None and max_concurrent_tasks < 1:
+            raise ValueError("max_concurrent_tasks must be at least 1")
+        self._get_pool(agent_type).max_concurrent_tasks = max_concurrent_tasks
+        self._wake_dispatcher()
+    
+    def _get_pool(self, agent_type: str) -> AgentPool:
+        """Get or create the pool for an agent type."""
+        if agent_type not in self.pools:
+            self.pools[agent_type] = AgentPool(agent_type)
+        return self.pools[agent_type]
+    
+    def _remove_from_pool(self, agent_id: str):
+        """Detach an agent from its pool; queued tasks stay with the pool."""
+        pool = self.pools.get(self.agents[agent_id]["info"].agent_type)
+        if pool and agent_id in pool.agent_ids:
+            pool.agent_ids.remove(agent_id)
+    
+    def _pool_capacity(self, pool: AgentPool) -> int:
+        """Effective concurrency limit of a pool."""
+        if not pool.agent_ids:
+            return 0
+        limits = [self.agents[agent_id]["info"].max_concurrent_tasks for agent_id in pool.agent_ids]
+        capacity = self.max_concurrent_tasks if None in limits else sum(limits)
+        if pool.max_concurrent_tasks is not None:
+            capacity = min(capacity, pool.max_concurrent_tasks)
+        return capacity
+    
+    @staticmethod
+    def _has_room(info: AgentInfo) -> bool:
+        """Whether an agent instance can take another task."""
+        return info.max_concurrent_tasks is None or info.active_tasks < info.max_concurrent_tasks
+    
     async def submit_task(
         self,
         agent_id: str,
@@ -186,8 +301,12 @@ class AgentManager:
         """
         Submit a task to an agent.
         
+        If the target agent is busy when the task becomes ready, an idle
+        instance of the same agent type runs it instead.
+        
         Args:
-            agent_id: Target agent ID
+            agent_id: Target agent ID, or an agent type to let any instance
+                of that type run the task
             task_type: Type of task
             payload: Task payload
             priority: Task priority (higher = more important)
@@ -196,7 +315,11 @@ class AgentManager:
         Returns:
             Task ID
         """
-        if agent_id not in self.agents:
+        if agent_id in self.agents:
+            agent_type = self.agents[agent_id]["info"].agent_type
+        elif agent_id in self.pools:
+            agent_type = agent_id
+        else:
             raise ValueError(f"Agent {agent_id} not found")
         
         task_id = f"task_{agent_id}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
@@ -208,11 +331,11 @@ class AgentManager:
             payload=payload,
             priority=priority,
             dependencies=dependencies or [],
-            created_at=datetime.now()
+            created_at=datetime.now(),
+            agent_type=agent_type
         )
         
         self.tasks[task_id] = task
-        await self.task_queue.put(task)
         
         self._log_audit("task_submitted", {
             "task_id": task_id,
@@ -222,6 +345,7 @@ class AgentManager:
         })
         
         logger.info(f"Submitted task {task_id} to agent {agent_id}")
+        self._schedule_task(task)
         return task_id
     
     async def get_task_result(self, task_id: str) -> Optional[Any]:
@@ -240,6 +364,7 @@ class AgentManager:
         if task.status in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]:
             task.status = TaskStatus.CANCELLED
             task.completed_at = datetime.now()
+            self._unmet_dependencies.pop(task_id, None)
             
             # Cancel running task if exists
             if task_id in self.running_tasks:
@@ -248,6 +373,7 @@ class AgentManager:
             
             self._log_audit("task_cancelled", {"task_id": task_id})
             logger.info(f"Cancelled task {task_id}")
+            self._cancel_dependents(task_id)
             return True
         
         return False
@@ -334,62 +460,201 @@ class AgentManager:
         
         return task_id
     
-    async def _process_tasks(self):
-        """Process tasks from the queue."""
-        while not self._shutdown:
-            try:
-                # Wait for task with timeout
-                task = await asyncio.wait_for(self.task_queue.get(), timeout=1.0)
-                
-                # Check if we can run more tasks
-                if len(self.running_tasks) >= self.max_concurrent_tasks:
-                    # Put task back and wait
-                    await self.task_queue.put(task)
-                    await asyncio.sleep(0.1)
-                    continue
-                
-                # Check dependencies
-                if not await self._check_dependencies(task):
-                    # Put task back and wait
-                    await self.task_queue.put(task)
-                    await asyncio.sleep(0.1)
+    def _schedule_task(self, task: AgentTask):
+        """Queue a task as ready, or register it to wait on its dependencies."""
+        unmet = set()
+        for dep_id in task.dependencies:
+            dep_task = self.tasks.get(dep_id)
+            if dep_task is None:
+                self._fail_unrunnable(task, f"Unknown dependency {dep_id}")
+                return
+            if dep_task.status in (TaskStatus.FAILED, TaskStatus.CANCELLED):
+                self._fail_unrunnable(task, f"Dependency {dep_id} {dep_task.status.value}")
+                return
+            if dep_task.status != TaskStatus.COMPLETED:
+                unmet.add(dep_id)
+        
+        if not unmet:
+            self._push_ready(task)
+            return
+        
+        self._unmet_dependencies[task.task_id] = unmet
+        for dep_id in unmet:
+            self._dependents.setdefault(dep_id, set()).add(task.task_id)
+    
+    def _push_ready(self, task: AgentTask):
+        """Add a task to its pool's ready heap and wake the dispatcher."""
+        heapq.heappush(
+            self._get_pool(task.agent_type).ready_tasks,
+            (-task.priority, next(self._task_sequence), task.task_id)
+        )
+        self._wake_dispatcher()
+    
+    def _wake_dispatcher(self):
+        """Signal the dispatcher that a task or a slot may have become available."""
+        if self._ready_event is not None:
+            self._ready_event.set()
+    
+    def _on_task_finished(self, task: AgentTask):
+        """Release dependents of a finished task, or cancel them if it did not complete."""
+        if task.status != TaskStatus.COMPLETED:
+            self._cancel_dependents(task.task_id)
+            return
+        
+        for dependent_id in self._dependents.pop(task.task_id, set()):
+            unmet = self._unmet_dependencies.get(dependent_id)
+            if unmet is None:
+                continue
+            unmet.discard(task.task_id)
+            if not unmet:
+                del self._unmet_dependencies[dependent_id]
+                dependent = self.tasks[dependent_id]
+                if dependent.status == TaskStatus.PENDING:
+                    self._push_ready(dependent)
+    
+    def _cancel_dependents(self, task_id: str):
+        """Cancel every task that transitively depends on a failed or cancelled task."""
+        stack = [task_id]
+        while stack:
+            failed_id = stack.pop()
+            for dependent_id in self._dependents.pop(failed_id, set()):
+                dependent = self.tasks[dependent_id]
+                if dependent.status != TaskStatus.PENDING:
                     continue
+                self._unmet_dependencies.pop(dependent_id, None)
+                dependent.status = TaskStatus.CANCELLED
+                dependent.completed_at = datetime.now()
+                dependent.error_message = f"Dependency {failed_id} did not complete"
                 
-                # Start task execution
-                asyncio.create_task(self._execute_task(task))
-                
-            except asyncio.TimeoutError:
+                self._log_audit("task_cancelled", {
+                    "task_id": dependent_id,
+                    "reason": dependent.error_message
+                })
+                logger.info(f"Cancelled task {dependent_id}: {dependent.error_message}")
+                stack.append(dependent_id)
+    
+    def _fail_unrunnable(self, task: AgentTask, reason: str):
+        """Cancel a task whose dependencies can never complete."""
+        task.status = TaskStatus.CANCELLED
+        task.completed_at = datetime.now()
+        task.error_message = reason
+        self._log_audit("task_cancelled", {"task_id": task.task_id, "reason": reason})
+        logger.warning(f"Cancelled task {task.task_id}: {reason}")
+    
+    def _pick_instance(self, pool: AgentPool, preferred: str) -> Optional[str]:
+        """Choose the preferred instance if it has room, else the least loaded one."""
+        available = [
+            agent_id for agent_id in pool.agent_ids
+            if self._has_room(self.agents[agent_id]["info"])
+        ]
+        if not available:
+            return None
+        if preferred in available:
+            return preferred
+        return min(available, key=lambda agent_id: self.agents[agent_id]["info"].active_tasks)
+    
+    def _next_dispatch(self) -> Optional[Tuple[AgentTask, str]]:
+        """
+        Pop the highest-priority ready task that has a free pool slot and instance.
+        
+        Returns:
+            (task, agent_id) to run, or None if nothing can run yet
+        """
+        best: Optional[Tuple[Tuple[int, int, str], AgentPool, str]] = None
+        for pool in self.pools.values():
+            # Drop entries cancelled while queued
+            while pool.ready_tasks and self.tasks[pool.ready_tasks[0][2]].status != TaskStatus.PENDING:
+                heapq.heappop(pool.ready_tasks)
+            if not pool.ready_tasks or pool.running >= self._pool_capacity(pool):
                 continue
-            except Exception as e:
-                logger.error(f"Error in task processor: {e}")
+            
+            entry = pool.ready_tasks[0]
+            agent_id = self._pick_instance(pool, self.tasks[entry[2]].agent_id)
+            if agent_id is not None and (best is None or entry < best[0]):
+                best = (entry, pool, agent_id)
+        
+        if best is None:
+            return None
+        
+        entry, pool, agent_id = best
+        heapq.heappop(pool.ready_tasks)
+        task = self.tasks[entry[2]]
+        if task.agent_id != agent_id:
+            if task.agent_id in self.agents:
+                pool.stolen += 1
+                logger.debug(f"Task {task.task_id} taken over by idle agent {agent_id}")
+            task.agent_id = agent_id
+        return task, agent_id
     
-    async def _check_dependencies(self, task: AgentTask) -> bool:
-        """Check if task dependencies are satisfied."""
-        for dep_id in task.dependencies:
-            dep_task = self.tasks.get(dep_id)
-            if not dep_task or dep_task.status != TaskStatus.COMPLETED:
-                return False
-        return True
+    async def _process_tasks(self):
+        """Dispatch ready tasks in priority order as concurrency slots free up."""
+        while not self._shutdown:
+            await self._slots.acquire()
+            try:
+                while True:
+                    dispatch = self._next_dispatch()
+                    if dispatch is not None:
+                        break
+                    self._ready_event.clear()
+                    await self._ready_event.wait()
+            except BaseException:
+                self._slots.release()
+                raise
+            
+            task, agent_id = dispatch
+            self._task_started(task, agent_id)
+            running = asyncio.create_task(self._execute_task(task))
+            self.running_tasks[task.task_id] = running
+            running.add_done_callback(
+                lambda _, task=task, agent_id=agent_id: self._task_done(task, agent_id)
+            )
+    
+    def _task_started(self, task: AgentTask, agent_id: str):
+        """Account a dispatched task against its agent and pool."""
+        info = self.agents[agent_id]["info"]
+        info.active_tasks += 1
+        info.current_task = task.task_id
+        info.last_activity = datetime.now()
+        info.status = AgentStatus.BUSY
+        self.pools[info.agent_type].running += 1
+    
+    def _task_finished(self, task: AgentTask, agent_id: str, started: float):
+        """Release the agent and pool capacity of a finished task and count its outcome."""
+        pool = self.pools[task.agent_type]
+        pool.running -= 1
+        pool.busy_seconds += time.monotonic() - started
+        if task.status == TaskStatus.COMPLETED:
+            pool.completed += 1
+        elif task.status == TaskStatus.FAILED:
+            pool.failed += 1
+        
+        if agent_id in self.agents:
+            info = self.agents[agent_id]["info"]
+            info.active_tasks -= 1
+            if info.active_tasks == 0:
+                info.status = AgentStatus.IDLE
+                info.current_task = None
+            info.last_activity = datetime.now()
+    
+    def _task_done(self, task: AgentTask, agent_id: str):
+        """Release the concurrency slot of a finished task and wake the dispatcher."""
+        if task.started_at is None:
+            # Cancelled before its first step, so _execute_task never accounted it
+            self._task_finished(task, agent_id, time.monotonic())
+        self._slots.release()
+        self._wake_dispatcher()
     
     async def _execute_task(self, task: AgentTask):
         """Execute a task."""
         task_id = task.task_id
         agent_id = task.agent_id
+        started = time.monotonic()
         
         try:
             # Update task status
             task.status = TaskStatus.IN_PROGRESS
             task.started_at = datetime.now()
             
-            # Update agent status
-            if agent_id in self.agents:
-                self.agents[agent_id]["info"].status = AgentStatus.BUSY
-                self.agents[agent_id]["info"].current_task = task_id
-                self.agents[agent_id]["info"].last_activity = datetime.now()
-            
-            # Store running task
-            self.running_tasks[task_id] = asyncio.current_task()
-            
             # Get agent instance
             agent = self.agents[agent_id]["instance"]
             
@@ -429,12 +694,10 @@ class AgentManager:
             # Clean up
             if task_id in self.running_tasks:
                 del self.running_tasks[task_id]
-            
-            # Update agent status
-            if agent_id in self.agents:
-                self.agents[agent_id]["info"].status = AgentStatus.IDLE
-                self.agents[agent_id]["info"].current_task = None
-                self.agents[agent_id]["info"].last_activity = datetime.now()
+            # Account the task in the same step that makes its status visible,
+            # so pool stats never lag behind a completed task
+            self._task_finished(task, agent_id, started)
+            self._on_task_finished(task)
     
     async def _generic_task_execution(self, agent: Any, task: AgentTask) -> Any:
         """Generic task execution fallback."""
@@ -451,12 +714,7 @@ class AgentManager:
     
     def _log_audit(self, event_type: str, data: Dict[str, Any]):
         """Log audit event."""
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "event_type": event_type,
-            "data": data
-        }
-        self.audit_log.append(log_entry)
+        self.audit_log.append(event_type, data)
     
     def get_agent_status(self, agent_id: str) -> Optional[AgentInfo]:
         """Get agent status."""
@@ -473,8 +731,36 @@ class AgentManager:
         return self.workflows.get(workflow_id)
     
     def get_audit_log(self, limit: int = 100) -> List[Dict[str, Any]]:
-        """Get recent audit log entries."""
-        return self.audit_log[-limit:]
+        """Get the most recent in-memory audit log entries, oldest first."""
+        return self.audit_log.tail(limit)
+    
+    async def query_audit_log(
+        self,
+        task_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find audit log entries matching every given filter, oldest first.
+        
+        Uses the persistent store when one is configured. The query waits for
+        pending writes, so it runs in an executor rather than on the event loop.
+        
+        Args:
+            task_id: Only events for this task
+            agent_id: Only events for this agent
+            event_type: Only events of this type
+            since: Only events at or after this time
+            until: Only events at or before this time
+            limit: Maximum number of entries
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            None,
+            lambda: self.audit_log.query(task_id, agent_id, event_type, since, until, limit)
+        )
     
     def get_stats(self) -> Dict[str, Any]:
         """Get agent manager statistics."""
@@ -483,7 +769,12 @@ class AgentManager:
             "total_tasks": len(self.tasks),
             "running_tasks": len(self.running_tasks),
             "total_workflows": len(self.workflows),
-            "task_queue_size": self.task_queue.qsize(),
+            "task_queue_size": sum(len(pool.ready_tasks) for pool in self.pools.values()),
+            "waiting_tasks": len(self._unmet_dependencies),
+            "pools": {
+                agent_type: self._get_pool_stats(pool)
+                for agent_type, pool in self.pools.items()
+            },
             "agents_by_status": {
                 status.value: sum(1 for agent in self.agents.values() 
                                 if agent["info"].status == status)
@@ -494,4 +785,22 @@ class AgentManager:
                                 if task.status == status)
                 for status in TaskStatus
             }
-        }
\ No newline at end of file
+        }
+    
+    def _get_pool_stats(self, pool: AgentPool) -> Dict[str, Any]:
+        """Get utilisation figures for one agent pool."""
+        capacity = self._pool_capacity(pool)
+        elapsed = time.monotonic() - pool.created_at
+        return {
+            "instances": len(pool.agent_ids),
+            "capacity": capacity,
+            "running": pool.running,
+            "queued": len(pool.ready_tasks),
+            "completed": pool.completed,
+            "failed": pool.failed,
+            "stolen": pool.stolen,
+            "utilisation": pool.running / capacity if capacity else 0.0,
+            "average_utilisation": (
+                pool.busy_seconds / (capacity * elapsed) if capacity and elapsed else 0.0
+            )
+        }
@@ -0,0 +1,379 @@
+"""
+Audit Log Module
+
+Bounded audit trail for agent orchestration. Recent events are kept in a
+fixed-size in-memory ring buffer; every event can also be persisted to an
+append-only SQLite store that rotates to a new file once it grows past a
+size limit. Persistence happens on a background writer thread so the
+scheduler's hot path only appends to a bounded queue; if the writer falls
+that far behind, new events are kept in memory only and counted as dropped.
+
+Chosen libraries:
+- collections.deque: Ring-buffered in-memory tail
+- sqlite3: Indexed, append-only persistent store
+- threading/queue: Background batch writer
+
+Pattern: Write-behind log with a bounded in-memory tail
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _matches(
+    entry: Dict[str, Any],
+    task_id: Optional[str],
+    agent_id: Optional[str],
+    event_type: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime]
+) -> bool:
+    """Check an in-memory entry against query filters."""
+    if task_id is not None and entry["task_id"] != task_id:
+        return False
+    if agent_id is not None and entry["agent_id"] != agent_id:
+        return False
+    if event_type is not None and entry["event_type"] != event_type:
+        return False
+    if since is not None and entry["timestamp"] < since.isoformat():
+        return False
+    if until is not None and entry["timestamp"] > until.isoformat():
+        return False
+    return True
+
+
+class SQLiteAuditStore:
+    """
+    Append-only SQLite audit store with size-based rotation.
+
+    The active database is ``audit_log.sqlite``; when it exceeds
+    ``max_bytes`` it is renamed to ``audit_log.1.sqlite`` (shifting older
+    files up) and at most ``backup_count`` rotated files are kept.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the audit databases
+            max_bytes: Size at which the active database is rotated
+            backup_count: Number of rotated databases to keep
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.db_path = self.directory / "audit_log.sqlite"
+        self._lock = threading.Lock()
+        self._conn = self._connect(self.db_path)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(path), check_same_thread=False)
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS audit_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                task_id TEXT,
+                agent_id TEXT,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        for column in ("timestamp", "event_type", "task_id", "agent_id"):
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_audit_{column} ON audit_events ({column})"
+            )
+        conn.commit()
+        return conn
+
+    def _rotated_path(self, index: int) -> Path:
+        return self.directory / f"audit_log.{index}.sqlite"
+
+    def write(self, entries: List[Dict[str, Any]]):
+        """Append a batch of entries, rotating afterwards if the file is too large."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO audit_events (timestamp, event_type, task_id, agent_id, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (entry["timestamp"], entry["event_type"], entry["task_id"],
+                     entry["agent_id"], json.dumps(entry["data"], default=str))
+                    for entry in entries
+                ]
+            )
+            self._conn.commit()
+            if self.db_path.stat().st_size >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        """Move the active database aside and start a new one."""
+        self._conn.close()
+        oldest = self._rotated_path(self.backup_count)
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(self.backup_count - 1, 0, -1):
+            path = self._rotated_path(index)
+            if path.exists():
+                path.rename(self._rotated_path(index + 1))
+        if self.backup_count > 0:
+            self.db_path.rename(self._rotated_path(1))
+        else:
+            self.db_path.unlink()
+        self._conn = self._connect(self.db_path)
+        logger.info(f"Rotated audit log in {self.directory}")
+
+    def query(
+        self,
+        task_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the most recent matching events across the active and rotated files.
+
+        Returns:
+            Up to ``limit`` entries, oldest first
+        """
+        clauses, params = [], []
+        for column, value in (("task_id", task_id), ("agent_id", agent_id), ("event_type", event_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(until.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT timestamp, event_type, task_id, agent_id, data FROM audit_events "
+            f"{where} ORDER BY id DESC LIMIT ?"
+        )
+
+        results: List[Dict[str, Any]] = []
+        with self._lock:
+            for conn, close in self._connections():
+                try:
+                    rows = conn.execute(sql, params + [limit - len(results)]).fetchall()
+                finally:
+                    if close:
+                        conn.close()
+                results.extend(
+                    {
+                        "timestamp": row[0],
+                        "event_type": row[1],
+                        "task_id": row[2],
+                        "agent_id": row[3],
+                        "data": json.loads(row[4])
+                    }
+                    for row in rows
+                )
+                if len(results) >= limit:
+                    break
+
+        results.reverse()
+        return results
+
+    def _connections(self) -> Iterator:
+        """Yield (connection, should_close) from newest to oldest file."""
+        yield self._conn, False
+        for index in range(1, self.backup_count + 1):
+            path = self._rotated_path(index)
+            if path.exists():
+                yield sqlite3.connect(f"file:{path}?mode=ro", uri=True), True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class AuditLog:
+    """
+    Bounded audit log with optional write-behind persistence.
+
+    Responsibilities:
+    - Keep the most recent events in a fixed-size ring buffer
+    - Hand events to a background thread that batches them into the store
+    - Answer queries by task, agent, event type and time range
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        store: Optional[SQLiteAuditStore] = None,
+        batch_size: int = 100,
+        max_queue_size: int = 10000
+    ):
+        """
+        Initialize the audit log.
+
+        Args:
+            max_entries: Events kept in memory
+            store: Persistent store (None keeps the log in memory only)
+            batch_size: Maximum events written per store transaction
+            max_queue_size: Events that may wait for the writer before new ones are dropped
+        """
+        self.max_entries = max_entries
+        self.store = store
+        self.batch_size = batch_size
+        self.dropped_writes = 0
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=max_entries)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._writer: Optional[threading.Thread] = None
+        if store is not None:
+            self._writer = threading.Thread(target=self._write_loop, name="audit-log-writer", daemon=True)
+            self._writer.start()
+
+    @classmethod
+    def with_store(
+        cls,
+        directory: Union[str, Path],
+        max_entries: int = 1000,
+        max_bytes: int = 50 * 1024 * 1024,
+        backup_count: int = 5,
+        max_queue_size: int = 10000
+    ) -> "AuditLog":
+        """Create an audit log persisted to a rotating SQLite store."""
+        return cls(
+            max_entries=max_entries,
+            store=SQLiteAuditStore(directory, max_bytes=max_bytes, backup_count=backup_count),
+            max_queue_size=max_queue_size
+        )
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record an event without blocking on I/O.
+
+        Args:
+            event_type: Event name (e.g. "task_completed")
+            data: Event details; ``task_id`` and ``agent_id`` are indexed
+
+        Returns:
+            The stored entry
+        """
+        entry = {
+            "timestamp": datetime.now().isoformat(),
+            "event_type": event_type,
+            "task_id": data.get("task_id"),
+            "agent_id": data.get("agent_id"),
+            "data": data
+        }
+        self._entries.append(entry)
+        if self._writer is not None:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                self.dropped_writes += 1
+                if self.dropped_writes == 1:
+                    logger.warning("Audit log queue is full; events are no longer persisted")
+        return entry
+
+    def _write_loop(self):
+        """Drain the queue into the store in batches."""
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                self._queue.task_done()
+                return
+
+            batch = [entry]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            try:
+                self.store.write(batch)
+            except Exception as e:
+                self.dropped_writes += len(batch)
+                logger.error(f"Failed to persist {len(batch)} audit events: {e}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def tail(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get the most recent in-memory events, oldest first."""
+        if limit <= 0:
+            return []
+        entries = list(self._entries)
+        return entries[-limit:]
+
+    def query(
+        self,
+        task_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find recent events matching every given filter.
+
+        Queries the persistent store when there is one (after flushing
+        pending writes), otherwise the in-memory tail.
+
+        Returns:
+            Up to ``limit`` entries, oldest first
+        """
+        if self.store is not None:
+            self.flush()
+            return self.store.query(task_id, agent_id, event_type, since, until, limit)
+
+        matches = [
+            entry for entry in self._entries
+            if _matches(entry, task_id, agent_id, event_type, since, until)
+        ]
+        return matches[-limit:] if limit > 0 else []
+
+    def flush(self):
+        """Block until every queued event has been written."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Flush pending events, stop the writer and close the store."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        self._writer = None
+        if self.store is not None:
+            self.store.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._entries))
@@ -21,6 +21,7 @@ import logging
 import os
 import uuid
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -95,8 +96,19 @@ class BookWorkflow:
         writer_agent: WriterAgent,
         editor_agent: EditorAgent,
         tool_agent: ToolAgent,
-        book_builder: BookBuilder
+        book_builder: BookBuilder,
+        max_concurrent_chapters: int = 1
     ):
+        """
+        Initialize the workflow.
+
+        Args:
+            max_concurrent_chapters: Chapters drafted at once; 1 keeps the
+                sequential pipeline where each chapter sees the previous ones
+        """
+        if max_concurrent_chapters < 1:
+            raise ValueError("max_concurrent_chapters must be at least 1")
+
         self.memory_manager = memory_manager
         self.llm_client = llm_client
         self.tool_manager = tool_manager
@@ -106,6 +118,7 @@ class BookWorkflow:
         self.editor_agent = editor_agent
         self.tool_agent = tool_agent
         self.book_builder = book_builder
+        self.max_concurrent_chapters = max_concurrent_chapters
         
         self.current_book: Optional[BookMetadata] = None
         self.workflow_log = []
@@ -135,7 +148,7 @@ class BookWorkflow:
         # Step 2: Research and create outline
         await self._research_and_outline()
         
-        # Step 3: Generate chapters sequentially
+        # Step 3: Generate chapters
         await self._generate_chapters()
         
         # Step 4: Global revision and assembly
@@ -158,12 +171,12 @@ class BookWorkflow:
         
         logger.info("Ingesting reference documents...")
         
-        ingestor = DocumentIngestor(self.memory_manager)
+        ingestor = DocumentIngestor()
         
         for doc_path in document_paths:
             try:
                 if os.path.exists(doc_path):
-                    await ingestor.ingest_document(doc_path)
+                    await ingestor.ingest_document_streaming(doc_path, self.memory_manager)
                     self.workflow_log.append({
                         "step": "document_ingestion",
                         "document": doc_path,
@@ -305,10 +318,15 @@ class BookWorkflow:
         logger.info(f"Created outline with {len(self.current_book.outline.get('chapters', []))} chapters")
     
     async def _generate_chapters(self):
-        """Generate all chapters sequentially with continuity tracking."""
+        """Generate all chapters with continuity tracking."""
         
         logger.info("Generating chapters...")
         
+        if self.max_concurrent_chapters > 1:
+            await self._generate_chapters_concurrently()
+            logger.info("All chapters generated successfully")
+            return
+        
         # Generate introduction
         await self._generate_introduction()
         
@@ -321,6 +339,56 @@ class BookWorkflow:
         
         logger.info("All chapters generated successfully")
     
+    async def _generate_chapters_concurrently(self):
+        """
+        Generate chapters as a dependency graph.
+        
+        The introduction and chapters depend only on the outline, so they run
+        concurrently up to ``max_concurrent_chapters`` at a time, each given a
+        continuity summary built from the outline of the chapters before it.
+        The conclusion depends on every chapter and runs last. Chapters are
+        assembled by their position in the outline regardless of completion
+        order, and chapters the outline leaves unnumbered are numbered by it.
+        """
+        
+        chapter_outlines = self.current_book.outline.get('chapters', [])
+        semaphore = asyncio.Semaphore(self.max_concurrent_chapters)
+        
+        async def run(job):
+            async with semaphore:
+                return await job()
+        
+        # Jobs are coroutine factories so that cancelled jobs never leave an unawaited coroutine
+        jobs = [self._generate_introduction] + [
+            partial(
+                self._generate_chapter,
+                {**chapter_outline, 'chapter_number': chapter_outline.get('chapter_number', index + 1)},
+                previous_context=self._get_outline_continuity_summary(index)
+            )
+            for index, chapter_outline in enumerate(chapter_outlines)
+        ]
+        tasks = [asyncio.create_task(run(job)) for job in jobs]
+        
+        logger.info(
+            f"Generating {len(tasks)} sections with up to "
+            f"{self.max_concurrent_chapters} in parallel"
+        )
+        
+        try:
+            generated = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        
+        # gather returns results in job order, i.e. introduction then outline order
+        self.current_book.chapters = [
+            chapter for chapter in self.current_book.chapters if chapter not in generated
+        ] + list(generated)
+        
+        await self._generate_conclusion()
+    
     async def _generate_introduction(self):
         """Generate book introduction."""
         
@@ -418,9 +486,17 @@ class BookWorkflow:
         await self._update_memory_with_chapter_summary(chapter_meta)
         
         logger.info(f"Generated introduction: {chapter_meta.actual_word_count:,} words")
+        return chapter_meta
     
-    async def _generate_chapter(self, chapter_outline: Dict):
-        """Generate a single chapter with continuity awareness."""
+    async def _generate_chapter(self, chapter_outline: Dict, previous_context: Optional[str] = None):
+        """
+        Generate a single chapter with continuity awareness.
+        
+        Args:
+            chapter_outline: Outline entry for the chapter
+            previous_context: Continuity context (defaults to the chapters
+                written so far)
+        """
         
         chapter_meta = ChapterMetadata(
             chapter_number=chapter_outline.get('chapter_number', 1),
@@ -463,7 +539,8 @@ class BookWorkflow:
         }
         
         # Get context from previous chapters for continuity
-        previous_context = await self._get_previous_chapters_context()
+        if previous_context is None:
+            previous_context = await self._get_previous_chapters_context()
         
         # Write chapter
         writing_prompt = f"""
@@ -521,6 +598,7 @@ class BookWorkflow:
         await self._update_memory_with_chapter_summary(chapter_meta)
         
         logger.info(f"Generated Chapter {chapter_meta.chapter_number}: {chapter_meta.actual_word_count:,} words")
+        return chapter_meta
     
     async def _generate_conclusion(self):
         """Generate book conclusion."""
@@ -634,6 +712,43 @@ class BookWorkflow:
         
         return "\n\n".join(context_parts)
     
+    def _get_outline_continuity_summary(self, chapter_index: int) -> str:
+        """
+        Build a rolling continuity summary from the outline.
+        
+        Concurrent chapters cannot read each other's text, so each one is
+        told what the introduction and the preceding chapters are planned to
+        cover, with the closest chapters in most detail, and what follows.
+        
+        Args:
+            chapter_index: Position of the chapter in the outline
+        """
+        
+        outline = self.current_book.outline
+        chapters = outline.get('chapters', [])
+        context_parts = []
+        
+        introduction = outline.get('introduction', {})
+        context_parts.append(
+            f"Introduction: {introduction.get('title', 'Introduction')}\n"
+            f"Key points: {introduction.get('key_points', [])}"
+        )
+        
+        for index, chapter in enumerate(chapters[:chapter_index]):
+            heading = f"Chapter {chapter.get('chapter_number', index + 1)}: {chapter.get('title', '')}"
+            if chapter_index - index <= 3:  # Last 3 chapters in detail
+                heading += f"\nKey points: {chapter.get('key_points', [])}"
+            context_parts.append(heading)
+        
+        if chapter_index + 1 < len(chapters):
+            following = chapters[chapter_index + 1]
+            context_parts.append(
+                f"Next chapter: Chapter {following.get('chapter_number', chapter_index + 2)}: "
+                f"{following.get('title', '')}"
+            )
+        
+        return "\n\n".join(context_parts)
+    
     async def _get_full_book_context(self) -> str:
         """Get context from all chapters for conclusion."""
         
@@ -18,17 +18,21 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import click
 
 # Import system modules
 from document_ingestor import DocumentIngestor
+from ingestion_manifest import IngestionManifest
 from memory_manager import MemoryManager
 from llm_client import LLMClient
+from response_cache import ResponseCache
 from tool_manager import ToolManager
 from agent_manager import AgentManager
+from audit_log import AuditLog
 from research_agent import ResearchAgent
+from research_store import ResearchStore
 from writer_agent import WriterAgent, WritingStyle
 from editor_agent import EditorAgent, StyleGuide
 from tool_agent import ToolAgent
@@ -52,6 +56,7 @@ class CLIContext:
         self.tool_manager = None
         self.agent_manager = None
         self.research_agent = None
+        self.research_store = None
         self.writer_agent = None
         self.editor_agent = None
         self.tool_agent = None
@@ -86,8 +91,15 @@ def cli(ctx, verbose, config):
 @click.option('--embedding-key', envvar='EMBEDDING_API_KEY', help='Embedding API key')
 @click.option('--vector-db-path', envvar='VECTOR_DB_PATH', default='./memory_db', help='Vector database path')
 @click.option('--allow-unsafe', envvar='TOOL_MANAGER_ALLOW_UNSAFE', is_flag=True, help='Allow unsafe tools')
+@click.option('--cache-responses', envvar='LLM_RESPONSE_CACHE', is_flag=True, help='Cache LLM responses on disk')
+@click.option('--requests-per-minute', envvar='LLM_REQUESTS_PER_MINUTE', type=int, help='Rate limit for LLM requests')
+@click.option('--tokens-per-minute', envvar='LLM_TOKENS_PER_MINUTE', type=int, help='Rate limit for LLM tokens')
+@click.option('--audit-log-dir', envvar='AGENT_AUDIT_LOG_DIR', help='Directory for the persistent agent audit log')
+@click.option('--cache-research', envvar='RESEARCH_STORE_CACHE', is_flag=True,
+              help='Reuse processed research sources and topics across runs')
 @pass_context
-def init(ctx, openai_key, ollama_url, embedding_key, vector_db_path, allow_unsafe):
+def init(ctx, openai_key, ollama_url, embedding_key, vector_db_path, allow_unsafe, cache_responses,
+         requests_per_minute, tokens_per_minute, audit_log_dir, cache_research):
     """Initialize the book-writing system."""
     try:
         click.echo("Initializing book-writing system...")
@@ -103,8 +115,18 @@ def init(ctx, openai_key, ollama_url, embedding_key, vector_db_path, allow_unsaf
         ctx.llm_client = LLMClient(
             primary_provider="openai" if openai_key else "ollama",
             openai_api_key=openai_key,
-            ollama_url=ollama_url
+            ollama_url=ollama_url,
+            response_cache=(
+                ResponseCache.with_disk(Path(vector_db_path) / "llm_cache")
+                if cache_responses else None
+            )
         )
+        if requests_per_minute or tokens_per_minute:
+            ctx.llm_client.rate_limiter.set_limits(
+                ctx.llm_client.primary_provider,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute
+            )
         
         # Initialize tool manager
         ctx.tool_manager = ToolManager(
@@ -113,15 +135,20 @@ def init(ctx, openai_key, ollama_url, embedding_key, vector_db_path, allow_unsaf
         )
         
         # Initialize agent manager
-        ctx.agent_manager = AgentManager()
+        ctx.agent_manager = AgentManager(
+            audit_log=AuditLog.with_store(audit_log_dir) if audit_log_dir else None
+        )
         # Note: agent_manager.start() will be called in async functions
         
         # Initialize agents
+        if cache_research:
+            ctx.research_store = ResearchStore(vector_db_path)
         ctx.research_agent = ResearchAgent(
             agent_id="research_agent",
             memory_manager=ctx.memory_manager,
             llm_client=ctx.llm_client,
-            tool_manager=ctx.tool_manager
+            tool_manager=ctx.tool_manager,
+            research_store=ctx.research_store
         )
         
         ctx.writer_agent = WriterAgent(
@@ -177,6 +204,7 @@ def init(ctx, openai_key, ollama_url, embedding_key, vector_db_path, allow_unsaf
         click.echo(f"Memory database: {vector_db_path}")
         click.echo(f"LLM provider: {'OpenAI' if openai_key else 'Ollama'}")
         click.echo(f"Unsafe tools: {'Enabled' if allow_unsafe else 'Disabled'}")
+        click.echo(f"Research cache: {'Enabled' if cache_research else 'Disabled'}")
         
     except Exception as e:
         click.echo(f"❌ Failed to initialize system: {e}", err=True)
@@ -201,16 +229,22 @@ def document(ctx, file_path):
         ingestor = DocumentIngestor()
         
         async def ingest_doc():
-            metadata, chunks = await ingestor.ingest_document(file_path)
-            
-            # Store in memory
-            chunk_ids = await ctx.memory_manager.store_document_chunks(
-                metadata, chunks, "cli_user"
-            )
+            # Chunks are stored while the rest of the document is parsed
+            stored: List[str] = []
+            try:
+                metadata, chunk_ids = await ingestor.ingest_document_streaming(
+                    file_path, ctx.memory_manager, "cli_user", stored_chunk_ids=stored
+                )
+            except Exception:
+                # Do not leave a partially ingested document behind
+                if stored:
+                    source_id = ingestor._generate_source_id(Path(file_path))
+                    await ctx.memory_manager.delete_chunks(stored, source_id, "cli_user")
+                raise
             
             click.echo(f"✅ Ingested document: {metadata.original_filename}")
-            click.echo(f"   Chunks: {len(chunks)}")
-            click.echo(f"   Word count: {sum(c.word_count for c in chunks)}")
+            click.echo(f"   Chunks: {metadata.chunk_count}")
+            click.echo(f"   Word count: {metadata.word_count}")
             click.echo(f"   Stored chunk IDs: {len(chunk_ids)}")
         
         asyncio.run(ingest_doc())
@@ -222,30 +256,54 @@ def document(ctx, file_path):
 
 @ingest.command()
 @click.argument('directory_path', type=click.Path(exists=True, file_okay=False))
+@click.option('--full', is_flag=True, help='Re-ingest every file instead of syncing changes only')
+@click.option('--workers', type=int, default=1, help='Worker processes for parsing in --full mode')
 @pass_context
-def directory(ctx, directory_path):
+def directory(ctx, directory_path, full, workers):
     """Ingest all documents in a directory."""
     try:
         ingestor = DocumentIngestor()
         
+        manifest = IngestionManifest(
+            ctx.memory_manager.persist_directory / "ingestion_manifest.json"
+        )
+        
         async def ingest_dir():
-            results = await ingestor.ingest_directory(directory_path)
-            
-            total_chunks = 0
-            total_words = 0
+            def show_progress(file_path, status, completed, total):
+                marker = "✓" if status == "ingested" else "✗"
+                click.echo(f"   [{completed}/{total}] {marker} {Path(file_path).name}")
+            
+            # Re-ingest everything but keep the manifest accurate for later syncs
+            results = await ingestor.ingest_directory_parallel(
+                directory_path,
+                memory_manager=ctx.memory_manager,
+                max_workers=workers,
+                agent_id="cli_user",
+                progress_callback=show_progress,
+                manifest=manifest
+            )
             
-            for metadata, chunks in results:
-                chunk_ids = await ctx.memory_manager.store_document_chunks(
-                    metadata, chunks, "cli_user"
-                )
-                total_chunks += len(chunks)
-                total_words += sum(c.word_count for c in chunks)
+            total_chunks = sum(len(chunks) for _, chunks in results)
+            total_words = sum(c.word_count for _, chunks in results for c in chunks)
             
             click.echo(f"✅ Ingested {len(results)} documents from {directory_path}")
             click.echo(f"   Total chunks: {total_chunks}")
             click.echo(f"   Total words: {total_words}")
         
-        asyncio.run(ingest_dir())
+        async def sync_dir():
+            report = await ingestor.sync_directory(
+                directory_path, ctx.memory_manager, manifest, "cli_user"
+            )
+            
+            click.echo(f"✅ Synced {directory_path}")
+            click.echo(f"   Added: {len(report['added'])}")
+            click.echo(f"   Updated: {len(report['updated'])}")
+            click.echo(f"   Unchanged: {len(report['unchanged'])}")
+            click.echo(f"   Removed: {len(report['removed'])}")
+            if report['failed']:
+                click.echo(f"   Failed: {len(report['failed'])}")
+        
+        asyncio.run(ingest_dir() if full else sync_dir())
         
     except Exception as e:
         click.echo(f"❌ Failed to ingest directory: {e}", err=True)
@@ -583,6 +641,8 @@ def cleanup(ctx):
                 await ctx.agent_manager.stop()
             if ctx.tool_agent:
                 await ctx.tool_agent.cleanup()
+            if ctx.research_store:
+                ctx.research_store.close()
             
             click.echo("✅ System cleanup completed")
         
@@ -606,10 +666,16 @@ def book():
 @click.option('--chapters', default=10, help='Number of chapters')
 @click.option('--references', multiple=True, help='Reference document paths')
 @click.option('--output-dir', default='./output', help='Output directory')
-def create(title, theme, author, word_count, chapters, references, output_dir):
+@click.option('--parallel-chapters', default=1, type=click.IntRange(min=1),
+              help='Chapters generated concurrently (1 = sequential)')
+@click.option('--cache-research', envvar='RESEARCH_STORE_CACHE', is_flag=True,
+              help='Reuse processed research sources and topics across runs')
+def create(title, theme, author, word_count, chapters, references, output_dir, parallel_chapters,
+           cache_research):
     """Create a complete book using the full workflow."""
     
     async def run_book_creation():
+        research_store = None
         try:
             # Initialize system components
             memory_manager = MemoryManager()
@@ -619,11 +685,14 @@ def create(title, theme, author, word_count, chapters, references, output_dir):
             await agent_manager.start()
             
             # Initialize agents
+            if cache_research:
+                research_store = ResearchStore(memory_manager.persist_directory)
             research_agent = ResearchAgent(
                 agent_id="research_agent",
                 memory_manager=memory_manager,
                 llm_client=llm_client,
-                tool_manager=tool_manager
+                tool_manager=tool_manager,
+                research_store=research_store
             )
             
             writer_agent = WriterAgent(
@@ -665,7 +734,8 @@ def create(title, theme, author, word_count, chapters, references, output_dir):
                 writer_agent=writer_agent,
                 editor_agent=editor_agent,
                 tool_agent=tool_agent,
-                book_builder=book_builder
+                book_builder=book_builder,
+                max_concurrent_chapters=parallel_chapters
             )
             
             # Start book production
@@ -704,6 +774,9 @@ def create(title, theme, author, word_count, chapters, references, output_dir):
         except Exception as e:
             click.echo(f"❌ Error creating book: {e}")
             raise
+        finally:
+            if research_store is not None:
+                research_store.close()
     
     # Run the async function
     asyncio.run(run_book_creation())
@@ -711,10 +784,13 @@ def create(title, theme, author, word_count, chapters, references, output_dir):
 
 @book.command()
 @click.option('--build-id', help='Specific build ID to check')
-def status(build_id):
+@click.option('--cache-research', envvar='RESEARCH_STORE_CACHE', is_flag=True,
+              help='Reuse processed research sources and topics across runs')
+def status(build_id, cache_research):
     """Check book production status."""
     
     async def check_status():
+        research_store = None
         try:
             # Initialize system components
             memory_manager = MemoryManager()
@@ -724,11 +800,14 @@ def status(build_id):
             await agent_manager.start()
             
             # Initialize agents
+            if cache_research:
+                research_store = ResearchStore(memory_manager.persist_directory)
             research_agent = ResearchAgent(
                 agent_id="research_agent",
                 memory_manager=memory_manager,
                 llm_client=llm_client,
-                tool_manager=tool_manager
+                tool_manager=tool_manager,
+                research_store=research_store
             )
             
             writer_agent = WriterAgent(
@@ -793,6 +872,9 @@ def status(build_id):
             
         except Exception as e:
             click.echo(f"❌ Error checking status: {e}")
+        finally:
+            if research_store is not None:
+                research_store.close()
     
     asyncio.run(check_status())
 
@@ -0,0 +1,378 @@
+"""
+Context Packer Module
+
+Assembles retrieved chunks into a prompt context under an exact token
+budget. Candidates are ordered by maximal marginal relevance so near-duplicate
+chunks do not crowd out distinct evidence, neighbouring chunks from the same
+source are stitched into one passage without repeating their overlap, and
+token counts are cached per text so packing the same chunks again does not
+re-tokenise them. When a chunk does not fit, smaller ones are still tried,
+and any leftover budget is filled with a chunk cut at a sentence or word
+boundary.
+
+Chosen libraries:
+- numpy: Pairwise cosine similarity for MMR
+- hashlib: Token-count cache keys
+- text_chunker: Token counters and sentence boundaries
+
+Pattern: Greedy budgeted packing over an MMR ordering
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from text_chunker import SENTENCE_BOUNDARY, WORD, approximate_token_count, tiktoken_token_counter
+
+logger = logging.getLogger(__name__)
+
+
+class _LazyTokenCounter:
+    """
+    Token counter that loads the tiktoken encoding on first use.
+
+    Loading can fail for reasons beyond a missing package (an uncached
+    encoding file on an offline machine raises a network error), so any
+    failure falls back to the 4-characters estimate instead of breaking the
+    caller's constructor.
+    """
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self.encoding_name = encoding_name
+        self._counter: Optional[Callable[[str], int]] = None
+
+    def __call__(self, text: str) -> int:
+        if self._counter is None:
+            try:
+                self._counter = tiktoken_token_counter(self.encoding_name)
+            except ValueError:
+                logger.info("tiktoken not installed; context budgets use approximate token counts")
+                self._counter = approximate_token_count
+            except Exception as e:
+                logger.warning(
+                    f"Failed to load tiktoken encoding {self.encoding_name}: {e}; "
+                    "context budgets use approximate token counts"
+                )
+                self._counter = approximate_token_count
+        return self._counter(text)
+
+
+def default_token_counter() -> Callable[[str], int]:
+    """Use tiktoken's cl100k_base encoding when it loads, else the 4-characters estimate."""
+    return _LazyTokenCounter()
+
+
+def mmr_order(
+    relevance: Sequence[float],
+    embeddings: Optional[np.ndarray] = None,
+    lambda_mult: float = 0.7,
+    duplicate_threshold: Optional[float] = 0.95
+) -> List[int]:
+    """
+    Order candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximising
+    ``lambda_mult * relevance - (1 - lambda_mult) * max_similarity_to_picked``.
+
+    Args:
+        relevance: Relevance score per candidate
+        embeddings: Candidate embeddings (None orders by relevance alone)
+        lambda_mult: Trade-off between relevance (1.0) and diversity (0.0)
+        duplicate_threshold: Drop candidates at least this similar to a picked one
+
+    Returns:
+        Candidate indices, best first
+    """
+    count = len(relevance)
+    if embeddings is None or count == 0:
+        return sorted(range(count), key=lambda i: relevance[i], reverse=True)
+
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1.0
+    vectors = vectors / norms[:, None]
+    similarity = vectors @ vectors.T
+
+    scores = np.asarray(relevance, dtype=np.float32)
+    max_similarity = np.zeros(count, dtype=np.float32)
+    remaining = np.ones(count, dtype=bool)
+    order: List[int] = []
+
+    while remaining.any():
+        mmr = lambda_mult * scores - (1.0 - lambda_mult) * max_similarity if order else scores.copy()
+        mmr[~remaining] = -np.inf
+        picked = int(np.argmax(mmr))
+        order.append(picked)
+        remaining[picked] = False
+        max_similarity = np.maximum(max_similarity, similarity[picked])
+        if duplicate_threshold is not None:
+            remaining &= max_similarity < duplicate_threshold
+
+    return order
+
+
+class TokenCountCache:
+    """LRU cache of token counts keyed on a digest of the text."""
+
+    def __init__(self, token_counter: Callable[[str], int], max_entries: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            token_counter: Function counting tokens in a text
+            max_entries: Number of counts kept
+        """
+        self.token_counter = token_counter
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+
+    def count(self, text: str) -> int:
+        """Count tokens in a text, reusing a cached count when there is one."""
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        cached = self._counts.get(key)
+        if cached is not None:
+            self._counts.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        count = self.token_counter(text)
+        self._counts[key] = count
+        if len(self._counts) > self.max_entries:
+            self._counts.popitem(last=False)
+        return count
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._counts)}
+
+
+def _int_metadata(result: Any, key: str) -> Optional[int]:
+    try:
+        return int(result.metadata[key])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _adjacent(a: Any, b: Any) -> bool:
+    """True if two chunks of the same source overlap, touch, or are consecutive."""
+    if a.source_id != b.source_id or not a.source_id:
+        return False
+    a_start, a_end = _int_metadata(a, "start_char"), _int_metadata(a, "end_char")
+    b_start, b_end = _int_metadata(b, "start_char"), _int_metadata(b, "end_char")
+    if None not in (a_start, a_end, b_start, b_end):
+        if a_start <= b_end and b_start <= a_end:
+            return True
+    a_index, b_index = _int_metadata(a, "chunk_index"), _int_metadata(b, "chunk_index")
+    return a_index is not None and b_index is not None and abs(a_index - b_index) == 1
+
+
+def _stitch(results: List[Any]) -> str:
+    """Join chunks of one source in document order, dropping overlapping text."""
+    def position(result):
+        start = _int_metadata(result, "start_char")
+        index = _int_metadata(result, "chunk_index")
+        return (start if start is not None else -1, index if index is not None else -1)
+
+    ordered = sorted(results, key=position)
+    text = ordered[0].content
+    end = _int_metadata(ordered[0], "end_char")
+    for result in ordered[1:]:
+        start = _int_metadata(result, "start_char")
+        result_end = _int_metadata(result, "end_char")
+        if start is not None and end is not None and start <= end:
+            # Offsets index the same source text, so the overlap can be cut exactly
+            text += result.content[end - start:]
+        else:
+            text += " " + result.content
+        if result_end is not None:
+            end = result_end if end is None else max(end, result_end)
+    return text
+
+
+class PackedContext(NamedTuple):
+    """Context text with the chunks it contains."""
+    text: str
+    results: List[Any]
+    token_count: int
+
+
+class ContextPacker:
+    """
+    Budgeted context assembly for RAG prompts.
+
+    Responsibilities:
+    - Order candidates by maximal marginal relevance
+    - Merge neighbouring chunks of the same source into one passage
+    - Fit passages to an exact token budget, truncating at natural boundaries
+    - Cache token counts across calls
+    """
+
+    def __init__(
+        self,
+        token_counter: Optional[Callable[[str], int]] = None,
+        mmr_lambda: float = 0.7,
+        duplicate_threshold: Optional[float] = 0.95,
+        merge_adjacent: bool = True,
+        min_partial_tokens: int = 100,
+        separator: str = "\n\n",
+        cache_size: int = 10000
+    ):
+        """
+        Initialize the packer.
+
+        Args:
+            token_counter: Function counting tokens (defaults to tiktoken when installed)
+            mmr_lambda: Trade-off between relevance (1.0) and diversity (0.0)
+            duplicate_threshold: Skip chunks at least this similar to a chosen one (None keeps all)
+            merge_adjacent: Whether to stitch neighbouring chunks of a source together
+            min_partial_tokens: Smallest leftover budget worth filling with a truncated chunk
+            separator: Text placed between passages
+            cache_size: Number of token counts cached
+        """
+        if not 0.0 <= mmr_lambda <= 1.0:
+            raise ValueError("mmr_lambda must be between 0 and 1")
+
+        self.token_cache = TokenCountCache(token_counter or default_token_counter(), cache_size)
+        self.mmr_lambda = mmr_lambda
+        self.duplicate_threshold = duplicate_threshold
+        self.merge_adjacent = merge_adjacent
+        self.min_partial_tokens = min_partial_tokens
+        self.separator = separator
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens with the configured counter, through the cache."""
+        return self.token_cache.count(text)
+
+    @staticmethod
+    def _render(results: List[Any], content: Optional[str] = None) -> str:
+        label = results[0].metadata.get("original_filename", "Unknown")
+        return f"[Source: {label}]\n{content if content is not None else _stitch(results)}"
+
+    def pack(
+        self,
+        results: Sequence[Any],
+        max_tokens: int,
+        embeddings: Optional[np.ndarray] = None
+    ) -> PackedContext:
+        """
+        Pack retrieval results into a context of at most ``max_tokens`` tokens.
+
+        Args:
+            results: Retrieval results with content, chunk_id, source_id, score and metadata
+            max_tokens: Token budget for the whole context
+            embeddings: Embeddings aligned with ``results`` for MMR (None orders by score)
+
+        Returns:
+            The context, the results it contains in context order, and its token count
+        """
+        order = mmr_order(
+            [result.score for result in results],
+            embeddings,
+            self.mmr_lambda,
+            self.duplicate_threshold
+        )
+        separator_tokens = self.count_tokens(self.separator)
+
+        # Each passage is a list of results from one source rendered as one block
+        passages: List[List[Any]] = []
+        rendered: List[str] = []
+        used = 0
+        skipped = []
+
+        for index in order:
+            result = results[index]
+            targets = []
+            if self.merge_adjacent:
+                targets = [
+                    i for i, passage in enumerate(passages)
+                    if any(_adjacent(result, member) for member in passage)
+                ]
+
+            if targets:
+                # A chunk bridging several passages joins them all into one
+                members = [member for i in targets for member in passages[i]] + [result]
+                merged = self._render(members)
+                cost = (
+                    self.count_tokens(merged)
+                    - sum(self.count_tokens(rendered[i]) for i in targets)
+                    - separator_tokens * (len(targets) - 1)
+                )
+                if used + cost <= max_tokens:
+                    for i in reversed(targets[1:]):
+                        del passages[i], rendered[i]
+                    passages[targets[0]] = members
+                    rendered[targets[0]] = merged
+                    used += cost
+                    continue
+            else:
+                block = self._render([result])
+                cost = self.count_tokens(block) + (separator_tokens if passages else 0)
+                if used + cost <= max_tokens:
+                    passages.append([result])
+                    rendered.append(block)
+                    used += cost
+                    continue
+            skipped.append(result)
+
+        # Fill what is left with the best chunk that did not fit whole
+        remaining = max_tokens - used - (separator_tokens if passages else 0)
+        if skipped and remaining >= self.min_partial_tokens:
+            partial = skipped[0]
+            header_tokens = self.count_tokens(self._render([partial], ""))
+            content = self._truncate(partial.content, remaining - header_tokens)
+            if content:
+                passages.append([partial])
+                rendered.append(self._render([partial], content))
+
+        text = self.separator.join(rendered)
+        token_count = self.count_tokens(text)
+        # Token counts are not strictly additive across joins; trim if that tipped us over
+        while token_count > max_tokens and rendered:
+            passages.pop()
+            rendered.pop()
+            text = self.separator.join(rendered)
+            token_count = self.count_tokens(text)
+
+        selected = [
+            result for passage in passages
+            for result in sorted(passage, key=lambda r: _int_metadata(r, "start_char") or 0)
+        ]
+        return PackedContext(text=text, results=selected, token_count=token_count)
+
+    def _truncate(self, text: str, budget: int) -> Optional[str]:
+        """Cut text to at most ``budget`` tokens at the last sentence, or else word, boundary that fits."""
+        if budget <= 0:
+            return None
+
+        sentence_ends = [match.end(1) for match in SENTENCE_BOUNDARY.finditer(text)]
+        cut = self._longest_fitting(text, sentence_ends, budget, "")
+        if cut is not None:
+            return text[:cut]
+
+        word_ends = [match.end() for match in WORD.finditer(text)]
+        cut = self._longest_fitting(text, word_ends, budget, "...")
+        if cut is not None:
+            return text[:cut] + "..."
+        return None
+
+    def _longest_fitting(self, text: str, cuts: List[int], budget: int, suffix: str) -> Optional[int]:
+        """Binary-search the longest prefix ending at a cut point that fits the budget."""
+        low, high = 0, len(cuts) - 1
+        best = None
+        while low <= high:
+            middle = (low + high) // 2
+            if self.count_tokens(text[:cuts[middle]] + suffix) <= budget:
+                best = cuts[middle]
+                low = middle + 1
+            else:
+                high = middle - 1
+        return best
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get token-count cache counters."""
+        return self.token_cache.get_stats()
@@ -16,12 +16,16 @@ Pattern: Document processing pipeline with metadata extraction
 """
 
 import asyncio
+import contextlib
 import hashlib
 import logging
 import mimetypes
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import pypandoc
@@ -30,8 +34,14 @@ import pydantic
 from docx import Document as DocxDocument
 # from epub import Epub  # Not available, using alternative
 
+from ingestion_manifest import IngestionManifest
+from text_chunker import TextChunk, TextChunker
+
 logger = logging.getLogger(__name__)
 
+# Formats whose parsing is CPU-bound and worth moving to worker processes
+PARALLEL_FORMATS = {'.pdf', '.docx', '.epub'}
+
 
 class DocumentMetadata(pydantic.BaseModel):
     """Metadata model for ingested documents."""
@@ -41,6 +51,7 @@ class DocumentMetadata(pydantic.BaseModel):
     file_size: int
     ingestion_timestamp: datetime
     chunk_count: int
+    word_count: int = 0
     language: Optional[str] = None
     author: Optional[str] = None
     title: Optional[str] = None
@@ -58,6 +69,8 @@ class DocumentChunk(pydantic.BaseModel):
     metadata: Dict[str, str]
     word_count: int
     char_count: int
+    start_char: Optional[int] = None
+    end_char: Optional[int] = None
 
 
 class DocumentIngestor:
@@ -72,24 +85,38 @@ class DocumentIngestor:
     - Support incremental ingestion
     """
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        token_counter: Optional[Callable[[str], int]] = None
+    ):
         """
         Initialize the document ingestor.
         
         Args:
-            chunk_size: Maximum number of characters per chunk
-            chunk_overlap: Number of characters to overlap between chunks
+            chunk_size: Maximum number of tokens per chunk
+            chunk_overlap: Maximum number of tokens to overlap between chunks
+            token_counter: Function counting tokens in a text; defaults to
+                counting characters (see text_chunker for alternatives)
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.token_counter = token_counter
+        self.chunker = TextChunker(chunk_size, chunk_overlap, token_counter)
         self.supported_formats = {'.pdf', '.md', '.txt', '.docx', '.epub'}
         
-    async def ingest_document(self, file_path: Union[str, Path]) -> Tuple[DocumentMetadata, List[DocumentChunk]]:
+    async def ingest_document(
+        self,
+        file_path: Union[str, Path],
+        checksum: Optional[str] = None
+    ) -> Tuple[DocumentMetadata, List[DocumentChunk]]:
         """
         Ingest a document and return metadata and chunks.
         
         Args:
             file_path: Path to the document file
+            checksum: Precomputed SHA-256 checksum of the file (optional)
             
         Returns:
             Tuple of (metadata, chunks)
@@ -104,24 +131,148 @@ class DocumentIngestor:
             
         # Generate source ID and checksum
         source_id = self._generate_source_id(file_path)
-        checksum = await self._calculate_checksum(file_path)
+        if checksum is None:
+            checksum = await self._calculate_checksum(file_path)
         
         # Extract metadata
         metadata = await self._extract_metadata(file_path, source_id, checksum)
         
-        # Extract text content
-        text_content = await self._extract_text(file_path)
-        
-        # Chunk the content
-        chunks = await self._chunk_content(text_content, source_id)
+        # Extract and chunk the content
+        if file_path.suffix.lower() == '.pdf':
+            chunks = [chunk async for chunk in self.stream_document_chunks(file_path, source_id)]
+        else:
+            text_content = await self._extract_text(file_path)
+            chunks = await self._chunk_content(text_content, source_id)
         
-        # Update metadata with chunk count
+        # Update metadata with chunk and word counts
         metadata.chunk_count = len(chunks)
+        metadata.word_count = sum(chunk.word_count for chunk in chunks)
         
         logger.info(f"Ingested document {file_path.name}: {len(chunks)} chunks")
         
         return metadata, chunks
     
+    async def ingest_document_streaming(
+        self,
+        file_path: Union[str, Path],
+        memory_manager: Any,
+        agent_id: Optional[str] = None,
+        batch_size: int = 64,
+        checksum: Optional[str] = None,
+        stored_chunk_ids: Optional[List[str]] = None
+    ) -> Tuple[DocumentMetadata, List[str]]:
+        """
+        Ingest a document, storing chunks while later pages are still parsed.
+        
+        Chunks are handed to the memory manager in batches through a bounded
+        queue, so only a few batches are held in memory at once and the first
+        chunks are embedded before the last page has been read.
+        
+        Args:
+            file_path: Path to the document file
+            memory_manager: Memory manager that stores the chunks
+            agent_id: ID of the agent storing the chunks
+            batch_size: Number of chunks stored per call
+            checksum: Precomputed SHA-256 checksum of the file (optional)
+            stored_chunk_ids: List to extend with chunk IDs as each batch is
+                stored, so a caller can remove a partial document on failure
+            
+        Returns:
+            Tuple of (metadata, stored chunk IDs)
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        file_path = Path(file_path)
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Document not found: {file_path}")
+            
+        if file_path.suffix.lower() not in self.supported_formats:
+            raise ValueError(f"Unsupported file format: {file_path.suffix}")
+        
+        source_id = self._generate_source_id(file_path)
+        if checksum is None:
+            checksum = await self._calculate_checksum(file_path)
+        metadata = await self._extract_metadata(file_path, source_id, checksum)
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        chunk_ids: List[str] = stored_chunk_ids if stored_chunk_ids is not None else []
+        
+        async def produce():
+            batch: List[DocumentChunk] = []
+            try:
+                async for chunk in self.stream_document_chunks(file_path, source_id):
+                    batch.append(chunk)
+                    metadata.chunk_count += 1
+                    metadata.word_count += chunk.word_count
+                    if len(batch) >= batch_size:
+                        await queue.put(batch)
+                        batch = []
+                if batch:
+                    await queue.put(batch)
+            except Exception as e:
+                await queue.put(e)
+                return
+            await queue.put(None)
+        
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                chunk_ids.extend(
+                    await memory_manager.store_document_chunks(metadata, batch, agent_id)
+                )
+        except BaseException:
+            producer.cancel()
+            raise
+        finally:
+            await asyncio.gather(producer, return_exceptions=True)
+        
+        logger.info(f"Ingested document {file_path.name}: {len(chunk_ids)} chunks (streaming)")
+        
+        return metadata, chunk_ids
+    
+    async def stream_document_chunks(
+        self,
+        file_path: Union[str, Path],
+        source_id: str
+    ) -> AsyncIterator[DocumentChunk]:
+        """
+        Yield the chunks of a document as they are produced.
+        
+        PDFs are read page by page in a worker thread and chunked
+        incrementally, with overlap carried across page boundaries and each
+        chunk tagged with the pages it spans. Other formats are extracted in
+        full and then chunked.
+        
+        Args:
+            file_path: Path to the document file
+            source_id: Source ID of the document
+        """
+        file_path = Path(file_path)
+        
+        if file_path.suffix.lower() != '.pdf':
+            text_content = await self._extract_text(file_path)
+            for chunk in await self._chunk_content(text_content, source_id):
+                yield chunk
+            return
+        
+        loop = asyncio.get_event_loop()
+        chunks = self._iter_page_chunks(self._iter_pdf_pages(file_path), source_id)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            chunks.close()
+    
     def _generate_source_id(self, file_path: Path) -> str:
         """Generate a unique source ID for the document."""
         # Use file path and modification time for uniqueness
@@ -224,17 +375,18 @@ class DocumentIngestor:
     
     async def _extract_pdf_text(self, file_path: Path) -> str:
         """Extract text from PDF files."""
-        text = ""
+        return "\n".join(text for _, text in self._iter_pdf_pages(file_path)).strip()
+    
+    def _iter_pdf_pages(self, file_path: Path) -> Iterator[Tuple[int, str]]:
+        """Yield (page number, text) for each PDF page, reading one page at a time."""
         try:
             with open(file_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+                for page_number, page in enumerate(pdf_reader.pages, 1):
+                    yield page_number, page.extract_text() or ""
         except Exception as e:
             logger.error(f"Failed to extract PDF text: {e}")
             raise
-            
-        return text.strip()
     
     async def _extract_docx_text(self, file_path: Path) -> str:
         """Extract text from DOCX files."""
@@ -281,65 +433,52 @@ class DocumentIngestor:
         """Chunk the content into manageable pieces."""
         if not content.strip():
             return []
-            
-        # Split content into sentences for better chunking
-        sentences = self._split_into_sentences(content)
-        
-        chunks = []
-        current_chunk = ""
-        chunk_index = 0
-        
-        for sentence in sentences:
-            # Check if adding this sentence would exceed chunk size
-            if len(current_chunk) + len(sentence) > self.chunk_size and current_chunk:
-                # Create chunk from current content
-                chunk = self._create_chunk(current_chunk, source_id, chunk_index)
-                chunks.append(chunk)
-                
-                # Start new chunk with overlap
-                overlap_text = self._get_overlap_text(current_chunk)
-                current_chunk = overlap_text + sentence
-                chunk_index += 1
-            else:
-                current_chunk += sentence
-        
-        # Add the last chunk if it has content
-        if current_chunk.strip():
-            chunk = self._create_chunk(current_chunk, source_id, chunk_index)
-            chunks.append(chunk)
-        
-        return chunks
-    
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences for better chunking."""
-        import re
         
-        # Simple sentence splitting (could be improved with NLTK or spaCy)
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return [
+            self._create_chunk(text_chunk, source_id, chunk_index)
+            for chunk_index, text_chunk in enumerate(self.chunker.chunk_text(content))
+        ]
     
-    def _get_overlap_text(self, text: str) -> str:
-        """Get the last part of text for overlap."""
-        if len(text) <= self.chunk_overlap:
-            return text
-        return text[-self.chunk_overlap:]
+    def _iter_page_chunks(
+        self,
+        pages: Iterable[Tuple[int, str]],
+        source_id: str
+    ) -> Iterator[DocumentChunk]:
+        """
+        Incrementally chunk paginated text, tagging chunks with their pages.
+        
+        Offsets index into the page texts joined by newlines.
+        """
+        parts = ((text, page_number) for page_number, text in pages)
+        for chunk_index, text_chunk in enumerate(self.chunker.iter_chunks(parts)):
+            yield self._create_chunk(text_chunk, source_id, chunk_index)
     
-    def _create_chunk(self, content: str, source_id: str, chunk_index: int) -> DocumentChunk:
+    def _create_chunk(self, text_chunk: TextChunk, source_id: str, chunk_index: int) -> DocumentChunk:
         """Create a document chunk with metadata."""
         chunk_id = f"{source_id}_chunk_{chunk_index}"
+        content = text_chunk.content
+        metadata = {
+            'chunk_size': str(len(content)),
+            'word_count': str(len(content.split())),
+            'char_count': str(len(content)),
+            'token_count': str(text_chunk.token_count),
+            'start_char': str(text_chunk.start),
+            'end_char': str(text_chunk.end)
+        }
+        if text_chunk.first_label is not None:
+            metadata['page_start'] = str(text_chunk.first_label)
+            metadata['page_end'] = str(text_chunk.last_label)
         
         return DocumentChunk(
             chunk_id=chunk_id,
             source_id=source_id,
             chunk_index=chunk_index,
-            content=content.strip(),
-            metadata={
-                'chunk_size': str(len(content)),
-                'word_count': str(len(content.split())),
-                'char_count': str(len(content))
-            },
+            content=content,
+            metadata=metadata,
             word_count=len(content.split()),
-            char_count=len(content)
+            char_count=len(content),
+            start_char=text_chunk.start,
+            end_char=text_chunk.end
         )
     
     async def ingest_directory(self, directory_path: Union[str, Path]) -> List[Tuple[DocumentMetadata, List[DocumentChunk]]]:
@@ -370,4 +509,264 @@ class DocumentIngestor:
                     continue
         
         logger.info(f"Ingested {len(results)} documents from {directory_path}")
-        return results
\ No newline at end of file
+        return results
+    
+    async def ingest_directory_parallel(
+        self,
+        directory_path: Union[str, Path],
+        memory_manager: Any = None,
+        max_workers: Optional[int] = None,
+        agent_id: Optional[str] = None,
+        progress_callback: Optional[Callable[[str, str, int, int], None]] = None,
+        manifest: Optional[IngestionManifest] = None
+    ) -> List[Tuple[DocumentMetadata, List[DocumentChunk]]]:
+        """
+        Ingest a directory with parsing and chunking fanned out to processes.
+        
+        PDF, DOCX and EPUB files are parsed and chunked in a process pool;
+        plain text formats are cheap and handled in-process. Parsed documents
+        are fed to a single storage stage as they complete, so embedding
+        overlaps with parsing of the remaining files. A token counter that
+        cannot be pickled cannot reach the worker processes, so in that case
+        every file is parsed in-process.
+        
+        With a manifest, every stored file replaces the chunks previously
+        recorded for it and is recorded again, and sources that no longer
+        exist are purged, so a later sync starts from an accurate manifest.
+        
+        Args:
+            directory_path: Path to the directory containing documents
+            memory_manager: Memory manager to store chunks in (optional)
+            max_workers: Number of worker processes (defaults to CPU count)
+            agent_id: ID of the agent storing the chunks
+            progress_callback: Called as (file_path, status, completed, total)
+                with status "ingested" or "failed" after each file
+            manifest: Ingestion manifest to keep up to date (requires memory_manager)
+            
+        Returns:
+            List of (metadata, chunks) tuples for each ingested document
+        """
+        directory_path = Path(directory_path)
+        
+        if not directory_path.is_dir():
+            raise NotADirectoryError(f"Not a directory: {directory_path}")
+        
+        file_paths = [
+            file_path for file_path in sorted(directory_path.rglob('*'))
+            if file_path.is_file() and file_path.suffix.lower() in self.supported_formats
+        ]
+        total = len(file_paths)
+        results: List[Tuple[DocumentMetadata, List[DocumentChunk]]] = []
+        completed = 0
+        
+        def report(file_path: Path, status: str):
+            nonlocal completed
+            completed += 1
+            logger.info(f"[{completed}/{total}] {status}: {file_path.name}")
+            if progress_callback:
+                try:
+                    progress_callback(str(file_path), status, completed, total)
+                except Exception as e:
+                    logger.warning(f"Progress callback failed: {e}")
+        
+        loop = asyncio.get_event_loop()
+        workers = max_workers or os.cpu_count() or 1
+        # Bound parsed documents waiting for storage, and files handed to the
+        # pool ahead of it, so memory does not grow with the directory size
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=workers)
+        in_flight = asyncio.Semaphore(2 * workers)
+        
+        offload = True
+        try:
+            pickle.dumps(self.token_counter)
+        except Exception as e:
+            logger.warning(
+                f"Token counter cannot be sent to worker processes ({e}); parsing in-process"
+            )
+            offload = False
+        
+        async def parse(executor: Optional[ProcessPoolExecutor], file_path: Path):
+            await in_flight.acquire()
+            try:
+                if executor is not None and file_path.suffix.lower() in PARALLEL_FORMATS:
+                    document = await loop.run_in_executor(
+                        executor, _ingest_in_worker,
+                        str(file_path), self.chunk_size, self.chunk_overlap,
+                        self.token_counter
+                    )
+                else:
+                    document = await self.ingest_document(file_path)
+                await parsed.put((file_path, document, None))
+            except Exception as e:
+                await parsed.put((file_path, None, e))
+        
+        async def store():
+            for _ in range(total):
+                file_path, document, error = await parsed.get()
+                if error is None and memory_manager is not None:
+                    try:
+                        previous = manifest.get(file_path) if manifest is not None else None
+                        if previous is not None:
+                            await memory_manager.delete_chunks(
+                                previous.chunk_ids, previous.source_id, agent_id
+                            )
+                        chunk_ids = await memory_manager.store_document_chunks(
+                            document[0], document[1], agent_id
+                        )
+                        if manifest is not None:
+                            manifest.record(
+                                file_path, document[0].source_id, document[0].checksum, chunk_ids
+                            )
+                    except Exception as e:
+                        error = e
+                
+                if error is not None:
+                    logger.error(f"Failed to ingest {file_path}: {error}")
+                    report(file_path, "failed")
+                else:
+                    results.append(document)
+                    report(file_path, "ingested")
+                in_flight.release()
+        
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers) if offload else contextlib.nullcontext()
+            with pool as executor:
+                await asyncio.gather(
+                    store(),
+                    *(parse(executor, file_path) for file_path in file_paths)
+                )
+            if manifest is not None and memory_manager is not None:
+                await self.purge_missing_sources(directory_path, memory_manager, manifest, agent_id)
+        finally:
+            if manifest is not None:
+                manifest.save()
+        
+        logger.info(f"Ingested {len(results)} of {total} documents from {directory_path}")
+        return results
+    
+    async def sync_directory(
+        self,
+        directory_path: Union[str, Path],
+        memory_manager: Any,
+        manifest: IngestionManifest,
+        agent_id: Optional[str] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Incrementally synchronize a directory with the memory store.
+        
+        Unchanged files are skipped, changed files have their previous chunks
+        deleted before being re-ingested, and files that disappeared since the
+        last sync have their chunks purged.
+        
+        Args:
+            directory_path: Path to the directory containing documents
+            memory_manager: Memory manager that stores the chunks
+            manifest: Ingestion manifest recording previous syncs
+            agent_id: ID of the agent performing the sync
+        
+        Returns:
+            Dictionary of file paths grouped by outcome
+            (added, updated, unchanged, removed, failed)
+        """
+        directory_path = Path(directory_path)
+        
+        if not directory_path.is_dir():
+            raise NotADirectoryError(f"Not a directory: {directory_path}")
+        
+        report: Dict[str, List[str]] = {
+            "added": [], "updated": [], "unchanged": [], "removed": [], "failed": []
+        }
+        
+        try:
+            for file_path in sorted(directory_path.rglob('*')):
+                if not file_path.is_file() or file_path.suffix.lower() not in self.supported_formats:
+                    continue
+                
+                try:
+                    status = manifest.classify(file_path)
+                    checksum = None
+                    if status == IngestionManifest.CHANGED:
+                        # mtime or size moved; confirm against the content hash
+                        checksum = await self._calculate_checksum(file_path)
+                        status = manifest.classify(file_path, checksum)
+                    
+                    if status == IngestionManifest.UNCHANGED:
+                        report["unchanged"].append(str(file_path))
+                        continue
+                    
+                    metadata, chunks = await self.ingest_document(file_path, checksum=checksum)
+                    
+                    previous = manifest.get(file_path)
+                    if previous is not None:
+                        await memory_manager.delete_chunks(
+                            previous.chunk_ids, previous.source_id, agent_id
+                        )
+                    
+                    chunk_ids = await memory_manager.store_document_chunks(metadata, chunks, agent_id)
+                    manifest.record(file_path, metadata.source_id, metadata.checksum, chunk_ids)
+                    report["added" if status == IngestionManifest.NEW else "updated"].append(str(file_path))
+                
+                except Exception as e:
+                    logger.error(f"Failed to sync {file_path}: {e}")
+                    report["failed"].append(str(file_path))
+            
+            removed, failed = await self.purge_missing_sources(
+                directory_path, memory_manager, manifest, agent_id
+            )
+            report["removed"].extend(removed)
+            report["failed"].extend(failed)
+        
+        finally:
+            # Persist progress even if the sync is interrupted
+            manifest.save()
+        
+        logger.info(
+            f"Synced {directory_path}: {len(report['added'])} added, "
+            f"{len(report['updated'])} updated, {len(report['unchanged'])} unchanged, "
+            f"{len(report['removed'])} removed, {len(report['failed'])} failed"
+        )
+        return report
+    
+    async def purge_missing_sources(
+        self,
+        directory_path: Union[str, Path],
+        memory_manager: Any,
+        manifest: IngestionManifest,
+        agent_id: Optional[str] = None
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Delete the chunks of recorded sources that no longer exist on disk.
+        
+        Args:
+            directory_path: Directory whose manifest entries are checked
+            memory_manager: Memory manager that stores the chunks
+            manifest: Ingestion manifest to remove the entries from
+            agent_id: ID of the agent performing the purge
+        
+        Returns:
+            Tuple of (removed source paths, source paths that failed to purge)
+        """
+        removed: List[str] = []
+        failed: List[str] = []
+        for entry in manifest.missing_sources(directory_path):
+            try:
+                await memory_manager.delete_chunks(entry.chunk_ids, entry.source_id, agent_id)
+                manifest.remove(entry.source_path)
+                removed.append(entry.source_path)
+            except Exception as e:
+                logger.error(f"Failed to purge {entry.source_path}: {e}")
+                failed.append(entry.source_path)
+        return removed, failed
+
+
+def _ingest_in_worker(
+    file_path: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    token_counter: Optional[Callable[[str], int]] = None
+) -> Tuple[DocumentMetadata, List[DocumentChunk]]:
+    """Parse and chunk one document inside a worker process."""
+    ingestor = DocumentIngestor(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap, token_counter=token_counter
+    )
+    return asyncio.run(ingestor.ingest_document(file_path))
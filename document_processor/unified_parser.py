@@ -17,6 +17,7 @@ Features:
 
 import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Union, Tuple
@@ -31,6 +32,9 @@ from .table_extractor import TableExtractor, TableStructure
 
 logger = logging.getLogger(__name__)
 
+# Parser owned by each batch worker process
+_worker_parser = None
+
 
 class DocumentType(pydantic.BaseModel):
     """Document type model."""
@@ -437,52 +441,88 @@ class UnifiedDocumentParser:
             logger.error(f"Failed to save parsing result: {e}")
     
     def parse_batch(self, file_paths: List[Union[str, Path]], 
-                   options: Optional[ProcessingOptions] = None) -> List[DocumentParseResult]:
+                   options: Optional[ProcessingOptions] = None,
+                   max_workers: int = 1) -> List[DocumentParseResult]:
         """
         Parse multiple documents in batch.
         
         Args:
             file_paths: List of document paths
             options: Processing options
+            max_workers: Number of worker processes; 1 parses in-process
             
         Returns:
-            List of parsing results
+            List of parsing results, in the same order as file_paths
         """
         if options is None:
             options = ProcessingOptions()
         
-        results = []
-        
         logger.info(f"Parsing {len(file_paths)} documents in batch")
         
-        for file_path in file_paths:
-            try:
-                result = self.parse_document(file_path, options)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Failed to parse {file_path}: {e}")
-                # Create error result
-                error_result = DocumentParseResult(
-                    document_id="",
-                    file_path=str(file_path),
-                    document_type=self._get_document_type(Path(file_path)),
-                    processing_options=options,
-                    text_content="",
-                    metadata={},
-                    images=[],
-                    tables=[],
-                    layout_analysis=None,
-                    ocr_results=[],
-                    processing_time=0.0,
-                    success=False,
-                    errors=[str(e)]
-                )
-                results.append(error_result)
+        if max_workers > 1 and len(file_paths) > 1:
+            results = self._parse_batch_parallel(file_paths, options, max_workers)
+        else:
+            results = []
+            for file_path in file_paths:
+                try:
+                    results.append(self.parse_document(file_path, options))
+                except Exception as e:
+                    logger.error(f"Failed to parse {file_path}: {e}")
+                    results.append(self._error_result(file_path, options, e))
         
         logger.info(f"Batch parsing completed: {len(results)} results")
         
         return results
     
+    def _parse_batch_parallel(self, file_paths: List[Union[str, Path]],
+                              options: ProcessingOptions,
+                              max_workers: int) -> List[DocumentParseResult]:
+        """Parse documents across a process pool, tolerating per-file failures."""
+        results: List[Optional[DocumentParseResult]] = [None] * len(file_paths)
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_batch_worker,
+            initargs=(str(self.output_dir),)
+        ) as executor:
+            futures = {
+                executor.submit(_parse_in_worker, str(file_path), options): index
+                for index, file_path in enumerate(file_paths)
+            }
+            
+            for completed, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                file_path = file_paths[index]
+                try:
+                    results[index] = future.result()
+                    status = "parsed" if results[index].success else "failed"
+                except Exception as e:
+                    logger.error(f"Failed to parse {file_path}: {e}")
+                    results[index] = self._error_result(file_path, options, e)
+                    status = "failed"
+                logger.info(f"[{completed}/{len(file_paths)}] {status}: {Path(file_path).name}")
+        
+        return results
+    
+    def _error_result(self, file_path: Union[str, Path], options: ProcessingOptions,
+                      error: Exception) -> DocumentParseResult:
+        """Create a failed parsing result for a document."""
+        return DocumentParseResult(
+            document_id="",
+            file_path=str(file_path),
+            document_type=self._get_document_type(Path(file_path)),
+            processing_options=options,
+            text_content="",
+            metadata={},
+            images=[],
+            tables=[],
+            layout_analysis=None,
+            ocr_results=[],
+            processing_time=0.0,
+            success=False,
+            errors=[str(error)]
+        )
+    
     def get_supported_formats(self) -> List[str]:
         """Get list of supported document formats."""
         return list(self.document_types.keys())
@@ -580,4 +620,15 @@ class UnifiedDocumentParser:
             
         except Exception as e:
             logger.error(f"HTML export failed: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+
+def _init_batch_worker(output_dir: str):
+    """Create the parser used by a batch worker process."""
+    global _worker_parser
+    _worker_parser = UnifiedDocumentParser(output_dir)
+
+
+def _parse_in_worker(file_path: str, options: ProcessingOptions) -> DocumentParseResult:
+    """Parse one document inside a batch worker process."""
+    return _worker_parser.parse_document(file_path, options)
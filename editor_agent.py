@@ -5,21 +5,26 @@ Conducts revision and consistency passes on generated content.
 Ensures quality, coherence, and adherence to style guidelines.
 
 Chosen libraries:
-- asyncio: Asynchronous editing operations
+- asyncio: Asynchronous editing operations with bounded concurrency
 - pydantic: Data validation and type safety
 - logging: Editing activity logging
 
 Adapted from: AutoGen (https://github.com/microsoft/autogen)
-Pattern: Human-AI collaboration with structured feedback
+Pattern: Human-AI collaboration with structured feedback over overlapping
+review windows
 """
 
 import asyncio
 import logging
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import pydantic
 
+from text_chunker import TextChunk, TextChunker
+from text_statistics import compute_text_statistics, consistency_score, readability_score
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +52,7 @@ class EditReport(pydantic.BaseModel):
     readability_score: float
     consistency_score: float
     created_at: datetime
+    statistics: Dict[str, float] = {}
 
 
 class StyleGuide(pydantic.BaseModel):
@@ -78,7 +84,11 @@ class EditorAgent:
         self,
         agent_id: str,
         llm_client: Any,
-        style_guide: StyleGuide = None
+        style_guide: StyleGuide = None,
+        window_size: int = 2000,
+        window_overlap: int = 200,
+        max_concurrent_checks: int = 4,
+        use_llm_scoring: bool = False
     ):
         """
         Initialize the editor agent.
@@ -87,10 +97,21 @@ class EditorAgent:
             agent_id: Unique agent identifier
             llm_client: LLM client for text analysis and generation
             style_guide: Style guidelines to follow
+            window_size: Characters of content reviewed per LLM call
+            window_overlap: Characters shared by consecutive review windows
+            max_concurrent_checks: Review calls in flight at once
+            use_llm_scoring: Ask the LLM for consistency scores instead of
+                computing them locally from text statistics
         """
+        if max_concurrent_checks < 1:
+            raise ValueError("max_concurrent_checks must be at least 1")
+        
         self.agent_id = agent_id
         self.llm_client = llm_client
         self.style_guide = style_guide or StyleGuide()
+        self.window_chunker = TextChunker(chunk_size=window_size, chunk_overlap=window_overlap)
+        self.max_concurrent_checks = max_concurrent_checks
+        self.use_llm_scoring = use_llm_scoring
         
         # Editing state
         self.edit_reports: Dict[str, EditReport] = {}
@@ -120,29 +141,17 @@ class EditorAgent:
         report_id = f"report_{content_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         try:
-            # Analyze content for various issues
-            suggestions = []
-            
-            # Grammar and style check
-            grammar_suggestions = await self._check_grammar_and_style(content)
-            suggestions.extend(grammar_suggestions)
-            
-            # Clarity and readability check
-            clarity_suggestions = await self._check_clarity(content)
-            suggestions.extend(clarity_suggestions)
-            
-            # Structure and organization check
-            structure_suggestions = await self._check_structure(content)
-            suggestions.extend(structure_suggestions)
-            
-            # Citation and fact check
-            citation_suggestions = await self._check_citations(content)
-            suggestions.extend(citation_suggestions)
+            # Run every check over every window of the content
+            suggestions, llm_consistency = await self._review_windows(content)
             
             # Calculate scores
+            statistics = compute_text_statistics(content)
             overall_score = await self._calculate_overall_score(content, suggestions)
-            readability_score = await self._calculate_readability_score(content)
-            consistency_score = await self._calculate_consistency_score(content)
+            readability = readability_score(statistics)
+            consistency = (
+                llm_consistency if llm_consistency is not None
+                else consistency_score(statistics)
+            )
             
             # Generate summary
             summary = await self._generate_edit_summary(content, suggestions, overall_score)
@@ -156,9 +165,10 @@ class EditorAgent:
                 suggestions=suggestions,
                 summary=summary,
                 word_count=len(content.split()),
-                readability_score=readability_score,
-                consistency_score=consistency_score,
-                created_at=datetime.now()
+                readability_score=readability,
+                consistency_score=consistency,
+                created_at=datetime.now(),
+                statistics=statistics._asdict()
             )
             
             self.edit_reports[report_id] = report
@@ -179,6 +189,89 @@ class EditorAgent:
             logger.error(f"Failed to review content {content_id}: {e}")
             raise
     
+    async def _review_windows(self, content: str) -> Tuple[List[EditSuggestion], Optional[float]]:
+        """
+        Review overlapping windows of the content concurrently.
+        
+        Grammar, clarity, structure and citation checks (plus LLM consistency
+        scoring when enabled) run for every window, with at most
+        ``max_concurrent_checks`` LLM calls in flight. Suggestion positions
+        are mapped back to offsets in the full content and duplicates from
+        overlapping windows are dropped.
+        
+        Args:
+            content: Content to review
+            
+        Returns:
+            (merged suggestions ordered by position, mean LLM consistency
+            score or None when scoring locally)
+        """
+        windows = self.window_chunker.chunk_text(content)
+        if not windows:
+            return [], None
+        
+        checks: List[Callable[[str], Awaitable[List[EditSuggestion]]]] = [
+            self._check_grammar_and_style,
+            self._check_clarity,
+            self._check_structure,
+            self._check_citations
+        ]
+        semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+        
+        async def bounded(call: Awaitable):
+            async with semaphore:
+                return await call
+        
+        check_calls = [bounded(check(window.content)) for window in windows for check in checks]
+        consistency_calls = [
+            bounded(self._calculate_llm_consistency_score(window.content)) for window in windows
+        ] if self.use_llm_scoring else []
+        results = await asyncio.gather(*check_calls, *consistency_calls)
+        
+        window_suggestions = [
+            (windows[index // len(checks)], suggestions)
+            for index, suggestions in enumerate(results[:len(check_calls)])
+        ]
+        consistency_scores = results[len(check_calls):]
+        
+        logger.info(
+            f"Reviewed {len(windows)} windows with {len(check_calls) + len(consistency_calls)} checks"
+        )
+        return (
+            self._merge_window_suggestions(window_suggestions),
+            sum(consistency_scores) / len(consistency_scores) if consistency_scores else None
+        )
+    
+    def _merge_window_suggestions(
+        self,
+        window_suggestions: List[Tuple[TextChunk, List[EditSuggestion]]]
+    ) -> List[EditSuggestion]:
+        """Translate window positions to content offsets and drop duplicates."""
+        merged: Dict[Tuple[str, Any], EditSuggestion] = {}
+        
+        for window, suggestions in window_suggestions:
+            for suggestion in suggestions:
+                local = window.content.find(suggestion.original_text) if suggestion.original_text else -1
+                if local >= 0:
+                    position = window.start + local
+                    key = (suggestion.type, position, suggestion.original_text)
+                else:
+                    # Fall back to the model's approximate position
+                    position = window.start + min(max(suggestion.position, 0), len(window.content))
+                    key = (suggestion.type, suggestion.original_text.strip().lower(),
+                           suggestion.suggested_text.strip().lower())
+                
+                existing = merged.get(key)
+                if existing is None or suggestion.confidence > existing.confidence:
+                    merged[key] = suggestion.copy(update={"position": position})
+        
+        ordered = sorted(merged.values(), key=lambda s: (s.position, s.type))
+        counts: Dict[str, int] = {}
+        for suggestion in ordered:
+            suggestion.suggestion_id = f"{suggestion.type}_{counts.get(suggestion.type, 0)}"
+            counts[suggestion.type] = counts.get(suggestion.type, 0) + 1
+        return ordered
+    
     async def _check_grammar_and_style(self, content: str) -> List[EditSuggestion]:
         """Check grammar and style issues."""
         suggestions = []
@@ -199,7 +292,7 @@ class EditorAgent:
             - Preferred words: {self.style_guide.preferred_words}
             
             Text to review:
-            {content[:2000]}  # Limit for prompt size
+            {content}
             
             Provide specific suggestions with:
             - Type of issue (grammar, style, word_choice)
@@ -238,7 +331,7 @@ class EditorAgent:
             5. Logical flow and transitions
             
             Text to review:
-            {content[:2000]}
+            {content}
             
             Provide specific suggestions with:
             - Type of issue (clarity, readability, jargon, flow)
@@ -276,7 +369,7 @@ class EditorAgent:
             5. Missing introductions or conclusions
             
             Text to review:
-            {content[:2000]}
+            {content}
             
             Provide specific suggestions with:
             - Type of issue (structure, organization, flow, repetition)
@@ -316,7 +409,7 @@ class EditorAgent:
             Citation Style: {self.style_guide.citation_style}
             
             Text to review:
-            {content[:2000]}
+            {content}
             
             Provide specific suggestions with:
             - Type of issue (citation, fact_check, evidence)
@@ -364,7 +457,7 @@ class EditorAgent:
                             original_text=current_suggestion.get('original', ''),
                             suggested_text=current_suggestion.get('suggested', ''),
                             explanation=current_suggestion.get('explanation', ''),
-                            position=current_suggestion.get('position', 0),
+                            position=self._parse_position(current_suggestion.get('position')),
                             confidence=0.8  # Default confidence
                         )
                         suggestions.append(suggestion)
@@ -389,7 +482,7 @@ class EditorAgent:
                     original_text=current_suggestion.get('original', ''),
                     suggested_text=current_suggestion.get('suggested', ''),
                     explanation=current_suggestion.get('explanation', ''),
-                    position=current_suggestion.get('position', 0),
+                    position=self._parse_position(current_suggestion.get('position')),
                     confidence=0.8
                 )
                 suggestions.append(suggestion)
@@ -399,6 +492,12 @@ class EditorAgent:
         
         return suggestions
     
+    @staticmethod
+    def _parse_position(value: Optional[str]) -> int:
+        """Read a character position such as "approximately 120" from a response."""
+        match = re.search(r'\d+', value or '')
+        return int(match.group()) if match else 0
+    
     async def _calculate_overall_score(self, content: str, suggestions: List[EditSuggestion]) -> float:
         """Calculate overall quality score."""
         if not suggestions:
@@ -422,30 +521,17 @@ class EditorAgent:
         return max(0.0, min(1.0, score))
     
     async def _calculate_readability_score(self, content: str) -> float:
-        """Calculate readability score."""
-        try:
-            # Simple readability calculation based on sentence length and word complexity
-            sentences = content.split('.')
-            words = content.split()
-            
-            if not sentences or not words:
-                return 0.5
-            
-            avg_sentence_length = len(words) / len(sentences)
-            avg_word_length = sum(len(word) for word in words) / len(words)
-            
-            # Simple scoring (higher is more readable)
-            sentence_score = max(0, 1.0 - (avg_sentence_length - 15) / 20)
-            word_score = max(0, 1.0 - (avg_word_length - 4) / 4)
-            
-            return (sentence_score + word_score) / 2
-            
-        except Exception as e:
-            logger.warning(f"Failed to calculate readability score: {e}")
-            return 0.5
+        """Calculate readability score from Flesch reading ease."""
+        return readability_score(compute_text_statistics(content))
     
     async def _calculate_consistency_score(self, content: str) -> float:
-        """Calculate consistency score."""
+        """Calculate consistency score locally, or with the LLM if configured."""
+        if self.use_llm_scoring:
+            return await self._calculate_llm_consistency_score(content)
+        return consistency_score(compute_text_statistics(content))
+    
+    async def _calculate_llm_consistency_score(self, content: str) -> float:
+        """Calculate consistency score with an LLM rating."""
         try:
             # Check for consistency in style, tone, and terminology
             prompt = f"""
@@ -456,7 +542,7 @@ class EditorAgent:
             4. Consistent citation style
             
             Text:
-            {content[:1000]}
+            {content}
             
             Provide only a number between 0 and 1.
             """
@@ -468,7 +554,6 @@ class EditorAgent:
             )
             
             # Extract number from response
-            import re
             numbers = re.findall(r'0\.\d+|1\.0|0|1', response.content)
             if numbers:
                 return float(numbers[0])
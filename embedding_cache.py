@@ -0,0 +1,261 @@
+"""
+Embedding Cache Module
+
+Content-addressed cache for text embeddings with a memory-resident LRU tier
+and a size-bounded on-disk tier. Entries are keyed by (model name, text hash)
+so the same text is only ever embedded once per model.
+
+Chosen libraries:
+- sqlite3: Persistent on-disk tier with indexed access-time eviction
+- array: Compact float32 serialization of embedding vectors
+- collections.OrderedDict: In-memory LRU tier
+
+Pattern: Two-tier read-through cache with hit/miss accounting
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache for embedding vectors.
+
+    Responsibilities:
+    - Derive stable cache keys from model name and text content
+    - Serve hot embeddings from an in-memory LRU tier
+    - Persist embeddings to a size-bounded SQLite store
+    - Track memory hits, disk hits and misses
+    """
+
+    def __init__(
+        self,
+        cache_directory: Union[str, Path],
+        max_memory_entries: int = 10000,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            cache_directory: Directory holding the on-disk cache database
+            max_memory_entries: Maximum number of embeddings kept in memory
+            max_disk_bytes: Maximum total size of embeddings stored on disk
+        """
+        self.cache_directory = Path(cache_directory)
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.db_path = self.cache_directory / "embedding_cache.sqlite"
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+        self._disk_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM embeddings"
+        ).fetchone()[0]
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        """Build the cache key for a text embedded by a given model."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model_name}:{text_hash}"
+
+    def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up embeddings for several texts.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts to look up
+
+        Returns:
+            List aligned with ``texts`` holding cached embeddings or None
+        """
+        keys = [self.make_key(model_name, text) for text in texts]
+        results: List[Optional[List[float]]] = [None] * len(keys)
+        disk_lookups: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = embedding
+                    self.memory_hits += 1
+                else:
+                    disk_lookups.setdefault(key, []).append(i)
+
+            if disk_lookups:
+                found = self._read_from_disk(list(disk_lookups))
+                for key, positions in disk_lookups.items():
+                    embedding = found.get(key)
+                    if embedding is None:
+                        self.misses += len(positions)
+                        continue
+                    self.disk_hits += len(positions)
+                    self._remember(key, embedding)
+                    for i in positions:
+                        results[i] = embedding
+
+        return results
+
+    def put_many(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float]]
+    ):
+        """
+        Store embeddings for several texts in both tiers.
+
+        Args:
+            model_name: Name of the embedding model
+            texts: Texts that were embedded
+            embeddings: Embeddings aligned with ``texts``
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, embedding in zip(texts, embeddings):
+                key = self.make_key(model_name, text)
+                embedding = list(embedding)
+                self._remember(key, embedding)
+                blob = array("f", embedding).tobytes()
+                rows.append((key, model_name, blob, len(blob), now))
+
+            if rows:
+                self._write_to_disk(rows)
+
+    def _remember(self, key: str, embedding: List[float]):
+        """Insert an embedding into the memory tier, evicting the LRU entry."""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_from_disk(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Read embeddings from the disk tier and refresh their access time."""
+        found: Dict[str, List[float]] = {}
+        try:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" for _ in batch)
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+
+        return found
+
+    def _write_to_disk(self, rows: List[tuple]):
+        """Write embeddings to the disk tier and enforce the size bound."""
+        try:
+            keys = [row[0] for row in rows]
+            replaced = 0
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" for _ in batch)
+                replaced += self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM embeddings WHERE key IN ({placeholders})",
+                    batch
+                ).fetchone()[0]
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._disk_bytes += sum(row[3] for row in rows) - replaced
+
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_from_disk()
+
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _evict_from_disk(self):
+        """Delete least recently used rows until the disk tier fits its budget."""
+        cursor = self._conn.execute(
+            "SELECT key, size FROM embeddings ORDER BY last_access ASC"
+        )
+        to_delete = []
+        for key, size in cursor:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            to_delete.append((key,))
+            self._disk_bytes -= size
+
+        self._conn.executemany("DELETE FROM embeddings WHERE key = ?", to_delete)
+        logger.debug(f"Evicted {len(to_delete)} embeddings from disk cache")
+
+    def clear(self):
+        """Remove every cached embedding from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._disk_bytes = 0
+
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and tier sizes."""
+        with self._lock:
+            disk_entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "disk_bytes": self._disk_bytes
+            }
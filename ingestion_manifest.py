@@ -0,0 +1,180 @@
+"""
+Ingestion Manifest Module
+
+Records what has been ingested from each source file so that directory
+re-syncs only touch files that were added, changed or deleted.
+
+Chosen libraries:
+- json: Human-readable manifest persistence
+- pydantic: Data validation and type safety
+- pathlib: Path normalization
+
+Pattern: Change detection keyed on file size, mtime and content checksum
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pydantic
+
+logger = logging.getLogger(__name__)
+
+
+class ManifestEntry(pydantic.BaseModel):
+    """Model for a single ingested source."""
+    source_path: str
+    source_id: str
+    checksum: str
+    mtime: float
+    file_size: int
+    chunk_ids: List[str] = []
+    ingested_at: datetime
+
+
+class IngestionManifest:
+    """
+    Persistent record of ingested sources.
+
+    Responsibilities:
+    - Remember checksum, mtime, size and chunk IDs per source
+    - Classify files as new, changed or unchanged
+    - Find sources that disappeared from a directory
+    - Persist atomically to a JSON file
+    """
+
+    NEW = "new"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+
+    def __init__(self, manifest_path: Union[str, Path]):
+        """
+        Initialize the ingestion manifest.
+
+        Args:
+            manifest_path: Path of the JSON manifest file
+        """
+        self.manifest_path = Path(manifest_path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._load()
+
+    @staticmethod
+    def _key(file_path: Union[str, Path]) -> str:
+        """Normalize a file path into a manifest key."""
+        return str(Path(file_path).resolve())
+
+    def _load(self):
+        """Load the manifest from disk if it exists."""
+        if not self.manifest_path.exists():
+            return
+
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = {
+                key: ManifestEntry(**entry) for key, entry in data.get("sources", {}).items()
+            }
+        except Exception as e:
+            logger.warning(f"Failed to load ingestion manifest, starting empty: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the manifest to disk atomically."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "updated_at": datetime.now().isoformat(),
+            "sources": {key: entry.dict() for key, entry in self.entries.items()}
+        }
+
+        temp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(temp_path, self.manifest_path)
+
+    def get(self, file_path: Union[str, Path]) -> Optional[ManifestEntry]:
+        """Get the manifest entry for a file."""
+        return self.entries.get(self._key(file_path))
+
+    def classify(self, file_path: Union[str, Path], checksum: Optional[str] = None) -> str:
+        """
+        Classify a file against the manifest.
+
+        Size and mtime are compared first; the checksum is only consulted
+        when they differ, so touched-but-identical files are not re-ingested.
+
+        Args:
+            file_path: Path to the file
+            checksum: Current checksum of the file, if already known
+
+        Returns:
+            One of NEW, CHANGED or UNCHANGED
+        """
+        entry = self.get(file_path)
+        if entry is None:
+            return self.NEW
+
+        stat = Path(file_path).stat()
+        if stat.st_size == entry.file_size and stat.st_mtime == entry.mtime:
+            return self.UNCHANGED
+
+        if checksum is not None and checksum == entry.checksum:
+            # Content is identical; remember the new mtime for the fast path
+            entry.mtime = stat.st_mtime
+            return self.UNCHANGED
+
+        return self.CHANGED
+
+    def record(
+        self,
+        file_path: Union[str, Path],
+        source_id: str,
+        checksum: str,
+        chunk_ids: List[str]
+    ) -> ManifestEntry:
+        """
+        Record a successful ingestion.
+
+        Args:
+            file_path: Path to the ingested file
+            source_id: Source ID assigned by the ingestor
+            checksum: Checksum of the ingested content
+            chunk_ids: IDs of the chunks stored for the file
+
+        Returns:
+            The new manifest entry
+        """
+        stat = Path(file_path).stat()
+        entry = ManifestEntry(
+            source_path=self._key(file_path),
+            source_id=source_id,
+            checksum=checksum,
+            mtime=stat.st_mtime,
+            file_size=stat.st_size,
+            chunk_ids=chunk_ids,
+            ingested_at=datetime.now()
+        )
+        self.entries[entry.source_path] = entry
+        return entry
+
+    def remove(self, file_path: Union[str, Path]) -> Optional[ManifestEntry]:
+        """Remove and return the manifest entry for a file."""
+        return self.entries.pop(self._key(file_path), None)
+
+    def missing_sources(self, directory_path: Union[str, Path]) -> List[ManifestEntry]:
+        """
+        Find recorded sources under a directory whose files no longer exist.
+
+        Args:
+            directory_path: Directory that was synced
+
+        Returns:
+            Manifest entries for deleted files
+        """
+        prefix = self._key(directory_path) + os.sep
+        return [
+            entry for key, entry in self.entries.items()
+            if key.startswith(prefix) and not Path(key).exists()
+        ]
@@ -0,0 +1,260 @@
+"""
+Interpreter Pool Module
+
+Keeps a pool of pre-started Python interpreters so tool scripts do not pay
+interpreter start-up on the critical path. Each worker has finished booting
+and is blocked waiting for a job when a script arrives; it runs exactly one
+script and exits, and a replacement is started in the background. Every run
+therefore gets a fresh interpreter (no state leaks between scripts) while
+cold-start cost is overlapped with idle time instead of added to latency.
+
+Workers are driven through asyncio subprocess pipes so a running script never
+blocks the event loop, and on POSIX each worker applies address-space and
+CPU-time limits to itself before executing the script.
+
+Chosen libraries:
+- asyncio: Non-blocking subprocess pipes and timeouts
+- resource: Per-run memory and CPU limits (POSIX only)
+- json: Job hand-off to the worker
+
+Pattern: Pre-started single-use worker pool
+"""
+
+import asyncio
+import json
+import logging
+import sys
+from collections import deque
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Runs inside each worker. Boots, blocks on stdin for one job, applies the
+# job's resource limits and executes the script in a fresh __main__ namespace.
+WORKER_BOOTSTRAP = r"""
+import json, os, sys, traceback
+job = json.loads(sys.stdin.readline() or "null")
+if job is None:
+    sys.exit(0)
+try:
+    import resource
+    if job.get("max_memory_mb"):
+        limit = job["max_memory_mb"] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if job.get("cpu_seconds"):
+        seconds = int(job["cpu_seconds"])
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+except (ImportError, ValueError, OSError):
+    pass
+if job.get("cwd"):
+    os.chdir(job["cwd"])
+    sys.path.insert(0, job["cwd"])
+sys.argv = ["<script>"]
+try:
+    exec(compile(job["script"], "<script>", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+except SystemExit:
+    raise
+except BaseException:
+    traceback.print_exc()
+    sys.exit(1)
+"""
+
+
+class ScriptResult:
+    """Outcome of one script run."""
+
+    def __init__(self, returncode: Optional[int], stdout: str, stderr: str, timed_out: bool = False):
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = timed_out
+
+
+class InterpreterPool:
+    """
+    Pool of pre-started, single-use Python interpreter workers.
+
+    Responsibilities:
+    - Keep ``size`` booted workers waiting for jobs
+    - Run scripts through async pipes with a timeout
+    - Apply memory and CPU limits to each run
+    - Replace consumed workers in the background
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_concurrent_runs: int = 8,
+        max_memory_mb: Optional[int] = None,
+        cwd: Optional[str] = None,
+        python_executable: Optional[str] = None
+    ):
+        """
+        Initialize the interpreter pool.
+
+        Args:
+            size: Number of warm workers kept ready
+            max_concurrent_runs: Maximum scripts running at once
+            max_memory_mb: Address-space limit per run (None for no limit)
+            cwd: Working directory for scripts
+            python_executable: Interpreter to start (defaults to the current one)
+        """
+        if size < 0:
+            raise ValueError("size must not be negative")
+        if max_concurrent_runs < 1:
+            raise ValueError("max_concurrent_runs must be at least 1")
+
+        self.size = size
+        self.max_concurrent_runs = max_concurrent_runs
+        self.max_memory_mb = max_memory_mb
+        self.cwd = cwd
+        self.python_executable = python_executable or sys.executable
+
+        self._idle: Deque[asyncio.subprocess.Process] = deque()
+        self._starting = 0
+        self._replenisher: Optional[asyncio.Future] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed = False
+
+        self.warm_starts = 0
+        self.cold_starts = 0
+        self.timeouts = 0
+
+    def _bind_loop(self):
+        """Bind pool state to the running loop, dropping workers from a previous loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            self._kill_idle()
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+        self._starting = 0
+        self._replenisher = None
+        self._closed = False
+
+    async def _spawn(self) -> asyncio.subprocess.Process:
+        """Start one worker interpreter."""
+        return await asyncio.create_subprocess_exec(
+            self.python_executable, "-I", "-c", WORKER_BOOTSTRAP,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd
+        )
+
+    async def _replenish(self):
+        """Start workers until ``size`` are idle or booting."""
+        while not self._closed and len(self._idle) + self._starting < self.size:
+            self._starting += 1
+            try:
+                process = await self._spawn()
+            except Exception as e:
+                logger.warning(f"Failed to start interpreter worker: {e}")
+                return
+            finally:
+                self._starting -= 1
+            if self._closed:
+                process.kill()
+                await process.wait()
+                return
+            self._idle.append(process)
+
+    def _take_idle(self) -> Optional[asyncio.subprocess.Process]:
+        """Pop a live idle worker, discarding any that have died."""
+        while self._idle:
+            process = self._idle.popleft()
+            if process.returncode is None:
+                return process
+        return None
+
+    async def start(self):
+        """Start the warm workers ahead of the first run."""
+        self._bind_loop()
+        await self._replenish()
+
+    async def run(self, script: str, timeout: float, cwd: Optional[str] = None) -> ScriptResult:
+        """
+        Run a script in a fresh worker.
+
+        Args:
+            script: Python source to execute
+            timeout: Seconds of wall-clock time before the run is killed
+            cwd: Working directory for this run (defaults to the pool's)
+
+        Returns:
+            Exit code and captured output of the run
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            process = self._take_idle()
+            if process is None:
+                process = await self._spawn()
+                self.cold_starts += 1
+            else:
+                self.warm_starts += 1
+            if self._replenisher is None or self._replenisher.done():
+                self._replenisher = asyncio.ensure_future(self._replenish())
+
+            job = json.dumps({
+                "script": script,
+                "cwd": cwd or self.cwd,
+                "max_memory_mb": self.max_memory_mb,
+                "cpu_seconds": max(1, int(timeout) + 1)
+            })
+
+            try:
+                stdout, stderr = await asyncio.wait_for(
+                    process.communicate((job + "\n").encode("utf-8")), timeout
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                await self._kill(process)
+                return ScriptResult(None, "", "", timed_out=True)
+            except BaseException:
+                await self._kill(process)
+                raise
+
+            return ScriptResult(
+                process.returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace")
+            )
+
+    @staticmethod
+    async def _kill(process: asyncio.subprocess.Process):
+        """Kill a worker and reap it."""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+        await process.wait()
+
+    def _kill_idle(self):
+        """Kill idle workers without waiting (they may belong to a closed loop)."""
+        while self._idle:
+            process = self._idle.popleft()
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    async def close(self):
+        """Stop all idle workers."""
+        self._closed = True
+        if self._replenisher is not None and not self._replenisher.done():
+            await self._replenisher
+        while self._idle:
+            await self._kill(self._idle.popleft())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get warm/cold start and timeout counters."""
+        return {
+            "size": self.size,
+            "idle_workers": len(self._idle),
+            "warm_starts": self.warm_starts,
+            "cold_starts": self.cold_starts,
+            "timeouts": self.timeouts
+        }
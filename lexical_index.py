@@ -0,0 +1,305 @@
+"""
+Lexical Index Module
+
+Inverted BM25 index kept next to the vector store so exact terms - proper
+nouns, card names, citation keys - are found even when dense similarity
+misses them. Documents are added and removed incrementally; postings live in
+memory for scoring and are mirrored to SQLite so the index survives restarts
+without re-tokenising the corpus. Also provides reciprocal-rank fusion for
+merging ranked lists from different retrievers.
+
+Chosen libraries:
+- sqlite3: Persistent postings and document lengths
+- re: Unicode word tokenisation
+- heapq: Top-k selection over scored candidates
+- math: BM25 inverse document frequency
+
+Pattern: Incremental inverted index with Okapi BM25 scoring
+"""
+
+import heapq
+import logging
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+TOKEN = re.compile(r"\w+(?:['’]\w+)*", re.UNICODE)
+
+# Very common words carry almost no BM25 weight but have the longest
+# postings lists, so dropping them keeps query-time work small
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i in is it its of on or
+she that the their them there they this to was were which with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased index terms.
+
+    Possessive suffixes are removed so "Fool's" matches "fool", and stopwords
+    are dropped. No stemming is applied, keeping proper nouns exact.
+
+    Args:
+        text: Text to tokenise
+
+    Returns:
+        Terms in document order
+    """
+    terms = []
+    for match in TOKEN.finditer(text.lower()):
+        term = match.group(0)
+        if term.endswith(("'s", "’s")):
+            term = term[:-2]
+        if term and term not in STOPWORDS:
+            terms.append(term)
+    return terms
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists with reciprocal-rank fusion.
+
+    Each list contributes 1 / (k + rank) for every ID it contains, so items
+    ranked well by several retrievers rise to the top without having to
+    calibrate their raw scores against each other.
+
+    Args:
+        rankings: Ranked lists of IDs, best first
+        k: Damping constant (60 is the value from the original RRF paper)
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            fused[item] = fused.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda pair: pair[1], reverse=True)
+
+
+class BM25Index:
+    """
+    Incrementally maintained BM25 inverted index.
+
+    Responsibilities:
+    - Tokenise and index documents as they are stored
+    - Remove documents when they are deleted or replaced
+    - Score queries with Okapi BM25 over the postings of query terms only
+    - Persist postings so the index is available immediately after a restart
+    """
+
+    def __init__(
+        self,
+        index_directory: Optional[Union[str, Path]] = None,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            index_directory: Directory holding the index database (memory only if None)
+            k1: Term-frequency saturation parameter
+            b: Document-length normalisation parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if index_directory is not None:
+            index_directory = Path(index_directory)
+            index_directory.mkdir(parents=True, exist_ok=True)
+            self.db_path = index_directory / "lexical_index.sqlite"
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS documents (
+                    doc_id TEXT PRIMARY KEY,
+                    length INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, doc_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_postings_doc_id ON postings (doc_id);
+                """
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self):
+        """Load persisted postings into memory."""
+        for doc_id, length in self._conn.execute("SELECT doc_id, length FROM documents"):
+            self._lengths[doc_id] = length
+            self._total_length += length
+        doc_terms: Dict[str, List[str]] = {}
+        for term, doc_id, tf in self._conn.execute("SELECT term, doc_id, tf FROM postings"):
+            self._postings.setdefault(term, {})[doc_id] = tf
+            doc_terms.setdefault(doc_id, []).append(term)
+        self._doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+        if self._lengths:
+            logger.info(f"Loaded lexical index with {len(self._lengths)} documents")
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def add_documents(self, doc_ids: Sequence[str], texts: Sequence[str]):
+        """
+        Index documents, replacing any existing entries with the same IDs.
+
+        Args:
+            doc_ids: Document IDs
+            texts: Document texts aligned with ``doc_ids``
+        """
+        tokenised = [(doc_id, Counter(tokenize(text))) for doc_id, text in zip(doc_ids, texts)]
+
+        with self._lock:
+            self._remove_locked([doc_id for doc_id, _ in tokenised if doc_id in self._lengths])
+
+            for doc_id, counts in tokenised:
+                length = sum(counts.values())
+                self._lengths[doc_id] = length
+                self._doc_terms[doc_id] = tuple(counts)
+                self._total_length += length
+                for term, tf in counts.items():
+                    self._postings.setdefault(term, {})[doc_id] = tf
+
+            if self._conn is not None:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO documents (doc_id, length) VALUES (?, ?)",
+                        [(doc_id, sum(counts.values())) for doc_id, counts in tokenised]
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                        [
+                            (term, doc_id, tf)
+                            for doc_id, counts in tokenised
+                            for term, tf in counts.items()
+                        ]
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Lexical index write failed: {e}")
+
+    def remove_documents(self, doc_ids: Sequence[str]):
+        """
+        Remove documents from the index.
+
+        Args:
+            doc_ids: IDs of the documents to remove (unknown IDs are ignored)
+        """
+        with self._lock:
+            self._remove_locked([doc_id for doc_id in doc_ids if doc_id in self._lengths])
+
+    def _remove_locked(self, doc_ids: List[str]):
+        """Remove known documents; the caller holds the lock."""
+        if not doc_ids:
+            return
+
+        removing = set(doc_ids)
+        for doc_id in removing:
+            self._total_length -= self._lengths.pop(doc_id)
+            for term in self._doc_terms.pop(doc_id, ()):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+        if self._conn is not None:
+            try:
+                rows = [(doc_id,) for doc_id in removing]
+                self._conn.executemany("DELETE FROM postings WHERE doc_id = ?", rows)
+                self._conn.executemany("DELETE FROM documents WHERE doc_id = ?", rows)
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Lexical index delete failed: {e}")
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        allowed_ids: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank documents against a query with BM25.
+
+        Only the postings of the query's own terms are visited, so cost grows
+        with how common those terms are rather than with corpus size.
+
+        Args:
+            query: Query text
+            top_k: Number of results to return
+            allowed_ids: Restrict results to these document IDs
+
+        Returns:
+            (doc_id, BM25 score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._lengths)
+            if not terms or not doc_count:
+                return []
+            average_length = self._total_length / doc_count or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    if allowed_ids is not None and doc_id not in allowed_ids:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda pair: pair[1])
+
+    def clear(self):
+        """Remove every document from the index."""
+        with self._lock:
+            self._postings.clear()
+            self._lengths.clear()
+            self._doc_terms.clear()
+            self._total_length = 0
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM postings")
+                self._conn.execute("DELETE FROM documents")
+                self._conn.commit()
+
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get document, term and length counts."""
+        with self._lock:
+            return {
+                "documents": len(self._lengths),
+                "terms": len(self._postings),
+                "average_length": self._total_length / len(self._lengths) if self._lengths else 0.0
+            }
@@ -6,7 +6,10 @@ Supports both local (Ollama) and remote (OpenAI) LLM providers.
 
 Chosen libraries:
 - OpenAI: Remote LLM API access
-- requests: HTTP client for Ollama API
+- httpx: Pooled async HTTP client for Ollama API
+- requests: One-off Ollama model discovery at startup
+- response_cache: Optional memory/SQLite response caching
+- rate_limiter: Shared per-provider request and token pacing
 - pydantic: Data validation and type safety
 - asyncio: Asynchronous operations
 
@@ -19,12 +22,16 @@ import json
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
+import httpx
 import openai
 import pydantic
 import requests
 
+from rate_limiter import RateLimiter, get_shared_rate_limiter
+from response_cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +68,10 @@ class LLMProvider(ABC):
         """Generate a streaming response from the LLM."""
         pass
     
+    async def aclose(self):
+        """Release network resources held by the provider."""
+        pass
+    
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """Get list of available models."""
@@ -168,23 +179,54 @@ class OpenAIProvider(LLMProvider):
             logger.error(f"OpenAI streaming error: {e}")
             raise
     
+    async def aclose(self):
+        """Close the OpenAI HTTP client."""
+        await self.client.close()
+    
     def get_available_models(self) -> List[str]:
         """Get available OpenAI models."""
         return self.available_models
 
 
 class OllamaProvider(LLMProvider):
-    """Ollama local LLM provider."""
+    """
+    Ollama local LLM provider.
+    
+    Requests go through one pooled, keep-alive ``httpx.AsyncClient`` and are
+    limited by a semaphore, so generations never block the event loop and
+    concurrent callers share connections up to a configurable limit.
+    """
     
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        max_concurrent_requests: int = 4,
+        max_connections: int = 10,
+        timeout: float = 60.0
+    ):
         """
         Initialize Ollama provider.
         
         Args:
             base_url: Ollama server URL
+            max_concurrent_requests: Maximum number of generations in flight
+            max_connections: Maximum number of pooled HTTP connections
+            timeout: Timeout in seconds for connecting and between response reads
         """
+        if max_concurrent_requests < 1:
+            raise ValueError("max_concurrent_requests must be at least 1")
+        
         self.base_url = base_url
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_connections = max(max_connections, max_concurrent_requests)
+        self.timeout = timeout
         self.available_models = []
+        
+        # Created lazily because both are bound to the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
         self._load_available_models()
     
     def _load_available_models(self):
@@ -201,30 +243,50 @@ class OllamaProvider(LLMProvider):
             logger.warning(f"Failed to connect to Ollama: {e}")
             self.available_models = ["llama2", "codellama", "mistral"]  # Default fallback
     
+    def _get_client(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """Get the pooled HTTP client and concurrency limit for the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            # A client from a finished loop cannot be reused; its sockets died with it
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._loop = loop
+        return self._client, self._semaphore
+    
+    def _build_payload(self, request: LLMRequest, stream: bool) -> Dict:
+        """Build the /api/generate payload for a request."""
+        default_model = self.available_models[0] if self.available_models else "llama2"
+        payload = {
+            "model": request.model or default_model,
+            "prompt": request.prompt,
+            "stream": stream,
+            "options": {
+                "temperature": request.temperature,
+                "num_predict": request.max_tokens
+            }
+        }
+        
+        # Add system message if provided
+        if request.system_message:
+            payload["system"] = request.system_message
+        
+        return payload
+    
     async def generate(self, request: LLMRequest) -> LLMResponse:
         """Generate a response using Ollama API."""
         try:
-            # Prepare the request payload
-            payload = {
-                "model": request.model or self.available_models[0] if self.available_models else "llama2",
-                "prompt": request.prompt,
-                "stream": False,
-                "options": {
-                    "temperature": request.temperature,
-                    "num_predict": request.max_tokens
-                }
-            }
-            
-            # Add system message if provided
-            if request.system_message:
-                payload["system"] = request.system_message
+            client, semaphore = self._get_client()
+            payload = self._build_payload(request, stream=False)
             
-            # Make the request
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=60
-            )
+            async with semaphore:
+                response = await client.post("/api/generate", json=payload)
             
             if response.status_code != 200:
                 raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
@@ -251,46 +313,40 @@ class OllamaProvider(LLMProvider):
             raise
     
     async def generate_stream(self, request: LLMRequest):
-        """Generate a streaming response using Ollama API."""
+        """Generate a streaming response using Ollama API, yielding tokens as they arrive."""
         try:
-            payload = {
-                "model": request.model or self.available_models[0] if self.available_models else "llama2",
-                "prompt": request.prompt,
-                "stream": True,
-                "options": {
-                    "temperature": request.temperature,
-                    "num_predict": request.max_tokens
-                }
-            }
-            
-            if request.system_message:
-                payload["system"] = request.system_message
+            client, semaphore = self._get_client()
+            payload = self._build_payload(request, stream=True)
             
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                stream=True,
-                timeout=60
-            )
-            
-            if response.status_code != 200:
-                raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
-            
-            for line in response.iter_lines():
-                if line:
-                    try:
-                        data = json.loads(line.decode('utf-8'))
+            async with semaphore:
+                async with client.stream("POST", "/api/generate", json=payload) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        raise Exception(f"Ollama API error: {response.status_code} - {body}")
+                    
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        try:
+                            data = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
                         if "response" in data:
                             yield data["response"]
                         if data.get("done", False):
                             break
-                    except json.JSONDecodeError:
-                        continue
                         
         except Exception as e:
             logger.error(f"Ollama streaming error: {e}")
             raise
     
+    async def aclose(self):
+        """Close pooled HTTP connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+    
     def get_available_models(self) -> List[str]:
         """Get available Ollama models."""
         return self.available_models
@@ -312,7 +368,10 @@ class LLMClient:
         primary_provider: str = "openai",
         openai_api_key: Optional[str] = None,
         ollama_url: Optional[str] = None,
-        fallback_provider: Optional[str] = None
+        fallback_provider: Optional[str] = None,
+        ollama_max_concurrent_requests: int = 4,
+        response_cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None
     ):
         """
         Initialize the LLM client.
@@ -322,9 +381,15 @@ class LLMClient:
             openai_api_key: OpenAI API key
             ollama_url: Ollama server URL
             fallback_provider: Fallback provider if primary fails
+            ollama_max_concurrent_requests: Maximum concurrent Ollama generations
+            response_cache: Cache for generated responses (disabled if None)
+            rate_limiter: Rate limiter for provider calls (defaults to the
+                process-wide limiter shared by all clients)
         """
         self.primary_provider = primary_provider
         self.fallback_provider = fallback_provider
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
         self.providers = {}
         
         # Initialize providers
@@ -332,11 +397,15 @@ class LLMClient:
             self.providers["openai"] = OpenAIProvider(openai_api_key)
         
         if ollama_url:
-            self.providers["ollama"] = OllamaProvider(ollama_url)
+            self.providers["ollama"] = OllamaProvider(
+                ollama_url, max_concurrent_requests=ollama_max_concurrent_requests
+            )
         else:
             # Try default Ollama URL
             try:
-                self.providers["ollama"] = OllamaProvider()
+                self.providers["ollama"] = OllamaProvider(
+                    max_concurrent_requests=ollama_max_concurrent_requests
+                )
             except Exception as e:
                 logger.warning(f"Failed to initialize Ollama: {e}")
         
@@ -360,7 +429,9 @@ class LLMClient:
         system_message: Optional[str] = None,
         functions: Optional[List[Dict]] = None,
         function_call: Optional[Union[str, Dict]] = None,
-        use_fallback: bool = True
+        use_fallback: bool = True,
+        use_cache: bool = True,
+        cache_ttl: Optional[float] = None
     ) -> LLMResponse:
         """
         Generate a response using the primary provider.
@@ -374,6 +445,10 @@ class LLMClient:
             functions: Available functions for function calling
             function_call: Function call specification
             use_fallback: Whether to use fallback provider on failure
+            use_cache: Whether to use the response cache; pass False for
+                calls that must produce a fresh sample
+            cache_ttl: Seconds to keep this response cached (overrides the
+                cache default)
             
         Returns:
             LLM response
@@ -390,23 +465,70 @@ class LLMClient:
         
         # Try primary provider
         try:
-            provider = self.providers[self.primary_provider]
-            return await provider.generate(request)
+            return await self._generate_with(self.primary_provider, request, use_cache, cache_ttl)
         except Exception as e:
             logger.error(f"Primary provider {self.primary_provider} failed: {e}")
             
             # Try fallback provider
             if use_fallback and self.fallback_provider and self.fallback_provider in self.providers:
                 try:
-                    provider = self.providers[self.fallback_provider]
                     logger.info(f"Using fallback provider: {self.fallback_provider}")
-                    return await provider.generate(request)
+                    return await self._generate_with(
+                        self.fallback_provider, request, use_cache, cache_ttl
+                    )
                 except Exception as fallback_error:
                     logger.error(f"Fallback provider {self.fallback_provider} also failed: {fallback_error}")
                     raise Exception(f"All providers failed. Primary: {e}, Fallback: {fallback_error}")
             else:
                 raise
     
+    async def _generate_with(
+        self,
+        provider_name: str,
+        request: LLMRequest,
+        use_cache: bool,
+        cache_ttl: Optional[float]
+    ) -> LLMResponse:
+        """Generate with one provider, serving and filling the response cache."""
+        cache_key = None
+        if self.response_cache is not None and use_cache:
+            cache_key = ResponseCache.make_key(
+                provider_name,
+                request.model,
+                request.system_message,
+                request.prompt,
+                request.temperature,
+                request.max_tokens,
+                request.functions,
+                request.function_call
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                response = LLMResponse(**cached)
+                response.metadata["cached"] = "true"
+                logger.debug(f"Response cache hit for {provider_name}")
+                return response
+        
+        provider = self.providers[provider_name]
+        estimated_tokens = self._estimate_tokens(request)
+        await self.rate_limiter.acquire(provider_name, estimated_tokens)
+        response = await provider.generate(request)
+        
+        actual_tokens = response.usage.get("total_tokens") if response.usage else None
+        if actual_tokens:
+            self.rate_limiter.record_usage(provider_name, estimated_tokens, actual_tokens)
+        
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response.dict(), cache_ttl)
+        
+        return response
+    
+    @staticmethod
+    def _estimate_tokens(request: LLMRequest) -> int:
+        """Estimate prompt plus completion tokens (1 token ≈ 4 characters)."""
+        prompt_chars = len(request.prompt) + len(request.system_message or "")
+        return prompt_chars // 4 + request.max_tokens
+    
     async def generate_stream(
         self,
         prompt: str,
@@ -443,6 +565,7 @@ class LLMClient:
         )
         
         provider = self.providers[self.primary_provider]
+        await self.rate_limiter.acquire(self.primary_provider, self._estimate_tokens(request))
         async for chunk in provider.generate_stream(request):
             yield chunk
     
@@ -457,6 +580,18 @@ class LLMClient:
                 models[name] = []
         return models
     
+    def get_rate_limit_stats(self) -> Dict[str, Dict]:
+        """Get per-provider queue depth and wait-time metrics."""
+        return self.rate_limiter.get_stats()
+    
+    async def aclose(self):
+        """Close network resources held by all providers."""
+        for name, provider in self.providers.items():
+            try:
+                await provider.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close provider {name}: {e}")
+    
     def switch_provider(self, provider_name: str):
         """Switch the primary provider."""
         if provider_name in self.providers:
@@ -15,18 +15,26 @@ Pattern: Vector store integration with metadata filtering
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import chromadb
+import numpy as np
 import openai
 import pydantic
 from sentence_transformers import SentenceTransformer
 
+from context_packer import ContextPacker
+from embedding_cache import EmbeddingCache
+from lexical_index import BM25Index, reciprocal_rank_fusion
+from provenance_log import ProvenanceLog, SQLiteProvenanceIndex
+from retrieval_cache import RetrievalCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -53,6 +61,13 @@ class RetrievalResult(pydantic.BaseModel):
     metadata: Dict[str, str] = {}
 
 
+class BatchRetrievalResult(pydantic.BaseModel):
+    """Model for multi-query retrieval results."""
+    queries: List[str]
+    results: List[List[RetrievalResult]]  # aligned with queries
+    merged: List[RetrievalResult] = []  # de-duplicated by chunk ID, best score first
+
+
 class MemoryManager:
     """
     Manages persistent memory using ChromaDB for vector storage and retrieval.
@@ -70,7 +85,22 @@ class MemoryManager:
         persist_directory: str = "./memory_db",
         embedding_model: str = "all-MiniLM-L6-v2",
         use_remote_embeddings: bool = False,
-        openai_api_key: Optional[str] = None
+        openai_api_key: Optional[str] = None,
+        embedding_batch_size: int = 64,
+        max_inflight_batches: int = 2,
+        enable_embedding_cache: bool = True,
+        embedding_cache_size: int = 10000,
+        embedding_cache_max_mb: int = 512,
+        enable_lexical_index: bool = True,
+        hybrid_candidate_multiplier: int = 4,
+        rrf_k: int = 60,
+        provenance_log_max_mb: int = 64,
+        provenance_log_backups: int = 5,
+        enable_provenance_index: bool = False,
+        context_token_counter: Optional[Callable[[str], int]] = None,
+        context_mmr_lambda: float = 0.7,
+        enable_query_cache: bool = True,
+        query_cache_size: int = 1024
     ):
         """
         Initialize the memory manager.
@@ -80,7 +110,30 @@ class MemoryManager:
             embedding_model: SentenceTransformers model name for local embeddings
             use_remote_embeddings: Whether to use OpenAI embeddings
             openai_api_key: OpenAI API key for remote embeddings
+            embedding_batch_size: Number of chunks encoded per embedding call
+            max_inflight_batches: Maximum embedded batches waiting to be written
+            enable_embedding_cache: Whether to cache embeddings under persist_directory
+            embedding_cache_size: Maximum number of embeddings cached in memory
+            embedding_cache_max_mb: Maximum size of the on-disk embedding cache in MB
+            enable_lexical_index: Whether to keep a BM25 index for hybrid retrieval
+            hybrid_candidate_multiplier: Candidates drawn from each retriever per result
+            rrf_k: Damping constant for reciprocal-rank fusion
+            provenance_log_max_mb: Size in MB at which provenance.log is rotated
+            provenance_log_backups: Number of compressed provenance logs to keep
+            enable_provenance_index: Whether to mirror provenance into a queryable SQLite index
+            context_token_counter: Token counter for context budgets (defaults to tiktoken
+                when installed, else an estimate)
+            context_mmr_lambda: Relevance/diversity trade-off when packing context
+            enable_query_cache: Whether to cache retrieval results until the collection changes
+            query_cache_size: Maximum number of cached retrieval results
         """
+        if embedding_batch_size < 1:
+            raise ValueError("embedding_batch_size must be at least 1")
+        if max_inflight_batches < 1:
+            raise ValueError("max_inflight_batches must be at least 1")
+        if hybrid_candidate_multiplier < 1:
+            raise ValueError("hybrid_candidate_multiplier must be at least 1")
+        
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         
@@ -100,9 +153,51 @@ class MemoryManager:
             self.embedding_model = None
         else:
             self.embedding_model = SentenceTransformer(embedding_model)
+        self.embedding_model_name = embedding_model
+        self.openai_embedding_model = "text-embedding-ada-002"
+        
+        # Content-addressed embedding cache
+        self.embedding_cache = None
+        if enable_embedding_cache:
+            self.embedding_cache = EmbeddingCache(
+                cache_directory=self.persist_directory / "embedding_cache",
+                max_memory_entries=embedding_cache_size,
+                max_disk_bytes=embedding_cache_max_mb * 1024 * 1024
+            )
+        
+        # Batched embedding settings
+        self.embedding_batch_size = embedding_batch_size
+        self.max_inflight_batches = max_inflight_batches
+        
+        # Retrieval results cached per collection version
+        self.query_cache = RetrievalCache(max_entries=query_cache_size) if enable_query_cache else None
+        
+        # Lexical index for hybrid dense + BM25 retrieval
+        self.hybrid_candidate_multiplier = hybrid_candidate_multiplier
+        self.rrf_k = rrf_k
+        self.lexical_index = None
+        if enable_lexical_index:
+            self.lexical_index = BM25Index(self.persist_directory / "lexical_index")
+            if len(self.lexical_index) == 0 and self.collection.count() > 0:
+                self.rebuild_lexical_index()
+        
+        # Context assembly for RAG prompts
+        self.context_packer = ContextPacker(
+            token_counter=context_token_counter,
+            mmr_lambda=context_mmr_lambda
+        )
         
-        # Provenance log file
+        # Provenance log, written in the background
         self.provenance_log_path = self.persist_directory / "provenance.log"
+        self.provenance_log = ProvenanceLog(
+            self.provenance_log_path,
+            max_bytes=provenance_log_max_mb * 1024 * 1024,
+            backup_count=provenance_log_backups,
+            index=(
+                SQLiteProvenanceIndex(self.persist_directory / "provenance.sqlite")
+                if enable_provenance_index else None
+            )
+        )
         
         logger.info(f"Memory manager initialized with persist directory: {self.persist_directory}")
     
@@ -127,20 +222,12 @@ class MemoryManager:
             return []
         
         # Prepare data for ChromaDB
-        chunk_ids = []
-        documents = []
-        metadatas = []
-        embeddings = []
-        
-        for chunk in chunks:
-            chunk_id = chunk.chunk_id
-            chunk_ids.append(chunk_id)
-            documents.append(chunk.content)
-            
-            # Create metadata for ChromaDB
-            chunk_metadata = {
+        chunk_ids = [chunk.chunk_id for chunk in chunks]
+        documents = [chunk.content for chunk in chunks]
+        metadatas = [
+            {
                 "source_id": chunk.source_id,
-                "chunk_id": chunk_id,
+                "chunk_id": chunk.chunk_id,
                 "original_filename": metadata.original_filename,
                 "ingestion_timestamp": metadata.ingestion_timestamp.isoformat(),
                 "agent_id": agent_id or "",
@@ -149,20 +236,12 @@ class MemoryManager:
                 "char_count": str(chunk.char_count),
                 **chunk.metadata
             }
-            metadatas.append(chunk_metadata)
-            
-            # Generate embedding
-            embedding = await self._generate_embedding(chunk.content)
-            embeddings.append(embedding)
+            for chunk in chunks
+        ]
         
-        # Store in ChromaDB
+        # Embed in batches and write each batch as soon as it is ready
         try:
-            self.collection.add(
-                ids=chunk_ids,
-                documents=documents,
-                metadatas=metadatas,
-                embeddings=embeddings
-            )
+            await self._embed_and_store_batches(chunk_ids, documents, metadatas)
             
             # Log provenance
             await self._log_provenance(metadata, chunks, agent_id, "store")
@@ -174,124 +253,486 @@ class MemoryManager:
             logger.error(f"Failed to store chunks: {e}")
             raise
     
+    async def _embed_and_store_batches(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, str]]
+    ):
+        """
+        Embed documents in batches and add them to the collection.
+        
+        Embedding and writing run as a producer/consumer pair connected by a
+        bounded queue, so the next batch is encoded while the previous one is
+        written and at most ``max_inflight_batches`` embedded batches are held
+        in memory at once.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_inflight_batches)
+        loop = asyncio.get_event_loop()
+        
+        async def produce():
+            try:
+                for start in range(0, len(documents), self.embedding_batch_size):
+                    end = start + self.embedding_batch_size
+                    embeddings = await self._generate_embeddings(documents[start:end])
+                    await queue.put((start, end, embeddings))
+            except Exception as e:
+                # Hand the failure to the consumer so it stops waiting
+                await queue.put(e)
+                return
+            await queue.put(None)
+        
+        async def consume():
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                start, end, embeddings = batch
+                await loop.run_in_executor(
+                    None,
+                    functools.partial(
+                        self._add_to_collection,
+                        ids=ids[start:end],
+                        documents=documents[start:end],
+                        metadatas=metadatas[start:end],
+                        embeddings=embeddings
+                    )
+                )
+        
+        producer = asyncio.ensure_future(produce())
+        try:
+            await consume()
+        finally:
+            if not producer.done():
+                producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+    
+    def _add_to_collection(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, str]],
+        embeddings: List[List[float]]
+    ):
+        """Add a batch to the collection and index it lexically."""
+        self.collection.add(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings
+        )
+        if self.lexical_index is not None:
+            self.lexical_index.add_documents(ids, documents)
+        self._collection_changed()
+    
+    def _collection_changed(self):
+        """Invalidate cached retrievals; called after every write so no stale result outlives it."""
+        if self.query_cache is not None:
+            self.query_cache.bump_version()
+    
+    def rebuild_lexical_index(self, page_size: int = 1000) -> int:
+        """
+        Rebuild the lexical index from the documents in the collection.
+        
+        Args:
+            page_size: Number of documents read from the collection at a time
+            
+        Returns:
+            Number of documents indexed
+        """
+        if self.lexical_index is None:
+            return 0
+        
+        self.lexical_index.clear()
+        indexed = 0
+        offset = 0
+        while True:
+            page = self.collection.get(include=["documents"], limit=page_size, offset=offset)
+            if not page["ids"]:
+                break
+            self.lexical_index.add_documents(page["ids"], page["documents"])
+            indexed += len(page["ids"])
+            offset += len(page["ids"])
+        
+        self._collection_changed()
+        logger.info(f"Rebuilt lexical index with {indexed} documents")
+        return indexed
+    
+    async def delete_chunks(
+        self,
+        chunk_ids: List[str],
+        source_id: str = "",
+        agent_id: Optional[str] = None
+    ) -> int:
+        """
+        Delete chunks from the vector database.
+        
+        Args:
+            chunk_ids: IDs of the chunks to delete
+            source_id: Source the chunks belong to (for provenance)
+            agent_id: ID of the agent deleting the chunks
+            
+        Returns:
+            Number of chunk IDs submitted for deletion
+        """
+        if not chunk_ids:
+            return 0
+        
+        try:
+            self.collection.delete(ids=chunk_ids)
+            if self.lexical_index is not None:
+                self.lexical_index.remove_documents(chunk_ids)
+            self._collection_changed()
+            
+            log_entry = {
+                "timestamp": datetime.now().isoformat(),
+                "action": "delete",
+                "agent_id": agent_id,
+                "source_id": source_id,
+                "chunk_count": len(chunk_ids),
+                "chunk_ids": chunk_ids
+            }
+            self.provenance_log.append(log_entry)
+            
+            logger.info(f"Deleted {len(chunk_ids)} chunks from source {source_id or 'unknown'}")
+            return len(chunk_ids)
+            
+        except Exception as e:
+            logger.error(f"Failed to delete chunks: {e}")
+            raise
+    
     async def retrieve_relevant_chunks(
         self,
         query: str,
         top_k: int = 5,
         filter_metadata: Optional[Dict[str, str]] = None,
-        min_score: float = 0.0
+        min_score: float = 0.0,
+        context_id: Optional[str] = None
     ) -> List[RetrievalResult]:
         """
         Retrieve relevant chunks based on query similarity.
         
+        With the lexical index enabled, the dense and BM25 retrievers each
+        supply ``top_k * hybrid_candidate_multiplier`` candidates and the two
+        rankings are merged with reciprocal-rank fusion. Results are ordered
+        by fused rank; ``score`` remains the cosine similarity to the query.
+        
         Args:
             query: Search query
             top_k: Number of top results to return
             filter_metadata: Metadata filters to apply
             min_score: Minimum similarity score threshold
+            context_id: What the retrieval is for (e.g. a chapter ID), recorded in provenance
             
         Returns:
             List of retrieval results
         """
+        batch = await self.retrieve_many(
+            [query],
+            top_k=top_k,
+            filter_metadata=filter_metadata,
+            min_score=min_score,
+            context_id=context_id
+        )
+        return batch.results[0]
+    
+    async def retrieve_many(
+        self,
+        queries: List[str],
+        top_k: int = 5,
+        filter_metadata: Optional[Dict[str, Any]] = None,
+        min_score: float = 0.0,
+        query_filters: Optional[List[Optional[Dict[str, Any]]]] = None,
+        context_id: Optional[str] = None
+    ) -> BatchRetrievalResult:
+        """
+        Retrieve relevant chunks for several queries in one round-trip.
+        
+        All queries are embedded in a single batch and sent to ChromaDB as
+        one multi-query request. Queries with different metadata filters are
+        grouped, so each distinct filter costs one request. Ranking and
+        scoring match ``retrieve_relevant_chunks``.
+        
+        Args:
+            queries: Search queries
+            top_k: Number of top results to return per query
+            filter_metadata: Metadata filters applied to every query
+            min_score: Minimum similarity score threshold
+            query_filters: Per-query metadata filters aligned with ``queries``
+                (overrides ``filter_metadata``)
+            context_id: What the retrieval is for (e.g. a chapter ID), recorded in provenance
+            
+        Returns:
+            Per-query results plus a merged view de-duplicated by chunk ID
+        """
+        queries = list(queries)
+        if query_filters is not None and len(query_filters) != len(queries):
+            raise ValueError("query_filters must have one entry per query")
+        if not queries:
+            return BatchRetrievalResult(queries=[], results=[])
+        
         try:
-            # Generate query embedding
-            query_embedding = await self._generate_embedding(query)
+            filters = query_filters if query_filters is not None else [filter_metadata] * len(queries)
+            per_query: List[Optional[List[RetrievalResult]]] = [None] * len(queries)
             
-            # Query ChromaDB
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k,
-                where=filter_metadata,
-                include=["documents", "metadatas", "distances"]
-            )
+            # Serve repeated queries from the cache; keys carry the collection
+            # version, so results computed before a write are never reused
+            cache_keys: List[Optional[str]] = [None] * len(queries)
+            if self.query_cache is not None:
+                version = self.query_cache.version
+                model = self.openai_embedding_model if self.use_remote_embeddings else self.embedding_model_name
+                for index, (query, where) in enumerate(zip(queries, filters)):
+                    cache_keys[index] = self.query_cache.make_key(model, query, where, top_k, min_score, version)
+                    cached = self.query_cache.get(cache_keys[index])
+                    if cached is not None:
+                        per_query[index] = [RetrievalResult(**result) for result in cached]
+            uncached = [index for index, results in enumerate(per_query) if results is None]
             
-            # Process results
-            retrieval_results = []
-            if results["documents"] and results["documents"][0]:
-                for i, (doc, metadata, distance) in enumerate(zip(
-                    results["documents"][0],
-                    results["metadatas"][0],
-                    results["distances"][0]
-                )):
-                    # Convert distance to similarity score (1 - distance for cosine similarity)
-                    score = 1 - distance
-                    
-                    if score >= min_score:
-                        # Ensure all metadata values are strings for Pydantic validation
-                        string_metadata = {k: str(v) for k, v in metadata.items()}
-                        result = RetrievalResult(
-                            content=doc,
-                            chunk_id=metadata.get("chunk_id", ""),
-                            source_id=metadata.get("source_id", ""),
-                            score=score,
-                            metadata=string_metadata
-                        )
-                        retrieval_results.append(result)
+            if uncached:
+                # Generate embeddings for the remaining queries in one batch
+                query_embeddings = dict(zip(
+                    uncached,
+                    await self._generate_embeddings([queries[index] for index in uncached])
+                ))
+                
+                # Group queries sharing a filter into one ChromaDB request
+                groups: Dict[str, List[int]] = {}
+                for index in uncached:
+                    groups.setdefault(json.dumps(filters[index], sort_keys=True), []).append(index)
+                
+                for indices in groups.values():
+                    group_results = self._search_group(
+                        [queries[index] for index in indices],
+                        [query_embeddings[index] for index in indices],
+                        filters[indices[0]],
+                        top_k,
+                        min_score
+                    )
+                    for index, results in zip(indices, group_results):
+                        per_query[index] = results
+                        if cache_keys[index] is not None:
+                            self.query_cache.set(cache_keys[index], [result.dict() for result in results])
             
-            # Log retrieval
-            await self._log_retrieval(query, retrieval_results)
+            # Log retrievals
+            for query, results in zip(queries, per_query):
+                await self._log_retrieval(query, results, context_id)
             
-            return retrieval_results
+            return BatchRetrievalResult(
+                queries=queries,
+                results=per_query,
+                merged=self._merge_results(per_query)
+            )
             
         except Exception as e:
             logger.error(f"Failed to retrieve chunks: {e}")
             raise
     
+    def _search_group(
+        self,
+        queries: List[str],
+        query_embeddings: List[List[float]],
+        filter_metadata: Optional[Dict[str, Any]],
+        top_k: int,
+        min_score: float
+    ) -> List[List[RetrievalResult]]:
+        """Rank chunks for queries sharing one metadata filter."""
+        candidate_count = top_k
+        if self.lexical_index is not None:
+            candidate_count = top_k * self.hybrid_candidate_multiplier
+        
+        # Query ChromaDB
+        results = self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=candidate_count,
+            where=filter_metadata,
+            include=["documents", "metadatas", "distances"]
+        )
+        
+        # Per query, candidates keyed by ID: (document, metadata, similarity score)
+        candidates: List[Dict[str, Tuple[str, Dict[str, Any], float]]] = []
+        rankings: List[List[str]] = []
+        for i in range(len(queries)):
+            query_candidates = {}
+            dense_ranking = []
+            if results["documents"] and results["documents"][i]:
+                for chunk_id, doc, metadata, distance in zip(
+                    results["ids"][i],
+                    results["documents"][i],
+                    results["metadatas"][i],
+                    results["distances"][i]
+                ):
+                    # Convert distance to similarity score (1 - distance for cosine similarity)
+                    query_candidates[chunk_id] = (doc, metadata, 1 - distance)
+                    dense_ranking.append(chunk_id)
+            candidates.append(query_candidates)
+            rankings.append(dense_ranking)
+        
+        if self.lexical_index is not None:
+            lexical_rankings = [
+                [chunk_id for chunk_id, _ in self.lexical_index.search(query, candidate_count)]
+                for query in queries
+            ]
+            fetched = self._fetch_lexical_candidates(
+                sorted({
+                    chunk_id
+                    for lexical_ranking, query_candidates in zip(lexical_rankings, candidates)
+                    for chunk_id in lexical_ranking
+                    if chunk_id not in query_candidates
+                }),
+                filter_metadata
+            )
+            
+            for i, (query_embedding, lexical_ranking) in enumerate(zip(query_embeddings, lexical_rankings)):
+                query_vector = np.asarray(query_embedding, dtype=np.float32)
+                query_vector = query_vector / (np.linalg.norm(query_vector) or 1.0)
+                for chunk_id in lexical_ranking:
+                    if chunk_id not in candidates[i] and chunk_id in fetched:
+                        doc, metadata, unit_vector = fetched[chunk_id]
+                        candidates[i][chunk_id] = (doc, metadata, float(unit_vector @ query_vector))
+                
+                # Lexical hits excluded by the metadata filter were not fetched
+                lexical_ranking = [chunk_id for chunk_id in lexical_ranking if chunk_id in candidates[i]]
+                rankings[i] = [
+                    chunk_id for chunk_id, _ in
+                    reciprocal_rank_fusion([rankings[i], lexical_ranking], k=self.rrf_k)
+                ]
+        
+        # Process results
+        group_results = []
+        for ranked_ids, query_candidates in zip(rankings, candidates):
+            retrieval_results = []
+            for chunk_id in ranked_ids:
+                doc, metadata, score = query_candidates[chunk_id]
+                if score >= min_score:
+                    # Ensure all metadata values are strings for Pydantic validation
+                    string_metadata = {k: str(v) for k, v in metadata.items()}
+                    result = RetrievalResult(
+                        content=doc,
+                        chunk_id=metadata.get("chunk_id", chunk_id),
+                        source_id=metadata.get("source_id", ""),
+                        score=score,
+                        metadata=string_metadata
+                    )
+                    retrieval_results.append(result)
+                    if len(retrieval_results) >= top_k:
+                        break
+            group_results.append(retrieval_results)
+        
+        return group_results
+    
+    def _fetch_lexical_candidates(
+        self,
+        chunk_ids: List[str],
+        filter_metadata: Optional[Dict[str, Any]]
+    ) -> Dict[str, Tuple[str, Dict[str, Any], np.ndarray]]:
+        """Load lexical-only candidates from the collection with unit-normalised embeddings."""
+        if not chunk_ids:
+            return {}
+        
+        fetched = self.collection.get(
+            ids=chunk_ids,
+            where=filter_metadata,
+            include=["documents", "metadatas", "embeddings"]
+        )
+        if not fetched["ids"]:
+            return {}
+        
+        vectors = np.asarray(fetched["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms[:, None]
+        
+        return {
+            chunk_id: (doc, metadata, vector)
+            for chunk_id, doc, metadata, vector in zip(
+                fetched["ids"], fetched["documents"], fetched["metadatas"], vectors
+            )
+        }
+    
+    @staticmethod
+    def _merge_results(per_query: List[List[RetrievalResult]]) -> List[RetrievalResult]:
+        """Merge per-query results, keeping each chunk's best score, best first."""
+        best: Dict[str, RetrievalResult] = {}
+        for results in per_query:
+            for result in results:
+                current = best.get(result.chunk_id)
+                if current is None or result.score > current.score:
+                    best[result.chunk_id] = result
+        return sorted(best.values(), key=lambda result: result.score, reverse=True)
+    
     async def get_context_for_generation(
         self,
-        query: str,
+        query: Union[str, List[str]],
         max_tokens: int = 4000,
         top_k: int = 10,
-        filter_metadata: Optional[Dict[str, str]] = None
+        filter_metadata: Optional[Dict[str, str]] = None,
+        context_id: Optional[str] = None
     ) -> Tuple[str, List[RetrievalResult]]:
         """
         Get context for RAG generation with token budget management.
         
+        Retrieved chunks are ordered by maximal marginal relevance, neighbouring
+        chunks of a source are merged, and passages are packed against exact
+        token counts from ``context_token_counter``.
+        
         Args:
-            query: Search query
+            query: Search query, or several queries retrieved in one batch
+                and merged
             max_tokens: Maximum number of tokens for context
             top_k: Maximum number of chunks to retrieve
             filter_metadata: Metadata filters to apply
+            context_id: What the context is for (e.g. a chapter ID), recorded in provenance
             
         Returns:
             Tuple of (context_string, retrieval_results)
         """
         # Retrieve relevant chunks
-        results = await self.retrieve_relevant_chunks(
-            query=query,
-            top_k=top_k,
-            filter_metadata=filter_metadata
-        )
+        if isinstance(query, str):
+            results = await self.retrieve_relevant_chunks(
+                query=query,
+                top_k=top_k,
+                filter_metadata=filter_metadata,
+                context_id=context_id
+            )
+        else:
+            batch = await self.retrieve_many(
+                query,
+                top_k=top_k,
+                filter_metadata=filter_metadata,
+                context_id=context_id
+            )
+            results = batch.merged[:top_k]
         
         if not results:
             return "", []
         
-        # Assemble context within token budget
-        context_parts = []
-        used_tokens = 0
-        selected_results = []
-        
-        for result in results:
-            # Estimate tokens (rough approximation: 1 token ≈ 4 characters)
-            chunk_tokens = len(result.content) // 4
-            
-            if used_tokens + chunk_tokens <= max_tokens:
-                context_parts.append(f"[Source: {result.metadata.get('original_filename', 'Unknown')}]\n{result.content}")
-                used_tokens += chunk_tokens
-                selected_results.append(result)
-            else:
-                # Try to fit partial content
-                remaining_tokens = max_tokens - used_tokens
-                if remaining_tokens > 100:  # Only if we have meaningful space left
-                    partial_content = result.content[:remaining_tokens * 4]
-                    context_parts.append(f"[Source: {result.metadata.get('original_filename', 'Unknown')}]\n{partial_content}...")
-                    selected_results.append(result)
-                break
+        # Pack diverse, merged passages into the exact token budget
+        packed = self.context_packer.pack(
+            results,
+            max_tokens,
+            embeddings=self._fetch_embeddings([result.chunk_id for result in results])
+        )
         
-        context = "\n\n".join(context_parts)
+        logger.info(f"Assembled context with {packed.token_count} tokens from {len(packed.results)} chunks")
+        return packed.text, packed.results
+    
+    def _fetch_embeddings(self, chunk_ids: List[str]) -> Optional[np.ndarray]:
+        """Load stored embeddings aligned with ``chunk_ids`` (None if any are missing)."""
+        try:
+            fetched = self.collection.get(ids=chunk_ids, include=["embeddings"])
+        except Exception as e:
+            logger.warning(f"Failed to load chunk embeddings for context packing: {e}")
+            return None
         
-        logger.info(f"Assembled context with {used_tokens} tokens from {len(selected_results)} chunks")
-        return context, selected_results
+        by_id = dict(zip(fetched["ids"], fetched["embeddings"]))
+        if any(chunk_id not in by_id for chunk_id in chunk_ids):
+            return None
+        return np.asarray([by_id[chunk_id] for chunk_id in chunk_ids], dtype=np.float32)
     
     async def add_agent_notes(
         self,
@@ -347,7 +788,7 @@ class MemoryManager:
                 else:
                     flattened_metadata[key] = str(value) if not isinstance(value, (str, int, float, bool)) else value
             
-            self.collection.add(
+            self._add_to_collection(
                 ids=[note_id],
                 documents=[content],
                 metadatas=[flattened_metadata],
@@ -378,55 +819,123 @@ class MemoryManager:
         # ChromaDB doesn't support direct tag search, so we'll use metadata filtering
         # This is a simplified implementation - in practice, you might want to use
         # a more sophisticated tagging system
-        results = []
+        batch = await self.retrieve_many(
+            tags,
+            top_k=top_k,
+            query_filters=[{"tags": {"$contains": tag}} for tag in tags]
+        )
         
-        for tag in tags:
-            filter_metadata = {"tags": {"$contains": tag}}
-            tag_results = await self.retrieve_relevant_chunks(
-                query=tag,
-                top_k=top_k,
-                filter_metadata=filter_metadata
-            )
-            results.extend(tag_results)
+        # Merged results are already de-duplicated and sorted by score
+        return batch.merged[:top_k]
+    
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with the configured model, going through the embedding cache.
         
-        # Remove duplicates and sort by score
-        seen_chunks = set()
-        unique_results = []
-        for result in results:
-            if result.chunk_id not in seen_chunks:
-                unique_results.append(result)
-                seen_chunks.add(result.chunk_id)
+        Args:
+            texts: Texts to embed
         
-        return sorted(unique_results, key=lambda x: x.score, reverse=True)[:top_k]
+        Returns:
+            Embeddings aligned with ``texts``
+        """
+        return await self._generate_embeddings(texts)
     
     async def _generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text."""
+        embeddings = await self._generate_embeddings([text])
+        return embeddings[0]
+    
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a batch of texts in a single model call."""
         if self.use_remote_embeddings:
-            return await self._generate_openai_embedding(text)
+            return await self._cached_embeddings(
+                texts, self.openai_embedding_model, self._generate_openai_embeddings
+            )
         else:
-            return await self._generate_local_embedding(text)
+            return await self._cached_embeddings(
+                texts, self.embedding_model_name, self._generate_local_embeddings
+            )
+    
+    async def _cached_embeddings(
+        self,
+        texts: List[str],
+        model_name: str,
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """
+        Serve embeddings from the cache, embedding only the missing texts.
+        
+        Args:
+            texts: Texts to embed
+            model_name: Model name used as part of the cache key
+            embed: Backend coroutine that embeds a batch of texts
+            
+        Returns:
+            Embeddings aligned with ``texts``
+        """
+        if not texts:
+            return []
+        
+        if self.embedding_cache is None:
+            return await embed(texts)
+        
+        embeddings = self.embedding_cache.get_many(model_name, texts)
+        missing = list(dict.fromkeys(
+            text for text, embedding in zip(texts, embeddings) if embedding is None
+        ))
+        
+        if missing:
+            fresh = await embed(missing)
+            self.embedding_cache.put_many(model_name, missing, fresh)
+            fresh_by_text = dict(zip(missing, fresh))
+            embeddings = [
+                embedding if embedding is not None else fresh_by_text[text]
+                for text, embedding in zip(texts, embeddings)
+            ]
+        
+        return embeddings
     
     async def _generate_local_embedding(self, text: str) -> List[float]:
         """Generate embedding using SentenceTransformers."""
+        embeddings = await self._cached_embeddings(
+            [text], self.embedding_model_name, self._generate_local_embeddings
+        )
+        return embeddings[0]
+    
+    async def _generate_local_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate a batch of embeddings using SentenceTransformers."""
         try:
             # Run in thread pool to avoid blocking
             loop = asyncio.get_event_loop()
-            embedding = await loop.run_in_executor(
-                None, self.embedding_model.encode, text
+            embeddings = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self.embedding_model.encode,
+                    texts,
+                    batch_size=self.embedding_batch_size
+                )
             )
-            return embedding.tolist()
+            return embeddings.tolist()
         except Exception as e:
             logger.error(f"Failed to generate local embedding: {e}")
             raise
     
     async def _generate_openai_embedding(self, text: str) -> List[float]:
         """Generate embedding using OpenAI API."""
+        embeddings = await self._cached_embeddings(
+            [text], self.openai_embedding_model, self._generate_openai_embeddings
+        )
+        return embeddings[0]
+    
+    async def _generate_openai_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate a batch of embeddings using OpenAI API."""
         try:
             response = await openai.Embedding.acreate(
-                model="text-embedding-ada-002",
-                input=text
+                model=self.openai_embedding_model,
+                input=texts
             )
-            return response["data"][0]["embedding"]
+            data = sorted(response["data"], key=lambda item: item["index"])
+            return [item["embedding"] for item in data]
         except Exception as e:
             logger.error(f"Failed to generate OpenAI embedding: {e}")
             raise
@@ -448,34 +957,95 @@ class MemoryManager:
             "chunk_ids": [chunk.chunk_id for chunk in chunks]
         }
         
-        with open(self.provenance_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        self.provenance_log.append(log_entry)
     
-    async def _log_retrieval(self, query: str, results: List[RetrievalResult]):
+    async def _log_retrieval(
+        self,
+        query: str,
+        results: List[RetrievalResult],
+        context_id: Optional[str] = None
+    ):
         """Log retrieval operations."""
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "action": "retrieval",
             "query": query,
+            "context_id": context_id,
             "result_count": len(results),
             "chunk_ids": [result.chunk_id for result in results],
             "scores": [result.score for result in results]
         }
         
-        with open(self.provenance_log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        self.provenance_log.append(log_entry)
     
-    def get_stats(self) -> Dict[str, int]:
+    def query_provenance(
+        self,
+        action: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        source_id: Optional[str] = None,
+        context_id: Optional[str] = None,
+        chunk_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find recent provenance events in the SQLite index.
+        
+        Args:
+            action: Event action ("store", "delete", "agent_note", "retrieval")
+            agent_id: Agent that caused the event
+            source_id: Source document of the event
+            context_id: Context the retrieval was made for (e.g. a chapter ID)
+            chunk_id: Only events involving this chunk
+            limit: Maximum number of events
+            
+        Returns:
+            Matching events with their chunk IDs, oldest first
+        """
+        index = self._require_provenance_index()
+        self.provenance_log.flush()
+        return index.query(action, agent_id, source_id, context_id, chunk_id, limit)
+    
+    def chunks_for_context(self, context_id: str) -> List[Dict[str, Any]]:
+        """
+        List the chunks retrieved for a context, such as a chapter.
+        
+        Args:
+            context_id: Context passed to the retrieval calls
+            
+        Returns:
+            One entry per chunk with its retrieval count and best score
+        """
+        index = self._require_provenance_index()
+        self.provenance_log.flush()
+        return index.chunks_for_context(context_id)
+    
+    def _require_provenance_index(self) -> SQLiteProvenanceIndex:
+        if self.provenance_log.index is None:
+            raise RuntimeError("Provenance index is disabled; enable it with enable_provenance_index=True")
+        return self.provenance_log.index
+    
+    def get_stats(self) -> Dict[str, Any]:
         """Get statistics about stored content."""
         try:
             count = self.collection.count()
-            return {
+            stats = {
                 "total_chunks": count,
                 "collection_name": self.collection.name
             }
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
-            return {"total_chunks": 0, "collection_name": "unknown"}
+            stats = {"total_chunks": 0, "collection_name": "unknown"}
+        
+        if self.embedding_cache is not None:
+            stats["embedding_cache"] = self.embedding_cache.get_stats()
+        if self.lexical_index is not None:
+            stats["lexical_index"] = self.lexical_index.get_stats()
+        stats["provenance_log"] = self.provenance_log.get_stats()
+        stats["context_token_cache"] = self.context_packer.get_stats()
+        if self.query_cache is not None:
+            stats["query_cache"] = self.query_cache.get_stats()
+        
+        return stats
     
     async def clear_memory(self):
         """Clear all stored memory (use with caution)."""
@@ -485,7 +1055,18 @@ class MemoryManager:
                 name="documents",
                 metadata={"hnsw:space": "cosine"}
             )
+            if self.lexical_index is not None:
+                self.lexical_index.clear()
+            self._collection_changed()
             logger.info("Memory cleared")
         except Exception as e:
             logger.error(f"Failed to clear memory: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def close(self):
+        """Flush pending provenance events and close on-disk stores."""
+        self.provenance_log.close()
+        if self.lexical_index is not None:
+            self.lexical_index.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
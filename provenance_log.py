@@ -0,0 +1,365 @@
+"""
+Provenance Log Module
+
+Write-behind provenance log for the memory manager. Store, delete, agent
+note and retrieval events are handed to a bounded queue and appended to a
+JSON-lines file by a background thread in batches, so the request path never
+touches the disk. The text log rotates by size into gzip-compressed backups.
+An optional SQLite index records the same events with one row per chunk, so
+questions like "which chunks fed this chapter" are answered by an indexed
+lookup instead of a scan of the text log.
+
+Chosen libraries:
+- threading/queue: Background batch writer behind a bounded queue
+- gzip: Compression of rotated log files
+- sqlite3: Indexed event and chunk lookups
+
+Pattern: Write-behind log with size-based rotation and an optional index sink
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import queue
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class SQLiteProvenanceIndex:
+    """
+    Queryable SQLite copy of provenance events.
+
+    Each event is one row in ``events``; every chunk it mentions is a row in
+    ``event_chunks`` with its rank and score, indexed by chunk ID. Events
+    carrying a ``context_id`` (e.g. a chapter ID) can be traced back to the
+    chunks that were retrieved for them.
+    """
+
+    def __init__(self, db_path: Union[str, Path]):
+        """
+        Initialize the index.
+
+        Args:
+            db_path: Path of the SQLite database
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                action TEXT NOT NULL,
+                agent_id TEXT,
+                source_id TEXT,
+                context_id TEXT,
+                query TEXT,
+                chunk_count INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS event_chunks (
+                event_id INTEGER NOT NULL,
+                chunk_id TEXT NOT NULL,
+                rank INTEGER NOT NULL,
+                score REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_action ON events (action);
+            CREATE INDEX IF NOT EXISTS idx_events_context_id ON events (context_id);
+            CREATE INDEX IF NOT EXISTS idx_events_source_id ON events (source_id);
+            CREATE INDEX IF NOT EXISTS idx_event_chunks_chunk_id ON event_chunks (chunk_id);
+            CREATE INDEX IF NOT EXISTS idx_event_chunks_event_id ON event_chunks (event_id);
+            """
+        )
+        self._conn.commit()
+
+    def write(self, entries: List[Dict[str, Any]]):
+        """Record a batch of events in one transaction."""
+        with self._lock:
+            for entry in entries:
+                chunk_ids = entry.get("chunk_ids") or []
+                cursor = self._conn.execute(
+                    "INSERT INTO events (timestamp, action, agent_id, source_id, context_id, query, chunk_count) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry.get("timestamp", ""),
+                        entry.get("action", ""),
+                        entry.get("agent_id"),
+                        entry.get("source_id"),
+                        entry.get("context_id"),
+                        entry.get("query"),
+                        entry.get("chunk_count", entry.get("result_count", len(chunk_ids)))
+                    )
+                )
+                scores = entry.get("scores") or [None] * len(chunk_ids)
+                self._conn.executemany(
+                    "INSERT INTO event_chunks (event_id, chunk_id, rank, score) VALUES (?, ?, ?, ?)",
+                    [
+                        (cursor.lastrowid, chunk_id, rank, score)
+                        for rank, (chunk_id, score) in enumerate(zip(chunk_ids, scores))
+                    ]
+                )
+            self._conn.commit()
+
+    def query(
+        self,
+        action: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        source_id: Optional[str] = None,
+        context_id: Optional[str] = None,
+        chunk_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the most recent events matching every given filter.
+
+        Returns:
+            Up to ``limit`` events with their chunk IDs, oldest first
+        """
+        clauses, params = [], []
+        for column, value in (
+            ("action", action), ("agent_id", agent_id),
+            ("source_id", source_id), ("context_id", context_id)
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if chunk_id is not None:
+            clauses.append("id IN (SELECT event_id FROM event_chunks WHERE chunk_id = ?)")
+            params.append(chunk_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, timestamp, action, agent_id, source_id, context_id, query, chunk_count "
+                f"FROM events {where} ORDER BY id DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+            chunks: Dict[int, List[str]] = {row[0]: [] for row in rows}
+            if chunks:
+                placeholders = ",".join("?" * len(chunks))
+                for event_id, chunk in self._conn.execute(
+                    f"SELECT event_id, chunk_id FROM event_chunks "
+                    f"WHERE event_id IN ({placeholders}) ORDER BY event_id, rank",
+                    list(chunks)
+                ):
+                    chunks[event_id].append(chunk)
+
+        return [
+            {
+                "timestamp": row[1],
+                "action": row[2],
+                "agent_id": row[3],
+                "source_id": row[4],
+                "context_id": row[5],
+                "query": row[6],
+                "chunk_count": row[7],
+                "chunk_ids": chunks[row[0]]
+            }
+            for row in reversed(rows)
+        ]
+
+    def chunks_for_context(self, context_id: str) -> List[Dict[str, Any]]:
+        """
+        Summarise the chunks retrieved for a context.
+
+        Returns:
+            One entry per chunk with how often it was retrieved and its best
+            score, most retrieved first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT c.chunk_id, COUNT(*), MAX(c.score)
+                FROM event_chunks c JOIN events e ON e.id = c.event_id
+                WHERE e.context_id = ? AND e.action = 'retrieval'
+                GROUP BY c.chunk_id
+                ORDER BY COUNT(*) DESC, MAX(c.score) DESC
+                """,
+                (context_id,)
+            ).fetchall()
+        return [
+            {"chunk_id": chunk_id, "retrievals": count, "best_score": best_score}
+            for chunk_id, count, best_score in rows
+        ]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ProvenanceLog:
+    """
+    Write-behind JSON-lines provenance log.
+
+    Responsibilities:
+    - Accept events without blocking, dropping (and counting) them if the
+      bounded queue is full
+    - Append queued events to the log file in batches on a background thread
+    - Rotate the log by size into compressed backups
+    - Mirror events into an optional SQLite index
+    """
+
+    def __init__(
+        self,
+        log_path: Union[str, Path],
+        max_bytes: int = 64 * 1024 * 1024,
+        backup_count: int = 5,
+        compress: bool = True,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        index: Optional[SQLiteProvenanceIndex] = None
+    ):
+        """
+        Initialize the provenance log.
+
+        Args:
+            log_path: Path of the active JSON-lines log
+            max_bytes: Size at which the active log is rotated
+            backup_count: Number of rotated logs to keep
+            compress: Whether rotated logs are gzip-compressed
+            max_queue_size: Events that may wait for the writer before new ones are dropped
+            batch_size: Maximum events written per batch
+            index: Optional SQLite index receiving the same events
+        """
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.batch_size = batch_size
+        self.index = index
+        self.dropped_entries = 0
+        self.failed_writes = 0
+        self.written_entries = 0
+        self.rotations = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._writer: Optional[threading.Thread] = threading.Thread(
+            target=self._write_loop, name="provenance-log-writer", daemon=True
+        )
+        self._writer.start()
+        # Daemon threads are killed at exit; drain the queue first
+        atexit.register(self.close)
+
+    def append(self, entry: Dict[str, Any]) -> bool:
+        """
+        Queue an event for writing without blocking on I/O.
+
+        Args:
+            entry: JSON-serialisable event
+
+        Returns:
+            False if the queue was full and the event was dropped
+        """
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.dropped_entries += 1
+            if self.dropped_entries == 1:
+                logger.warning("Provenance log queue is full; dropping events")
+            return False
+
+    def _write_loop(self):
+        """Drain the queue into the log file in batches."""
+        while True:
+            entry = self._queue.get()
+            if entry is _STOP:
+                self._queue.task_done()
+                return
+
+            batch = [entry]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stop = True
+                    break
+                batch.append(entry)
+
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                self.failed_writes += len(batch)
+                logger.error(f"Failed to persist {len(batch)} provenance events: {e}")
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        """Append a batch to the log and index, rotating afterwards if the log is too large."""
+        lines = "".join(json.dumps(entry, default=str) + "\n" for entry in batch)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        self.written_entries += len(batch)
+
+        if self.index is not None:
+            self.index.write(batch)
+
+        if self.log_path.stat().st_size >= self.max_bytes:
+            self._rotate()
+
+    def _rotated_path(self, index: int) -> Path:
+        suffix = self.log_path.suffix + (".gz" if self.compress else "")
+        return self.log_path.with_name(f"{self.log_path.stem}.{index}{suffix}")
+
+    def _rotate(self):
+        """Move the active log into the first backup slot, shifting older ones up."""
+        oldest = self._rotated_path(self.backup_count)
+        if oldest.exists():
+            oldest.unlink()
+        for index in range(self.backup_count - 1, 0, -1):
+            path = self._rotated_path(index)
+            if path.exists():
+                path.rename(self._rotated_path(index + 1))
+
+        if self.backup_count <= 0:
+            self.log_path.unlink()
+        elif self.compress:
+            with open(self.log_path, "rb") as source, gzip.open(self._rotated_path(1), "wb") as target:
+                shutil.copyfileobj(source, target)
+            self.log_path.unlink()
+        else:
+            self.log_path.rename(self._rotated_path(1))
+
+        self.rotations += 1
+        logger.info(f"Rotated provenance log {self.log_path}")
+
+    def flush(self):
+        """Block until every queued event has been written."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Flush pending events, stop the writer and close the index."""
+        atexit.unregister(self.close)
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        if self._writer is not None and self.index is not None:
+            self.index.close()
+        self._writer = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue, write and rotation counters."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written_entries,
+            "dropped": self.dropped_entries,
+            "failed": self.failed_writes,
+            "rotations": self.rotations,
+            "indexed": self.index is not None
+        }
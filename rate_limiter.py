@@ -0,0 +1,261 @@
+"""
+Rate Limiter Module
+
+Paces LLM calls per provider with token buckets for requests per minute
+and tokens per minute. One limiter is shared by every client in the
+process, so agents and engines can issue generations concurrently and let
+the limiter space them out instead of sleeping between calls.
+
+Chosen libraries:
+- asyncio: FIFO waiting without blocking the event loop
+- time.monotonic: Drift-free bucket refills
+
+Pattern: Token bucket with FIFO admission and wait-time accounting
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Continuously refilling token bucket."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize the bucket full.
+
+        Args:
+            capacity: Maximum number of tokens held
+            refill_per_second: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def time_until_available(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens can be taken."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        """Take tokens; the balance may go negative to record debt."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float):
+        """Return tokens, e.g. when a call used fewer than estimated."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _ProviderLimits:
+    """Buckets, admission lock and metrics for one provider."""
+
+    def __init__(self, requests_per_minute: Optional[int], tokens_per_minute: Optional[int]):
+        self.requests = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+            if requests_per_minute else None
+        )
+        self.tokens = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+            if tokens_per_minute else None
+        )
+        self.lock: Optional[asyncio.Lock] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_requests = 0
+        self.delayed_requests = 0
+        self.total_tokens = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def get_lock(self) -> asyncio.Lock:
+        """Get the admission lock for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self.lock is None or self.loop is not loop:
+            self.lock = asyncio.Lock()
+            self.loop = loop
+        return self.lock
+
+
+class RateLimiter:
+    """
+    Per-provider request and token rate limiter.
+
+    Responsibilities:
+    - Hold requests-per-minute and tokens-per-minute buckets per provider
+    - Admit callers in FIFO order once both buckets allow the call
+    - Reconcile estimated token usage with actual usage
+    - Expose queue depth and wait-time metrics
+    """
+
+    def __init__(self):
+        """Initialize a limiter with no limits configured."""
+        self._providers: Dict[str, _ProviderLimits] = {}
+
+    def set_limits(
+        self,
+        provider: str,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None
+    ):
+        """
+        Configure limits for a provider; None leaves that dimension unlimited.
+
+        Args:
+            provider: Provider name (e.g. "openai", "ollama")
+            requests_per_minute: Maximum requests per minute
+            tokens_per_minute: Maximum prompt plus completion tokens per minute
+        """
+        for value in (requests_per_minute, tokens_per_minute):
+            if value is not None and value < 1:
+                raise ValueError("Rate limits must be at least 1 per minute")
+        self._providers[provider] = _ProviderLimits(requests_per_minute, tokens_per_minute)
+        logger.info(
+            f"Rate limits for {provider}: {requests_per_minute or 'unlimited'} requests/min, "
+            f"{tokens_per_minute or 'unlimited'} tokens/min"
+        )
+
+    def configure_from_api_config(
+        self,
+        apis: Dict[str, Dict[str, Any]],
+        providers: Sequence[str] = ("openai", "ollama")
+    ):
+        """
+        Set limits from per-provider API config without overriding existing ones.
+
+        Providers whose limits were already configured (by another engine or
+        client sharing the limiter) are left untouched, so constructing a
+        second consumer does not reset the buckets the first one is using.
+
+        Args:
+            apis: Mapping of provider name to config with optional
+                ``requests_per_minute`` and ``tokens_per_minute``
+            providers: Providers to configure
+        """
+        for provider in providers:
+            api_config = apis.get(provider, {})
+            if self.has_limits(provider):
+                continue
+            if api_config.get("requests_per_minute") or api_config.get("tokens_per_minute"):
+                self.set_limits(
+                    provider,
+                    requests_per_minute=api_config.get("requests_per_minute"),
+                    tokens_per_minute=api_config.get("tokens_per_minute")
+                )
+
+    def has_limits(self, provider: str) -> bool:
+        """Check whether limits have been configured for a provider."""
+        return provider in self._providers
+
+    async def acquire(self, provider: str, tokens: int = 0) -> float:
+        """
+        Wait until a call may be made.
+
+        Args:
+            provider: Provider name
+            tokens: Estimated tokens the call will use
+
+        Returns:
+            Seconds spent waiting
+        """
+        limits = self._providers.get(provider)
+        if limits is None:
+            return 0.0
+
+        started = time.monotonic()
+        limits.queue_depth += 1
+        limits.max_queue_depth = max(limits.max_queue_depth, limits.queue_depth)
+        try:
+            async with limits.get_lock():
+                while True:
+                    delay = max(
+                        limits.requests.time_until_available(1) if limits.requests else 0.0,
+                        limits.tokens.time_until_available(tokens) if limits.tokens else 0.0
+                    )
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+
+                if limits.requests:
+                    limits.requests.consume(1)
+                if limits.tokens:
+                    limits.tokens.consume(tokens)
+        finally:
+            limits.queue_depth -= 1
+
+        waited = time.monotonic() - started
+        limits.total_requests += 1
+        limits.total_tokens += tokens
+        limits.total_wait += waited
+        limits.max_wait = max(limits.max_wait, waited)
+        if waited > 0.001:
+            limits.delayed_requests += 1
+        return waited
+
+    def record_usage(self, provider: str, estimated_tokens: int, actual_tokens: int):
+        """
+        Correct the token bucket once a call's real usage is known.
+
+        Args:
+            provider: Provider name
+            estimated_tokens: Tokens reserved by acquire
+            actual_tokens: Tokens the provider reported
+        """
+        limits = self._providers.get(provider)
+        if limits is None:
+            return
+
+        difference = actual_tokens - estimated_tokens
+        limits.total_tokens += difference
+        if limits.tokens is None:
+            return
+        if difference > 0:
+            limits.tokens.consume(difference)
+        elif difference < 0:
+            limits.tokens.refund(-difference)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-provider queue depth and wait-time metrics."""
+        stats = {}
+        for provider, limits in self._providers.items():
+            stats[provider] = {
+                "requests_per_minute": limits.requests.capacity if limits.requests else None,
+                "tokens_per_minute": limits.tokens.capacity if limits.tokens else None,
+                "queue_depth": limits.queue_depth,
+                "max_queue_depth": limits.max_queue_depth,
+                "total_requests": limits.total_requests,
+                "delayed_requests": limits.delayed_requests,
+                "total_tokens": limits.total_tokens,
+                "total_wait_seconds": limits.total_wait,
+                "max_wait_seconds": limits.max_wait,
+                "average_wait_seconds": (
+                    limits.total_wait / limits.total_requests if limits.total_requests else 0.0
+                )
+            }
+        return stats
+
+
+_shared_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter shared by all LLM clients."""
+    global _shared_rate_limiter
+    if _shared_rate_limiter is None:
+        _shared_rate_limiter = RateLimiter()
+    return _shared_rate_limiter
@@ -16,11 +16,14 @@ Pattern: Advanced RAG techniques with web search integration
 import asyncio
 import json
 import logging
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import pydantic
 
+from research_store import ResearchStore, content_hash
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,7 +87,9 @@ class ResearchAgent:
         llm_client: Any,
         tool_manager: Any,
         max_web_results: int = 10,
-        max_memory_results: int = 20
+        max_memory_results: int = 20,
+        analysis_batch_size: int = 8,
+        research_store: Optional[ResearchStore] = None
     ):
         """
         Initialize the research agent.
@@ -96,6 +101,8 @@ class ResearchAgent:
             tool_manager: Tool manager for web search and other tools
             max_web_results: Maximum web search results to process
             max_memory_results: Maximum memory retrieval results
+            analysis_batch_size: Snippets summarised per structured LLM call
+            research_store: Persistent store for reusing processed sources and topics
         """
         self.agent_id = agent_id
         self.memory_manager = memory_manager
@@ -103,6 +110,8 @@ class ResearchAgent:
         self.tool_manager = tool_manager
         self.max_web_results = max_web_results
         self.max_memory_results = max_memory_results
+        self.analysis_batch_size = max(1, analysis_batch_size)
+        self.research_store = research_store
         
         # Research state
         self.active_topics: Dict[str, ResearchTopic] = {}
@@ -158,6 +167,14 @@ class ResearchAgent:
         try:
             topic.status = "in_progress"
             
+            # Reuse a stored near-duplicate topic if there is one
+            topic_embedding = await self._embed_topic(topic)
+            if topic_embedding is not None and self._reuse_stored_topic(topic, topic_embedding):
+                topic.status = "completed"
+                topic.completed_at = datetime.now()
+                logger.info(f"Reused stored research for topic: {topic.title}")
+                return
+            
             # Step 1: Memory-based research using RAG
             memory_results = await self._research_from_memory(topic)
             
@@ -174,6 +191,8 @@ class ResearchAgent:
             # Store results
             self.research_results[topic_id] = processed_results
             self.research_summaries[topic_id] = summary
+            if topic_embedding is not None:
+                self._store_topic(topic, topic_embedding, processed_results, summary)
             
             # Update topic status
             topic.status = "completed"
@@ -190,17 +209,27 @@ class ResearchAgent:
         results = []
         
         try:
-            # Create search query
-            query = f"{topic.title} {topic.description} {' '.join(topic.keywords)}"
+            # Create search queries, skipping blanks (e.g. no keywords) and repeats
+            queries = [
+                f"{topic.title} {topic.description} {' '.join(topic.keywords)}",
+                *topic.keywords
+            ]
+            queries = list(dict.fromkeys(query.strip() for query in queries if query.strip()))
             
-            # Retrieve relevant chunks
-            retrieval_results = await self.memory_manager.retrieve_relevant_chunks(
-                query=query,
+            # Retrieve relevant chunks for all queries in one batch
+            batch = await self.memory_manager.retrieve_many(
+                queries,
                 top_k=self.max_memory_results
             )
+            retrieval_results = batch.merged[:self.max_memory_results]
+            
+            analyses = await self._analyze_sources(
+                [result.content for result in retrieval_results],
+                [None] * len(retrieval_results)
+            )
             
             # Process each result
-            for i, result in enumerate(retrieval_results):
+            for i, (result, (summary, key_points)) in enumerate(zip(retrieval_results, analyses)):
                 research_result = ResearchResult(
                     result_id=f"memory_{topic.topic_id}_{i}",
                     topic_id=topic.topic_id,
@@ -209,13 +238,14 @@ class ResearchAgent:
                     content=result.content,
                     relevance_score=result.score,
                     confidence_score=result.score * 0.9,  # Slightly lower confidence for memory
-                    summary=await self._summarize_content(result.content),
-                    key_points=await self._extract_key_points(result.content),
+                    summary=summary,
+                    key_points=key_points,
                     citations=[result.chunk_id],
                     created_at=datetime.now()
                 )
                 results.append(research_result)
             
+            self._remember_sources(results)
             logger.info(f"Retrieved {len(results)} results from memory for topic: {topic.title}")
             
         except Exception as e:
@@ -228,45 +258,46 @@ class ResearchAgent:
         results = []
         
         try:
-            # Create search queries
+            # Create search queries, skipping blanks (e.g. no keywords) and repeats
             queries = [
                 f"{topic.title} {topic.description}",
                 f"{' '.join(topic.keywords)}",
                 f"{topic.title} research findings"
             ]
+            queries = list(dict.fromkeys(query.strip() for query in queries if query.strip()))
+            
+            # Fan the searches out concurrently
+            search_batches = await asyncio.gather(*(
+                self._run_web_search(topic, i, query) for i, query in enumerate(queries)
+            ))
             
-            for query in queries:
-                # Use web search tool
-                search_request = {
-                    "tool_name": "web_search",
-                    "args": {"query": query},
-                    "request_id": f"search_{topic.topic_id}_{datetime.now().strftime('%H%M%S')}",
-                    "agent_id": self.agent_id
-                }
-                
-                response = await self.tool_manager.execute_tool(search_request)
-                
-                if response.status == "success" and response.output:
-                    search_data = response.output
-                    
-                    # Process search results
-                    for i, result in enumerate(search_data.get("results", [])[:self.max_web_results]):
-                        research_result = ResearchResult(
-                            result_id=f"web_{topic.topic_id}_{i}",
-                            topic_id=topic.topic_id,
-                            source_type="web",
-                            source_url=result.get("url", ""),
-                            source_title=result.get("title", "Unknown"),
-                            content=result.get("snippet", ""),
-                            relevance_score=0.8,  # Default relevance for web results
-                            confidence_score=0.7,  # Lower confidence for web results
-                            summary=await self._summarize_content(result.get("snippet", "")),
-                            key_points=await self._extract_key_points(result.get("snippet", "")),
-                            citations=[result.get("url", "")],
-                            created_at=datetime.now()
-                        )
-                        results.append(research_result)
+            # De-duplicate before any LLM work is spent on the hits
+            hits = self._dedupe_web_hits(
+                hit for batch in search_batches for hit in batch
+            )
+            analyses = await self._analyze_sources(
+                [hit.get("snippet", "") for hit in hits],
+                [hit.get("url") for hit in hits]
+            )
+            
+            for i, (hit, (summary, key_points)) in enumerate(zip(hits, analyses)):
+                research_result = ResearchResult(
+                    result_id=f"web_{topic.topic_id}_{i}",
+                    topic_id=topic.topic_id,
+                    source_type="web",
+                    source_url=hit.get("url", ""),
+                    source_title=hit.get("title", "Unknown"),
+                    content=hit.get("snippet", ""),
+                    relevance_score=0.8,  # Default relevance for web results
+                    confidence_score=0.7,  # Lower confidence for web results
+                    summary=summary,
+                    key_points=key_points,
+                    citations=[hit.get("url", "")],
+                    created_at=datetime.now()
+                )
+                results.append(research_result)
             
+            self._remember_sources(results)
             logger.info(f"Retrieved {len(results)} results from web for topic: {topic.title}")
             
         except Exception as e:
@@ -274,6 +305,250 @@ class ResearchAgent:
         
         return results
     
+    async def _run_web_search(self, topic: ResearchTopic, index: int, query: str) -> List[Dict[str, Any]]:
+        """Run a single web search query and return its raw hits."""
+        search_request = {
+            "tool_name": "web_search",
+            "args": {"query": query},
+            "request_id": f"search_{topic.topic_id}_{index}_{datetime.now().strftime('%H%M%S')}",
+            "agent_id": self.agent_id
+        }
+        
+        try:
+            response = await self.tool_manager.execute_tool(search_request)
+        except Exception as e:
+            logger.warning(f"Web search failed for query '{query}': {e}")
+            return []
+        
+        if response.status != "success" or not response.output:
+            return []
+        return list(response.output.get("results", []))[:self.max_web_results]
+    
+    @staticmethod
+    def _dedupe_web_hits(hits) -> List[Dict[str, Any]]:
+        """Drop hits whose URL or normalised snippet has already been seen."""
+        unique = []
+        seen_urls = set()
+        seen_content = set()
+        
+        for hit in hits:
+            url = (hit.get("url") or "").strip()
+            digest = content_hash(hit.get("snippet"))
+            
+            if (url and url in seen_urls) or (digest and digest in seen_content):
+                continue
+            if url:
+                seen_urls.add(url)
+            if digest:
+                seen_content.add(digest)
+            unique.append(hit)
+        
+        return unique
+    
+    async def _analyze_sources(
+        self,
+        contents: List[str],
+        urls: List[Optional[str]]
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        Summarise and extract key points, reusing sources already in the research store.
+        
+        Args:
+            contents: Source texts to analyse
+            urls: Source URLs aligned with ``contents`` (None for non-web sources)
+            
+        Returns:
+            One (summary, key_points) pair per input, in input order
+        """
+        if self.research_store is None:
+            return await self._analyze_snippets(contents)
+        
+        stored = self.research_store.get_sources(urls, contents)
+        missing = [i for i, source in enumerate(stored) if source is None]
+        fresh = await self._analyze_snippets([contents[i] for i in missing])
+        
+        analyses = [
+            (source["summary"], source["key_points"]) if source is not None else None
+            for source in stored
+        ]
+        for i, analysis in zip(missing, fresh):
+            analyses[i] = analysis
+        
+        if len(missing) < len(contents):
+            logger.info(f"Reused {len(contents) - len(missing)} stored source analyses")
+        return analyses
+    
+    def _remember_sources(self, results: List[ResearchResult]):
+        """Record processed sources in the research store."""
+        if self.research_store is None or not results:
+            return
+        
+        self.research_store.put_sources([
+            {
+                "url": result.source_url,
+                "source_type": result.source_type,
+                "title": result.source_title,
+                "content": result.content,
+                "summary": result.summary,
+                "key_points": result.key_points
+            }
+            for result in results
+        ])
+    
+    async def _embed_topic(self, topic: ResearchTopic) -> Optional[List[float]]:
+        """Embed a topic's description for near-duplicate matching."""
+        if self.research_store is None:
+            return None
+        
+        try:
+            text = f"{topic.title} {topic.description} {' '.join(topic.keywords)}"
+            embeddings = await self.memory_manager.embed_texts([text])
+            return list(embeddings[0])
+        except Exception as e:
+            logger.warning(f"Failed to embed topic {topic.topic_id}: {e}")
+            return None
+    
+    def _reuse_stored_topic(self, topic: ResearchTopic, embedding: List[float]) -> bool:
+        """Adopt the results and summary of a stored near-duplicate topic."""
+        record = self.research_store.find_similar_topic(embedding)
+        if record is None:
+            return False
+        
+        now = datetime.now()
+        results = []
+        for i, stored in enumerate(record.get("results", [])):
+            stored.update(
+                result_id=f"{stored.get('source_type', 'stored')}_{topic.topic_id}_{i}",
+                topic_id=topic.topic_id,
+                created_at=now
+            )
+            results.append(ResearchResult(**stored))
+        
+        summary = dict(record.get("summary") or {})
+        summary.update(
+            summary_id=f"summary_{topic.topic_id}",
+            topic_id=topic.topic_id,
+            title=topic.title,
+            created_at=now
+        )
+        
+        self.research_results[topic.topic_id] = results
+        self.research_summaries[topic.topic_id] = ResearchSummary(**summary)
+        logger.info(
+            f"Topic {topic.title} matches stored topic {record.get('title')} "
+            f"(similarity {record.get('similarity', 0.0):.3f})"
+        )
+        return True
+    
+    def _store_topic(
+        self,
+        topic: ResearchTopic,
+        embedding: List[float],
+        results: List[ResearchResult],
+        summary: ResearchSummary
+    ):
+        """Record a finished topic in the research store for later reuse."""
+        if not results:
+            return
+        
+        self.research_store.put_topic(
+            topic_key=topic.topic_id,
+            title=topic.title,
+            embedding=embedding,
+            record={
+                "title": topic.title,
+                "results": [result.dict() for result in results],
+                "summary": summary.dict()
+            }
+        )
+    
+    async def _analyze_snippets(self, contents: List[str]) -> List[Tuple[str, List[str]]]:
+        """
+        Summarise and extract key points for many snippets.
+        
+        Snippets are grouped into batches of ``analysis_batch_size`` and each
+        batch is covered by one structured LLM call; batches run concurrently.
+        
+        Args:
+            contents: Snippet texts to analyse
+            
+        Returns:
+            One (summary, key_points) pair per input, in input order
+        """
+        batches = [
+            contents[start:start + self.analysis_batch_size]
+            for start in range(0, len(contents), self.analysis_batch_size)
+        ]
+        analysed = await asyncio.gather(*(self._analyze_snippet_batch(batch) for batch in batches))
+        return [pair for batch in analysed for pair in batch]
+    
+    async def _analyze_snippet_batch(self, contents: List[str]) -> List[Tuple[str, List[str]]]:
+        """Summarise and extract key points for one batch in a single LLM call."""
+        fallback = [
+            (content if len(content) < 100 else content[:200] + "...", [])
+            for content in contents
+        ]
+        if not any(content.strip() for content in contents):
+            return fallback
+        
+        snippets = "\n\n".join(
+            f"[{i}]\n{content[:500]}" for i, content in enumerate(contents)
+        )
+        prompt = f"""
+        For each numbered snippet below, write a 2-3 sentence summary and extract 3-5 key points.
+        
+        Snippets:
+        {snippets}
+        
+        Respond with only a JSON array containing one object per snippet, in the form:
+        [{{"id": 0, "summary": "...", "key_points": ["...", "..."]}}]
+        """
+        
+        try:
+            response = await self.llm_client.generate(
+                prompt=prompt,
+                max_tokens=min(4000, 300 * len(contents)),
+                temperature=0.3
+            )
+            entries = self._parse_snippet_analyses(response.content)
+        except Exception as e:
+            logger.warning(f"Failed to analyse snippet batch: {e}")
+            return fallback
+        
+        analyses = list(fallback)
+        for i, content in enumerate(contents):
+            entry = entries.get(i)
+            if not entry:
+                continue
+            summary = content if len(content) < 100 else (entry.get("summary") or analyses[i][0])
+            key_points = [str(point).strip() for point in entry.get("key_points") or [] if str(point).strip()]
+            analyses[i] = (str(summary).strip(), key_points[:5])
+        
+        return analyses
+    
+    @staticmethod
+    def _parse_snippet_analyses(response_text: str) -> Dict[int, Dict[str, Any]]:
+        """Parse the JSON array returned by a batched analysis call, keyed by snippet id."""
+        match = re.search(r"\[.*\]", response_text, re.DOTALL)
+        if not match:
+            return {}
+        
+        try:
+            data = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        
+        entries = {}
+        for position, item in enumerate(data if isinstance(data, list) else []):
+            if not isinstance(item, dict):
+                continue
+            try:
+                index = int(item.get("id", position))
+            except (TypeError, ValueError):
+                index = position
+            entries[index] = item
+        return entries
+    
     async def _process_research_results(
         self,
         topic: ResearchTopic,
@@ -399,47 +674,6 @@ class ResearchAgent:
                 created_at=datetime.now()
             )
     
-    async def _summarize_content(self, content: str) -> str:
-        """Generate a brief summary of content."""
-        if len(content) < 100:
-            return content
-        
-        try:
-            prompt = f"Summarize the following content in 2-3 sentences:\n\n{content[:500]}"
-            response = await self.llm_client.generate(
-                prompt=prompt,
-                max_tokens=100,
-                temperature=0.3
-            )
-            return response.content
-        except Exception as e:
-            logger.warning(f"Failed to summarize content: {e}")
-            return content[:200] + "..."
-    
-    async def _extract_key_points(self, content: str) -> List[str]:
-        """Extract key points from content."""
-        try:
-            prompt = f"Extract 3-5 key points from the following content:\n\n{content[:500]}"
-            response = await self.llm_client.generate(
-                prompt=prompt,
-                max_tokens=200,
-                temperature=0.3
-            )
-            
-            # Simple parsing of key points
-            points = []
-            for line in response.content.split('\n'):
-                line = line.strip()
-                if line and (line.startswith('-') or line.startswith('•') or line.startswith('*')):
-                    points.append(line[1:].strip())
-                elif line and line[0].isdigit():
-                    points.append(line)
-            
-            return points[:5]  # Limit to 5 points
-        except Exception as e:
-            logger.warning(f"Failed to extract key points: {e}")
-            return []
-    
     async def _extract_key_findings(self, summary_text: str) -> List[str]:
         """Extract key findings from summary text."""
         try:
@@ -0,0 +1,368 @@
+"""
+Research Store Module
+
+Persistent store for processed research so overlapping topics, new books and
+restarts do not repeat web searches and summarisation. Sources are indexed by
+normalised URL and by content hash and keep their summary and key points.
+Finished topics are stored with an embedding of their description so a
+near-duplicate topic can reuse the earlier results wholesale. Every record
+carries an expiry time controlled by a TTL.
+
+Chosen libraries:
+- sqlite3: Persistent store with indexed URL and content-hash lookups
+- numpy: Cosine similarity between topic embeddings
+- array: Compact float32 serialization of embedding vectors
+- json: Key point and result serialization
+
+Pattern: Content-addressed read-through store with TTL expiry
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMETERS = {"fbclid", "gclid", "ref", "ref_src", "mc_cid", "mc_eid"}
+
+
+def normalize_url(url: Optional[str]) -> str:
+    """
+    Normalise a URL so trivially different links to one page compare equal.
+
+    Lower-cases the scheme and host, drops a leading ``www.``, the fragment,
+    tracking parameters and trailing slashes, and sorts the query string.
+
+    Args:
+        url: URL to normalise
+
+    Returns:
+        Normalised URL, or an empty string for a missing URL
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+
+    parts = urlsplit(url)
+    if not parts.scheme and not parts.netloc:
+        return url.rstrip("/")
+
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMETERS
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def content_hash(text: Optional[str]) -> str:
+    """
+    Hash text after collapsing whitespace and case.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        SHA-256 hex digest, or an empty string for blank text
+    """
+    normalised = " ".join((text or "").lower().split())
+    if not normalised:
+        return ""
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+
+class ResearchStore:
+    """
+    Persistent store of processed research sources and topics.
+
+    Responsibilities:
+    - Index processed sources by normalised URL and content hash
+    - Keep summaries and key points per source
+    - Match new topics to stored near-duplicates by embedding similarity
+    - Expire sources and topics after their TTL
+    """
+
+    def __init__(
+        self,
+        store_directory: Union[str, Path],
+        source_ttl: Optional[float] = 30 * 24 * 3600,
+        topic_ttl: Optional[float] = 7 * 24 * 3600,
+        topic_similarity_threshold: float = 0.92
+    ):
+        """
+        Initialize the research store.
+
+        Args:
+            store_directory: Directory holding the store database
+            source_ttl: Seconds before a processed source expires (None keeps it forever)
+            topic_ttl: Seconds before a finished topic expires (None keeps it forever)
+            topic_similarity_threshold: Minimum cosine similarity for topic reuse
+        """
+        self.store_directory = Path(store_directory)
+        self.store_directory.mkdir(parents=True, exist_ok=True)
+        self.source_ttl = source_ttl
+        self.topic_ttl = topic_ttl
+        self.topic_similarity_threshold = topic_similarity_threshold
+        self._lock = threading.Lock()
+
+        self.db_path = self.store_directory / "research_store.sqlite"
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sources (
+                source_key TEXT PRIMARY KEY,
+                url TEXT,
+                content_hash TEXT,
+                source_type TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                key_points TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sources_url ON sources (url);
+            CREATE INDEX IF NOT EXISTS idx_sources_content_hash ON sources (content_hash);
+            CREATE TABLE IF NOT EXISTS topics (
+                topic_key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                record TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL
+            );
+            """
+        )
+        self._conn.commit()
+        self.purge_expired()
+
+        self.source_hits = 0
+        self.source_misses = 0
+        self.topic_hits = 0
+        self.topic_misses = 0
+
+    @staticmethod
+    def make_source_key(url: Optional[str], content: Optional[str]) -> str:
+        """Build the primary key for a source: its URL if known, else its content hash."""
+        normalised = normalize_url(url)
+        if normalised:
+            return f"url:{normalised}"
+        return f"sha256:{content_hash(content)}"
+
+    def _expiry(self, ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl is not None else None
+
+    def get_sources(
+        self,
+        urls: Sequence[Optional[str]],
+        contents: Sequence[Optional[str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Look up processed sources by URL or content hash.
+
+        Args:
+            urls: Source URLs (may be empty or None)
+            contents: Source texts aligned with ``urls``
+
+        Returns:
+            List aligned with the inputs holding fresh source records or None
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        now = time.time()
+
+        with self._lock:
+            for url, content in zip(urls, contents):
+                url_key = normalize_url(url)
+                digest = content_hash(content)
+                row = None
+                try:
+                    if url_key:
+                        row = self._conn.execute(
+                            "SELECT url, source_type, title, content, summary, key_points FROM sources "
+                            "WHERE url = ? AND (expires_at IS NULL OR expires_at > ?)",
+                            (url_key, now)
+                        ).fetchone()
+                    if row is None and digest:
+                        row = self._conn.execute(
+                            "SELECT url, source_type, title, content, summary, key_points FROM sources "
+                            "WHERE content_hash = ? AND (expires_at IS NULL OR expires_at > ?)",
+                            (digest, now)
+                        ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"Research store read failed: {e}")
+
+                if row is None:
+                    self.source_misses += 1
+                    results.append(None)
+                    continue
+
+                self.source_hits += 1
+                results.append({
+                    "url": row[0] or "",
+                    "source_type": row[1],
+                    "title": row[2],
+                    "content": row[3],
+                    "summary": row[4],
+                    "key_points": json.loads(row[5])
+                })
+
+        return results
+
+    def put_sources(self, sources: Sequence[Dict[str, Any]]):
+        """
+        Store processed sources.
+
+        Args:
+            sources: Dicts with url, source_type, title, content, summary and key_points
+        """
+        now = time.time()
+        expires_at = self._expiry(self.source_ttl)
+        rows = []
+        for source in sources:
+            url, content = source.get("url"), source.get("content", "")
+            rows.append((
+                self.make_source_key(url, content),
+                normalize_url(url) or None,
+                content_hash(content) or None,
+                source.get("source_type", "web"),
+                source.get("title", "Unknown"),
+                content,
+                source.get("summary", ""),
+                json.dumps(list(source.get("key_points", []))),
+                now,
+                expires_at
+            ))
+
+        if not rows:
+            return
+
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sources (source_key, url, content_hash, source_type, title, "
+                    "content, summary, key_points, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Research store write failed: {e}")
+
+    def find_similar_topic(self, embedding: Sequence[float]) -> Optional[Dict[str, Any]]:
+        """
+        Find the most similar fresh topic above the similarity threshold.
+
+        Args:
+            embedding: Embedding of the new topic's description
+
+        Returns:
+            Stored topic record with a ``similarity`` field, or None
+        """
+        query = np.asarray(embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(
+                    "SELECT embedding, record FROM topics WHERE expires_at IS NULL OR expires_at > ?",
+                    (time.time(),)
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Research store read failed: {e}")
+                rows = []
+
+            vectors = [np.frombuffer(blob, dtype=np.float32) for blob, _ in rows]
+            rows = [row for row, vector in zip(rows, vectors) if vector.shape == query.shape]
+            vectors = [vector for vector in vectors if vector.shape == query.shape]
+            if not rows or query_norm == 0:
+                self.topic_misses += 1
+                return None
+
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = np.inf
+            similarities = matrix @ query / (norms * query_norm)
+            best = int(np.argmax(similarities))
+
+            if similarities[best] < self.topic_similarity_threshold:
+                self.topic_misses += 1
+                return None
+
+            self.topic_hits += 1
+            record = json.loads(rows[best][1])
+            record["similarity"] = float(similarities[best])
+            return record
+
+    def put_topic(self, topic_key: str, title: str, embedding: Sequence[float], record: Dict[str, Any]):
+        """
+        Store a finished topic for later reuse.
+
+        Args:
+            topic_key: Stable identifier for the topic
+            title: Topic title
+            embedding: Embedding of the topic's description
+            record: JSON-serialisable results and summary for the topic
+        """
+        blob = array("f", embedding).tobytes()
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO topics (topic_key, title, embedding, record, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (topic_key, title, blob, json.dumps(record, default=str), time.time(),
+                     self._expiry(self.topic_ttl))
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Research store write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired sources and topics and return how many were removed."""
+        now = time.time()
+        with self._lock:
+            removed = 0
+            for table in ("sources", "topics"):
+                cursor = self._conn.execute(
+                    f"DELETE FROM {table} WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+                )
+                removed += cursor.rowcount
+            self._conn.commit()
+            return removed
+
+    def clear(self):
+        """Remove every stored source and topic."""
+        with self._lock:
+            self._conn.execute("DELETE FROM sources")
+            self._conn.execute("DELETE FROM topics")
+            self._conn.commit()
+
+    def close(self):
+        """Close the on-disk store."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and record counts."""
+        with self._lock:
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+            topics = self._conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0]
+            return {
+                "source_hits": self.source_hits,
+                "source_misses": self.source_misses,
+                "topic_hits": self.topic_hits,
+                "topic_misses": self.topic_misses,
+                "sources": sources,
+                "topics": topics
+            }
@@ -0,0 +1,316 @@
+"""
+Response Cache Module
+
+Caches LLM responses keyed on everything that determines the output:
+provider, model, system message, prompt, temperature and token limit.
+Backends are pluggable; an in-memory LRU and an on-disk SQLite store are
+provided and can be layered so hot entries are served from memory while
+finished work survives restarts.
+
+Chosen libraries:
+- sqlite3: Persistent on-disk backend with expiry timestamps
+- collections.OrderedDict: In-memory LRU backend
+- json: Response serialization
+
+Pattern: Read-through cache over an ordered list of backends
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Abstract base class for response cache backends."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Optional[float]]]:
+        """Get an unexpired (value, expires_at) pair, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Dict[str, Any], expires_at: Optional[float] = None):
+        """Store a value, optionally expiring at a UNIX timestamp."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove a value."""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove every value."""
+        pass
+
+    def close(self):
+        """
+        Release resources held by the backend.
+
+        Intentionally a no-op by default; backends holding files or
+        connections override it.
+        """
+        return None
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Size-bounded in-memory LRU backend."""
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        Initialize the memory backend.
+
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Optional[float]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Dict[str, Any], expires_at: Optional[float] = None):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Persistent SQLite backend."""
+
+    def __init__(self, cache_directory: Union[str, Path]):
+        """
+        Initialize the SQLite backend.
+
+        Args:
+            cache_directory: Directory holding the cache database
+        """
+        self.cache_directory = Path(cache_directory)
+        self.cache_directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_directory / "response_cache.sqlite"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL
+            )
+            """
+        )
+        self._conn.commit()
+        self.purge_expired()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], Optional[float]]]:
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires_at = row
+                if expires_at is not None and expires_at <= time.time():
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    return None
+                return json.loads(value), expires_at
+            except (sqlite3.Error, json.JSONDecodeError) as e:
+                logger.warning(f"Response cache read failed: {e}")
+                return None
+
+    def set(self, key: str, value: Dict[str, Any], expires_at: Optional[float] = None):
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, default=str), time.time(), expires_at)
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Response cache write failed: {e}")
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired rows and return how many were removed."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Read-through LLM response cache over one or more backends.
+
+    Responsibilities:
+    - Derive cache keys from every parameter that shapes a response
+    - Look backends up in order and promote hits to faster backends
+    - Apply a default or per-entry time to live
+    - Track hit and miss counts
+    """
+
+    def __init__(
+        self,
+        backends: Optional[List[CacheBackend]] = None,
+        default_ttl: Optional[float] = None
+    ):
+        """
+        Initialize the response cache.
+
+        Args:
+            backends: Backends ordered fastest first (defaults to memory only)
+            default_ttl: Seconds before entries expire (None keeps them forever)
+        """
+        self.backends = backends if backends is not None else [MemoryCacheBackend()]
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def with_disk(
+        cls,
+        cache_directory: Union[str, Path],
+        max_memory_entries: int = 1000,
+        default_ttl: Optional[float] = None
+    ) -> "ResponseCache":
+        """Create a cache with a memory LRU in front of a SQLite store."""
+        return cls(
+            backends=[MemoryCacheBackend(max_memory_entries), SQLiteCacheBackend(cache_directory)],
+            default_ttl=default_ttl
+        )
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: Optional[str],
+        system_message: Optional[str],
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        functions: Optional[List[Dict]] = None,
+        function_call: Optional[Union[str, Dict]] = None
+    ) -> str:
+        """Build the cache key for a generation request."""
+        material = json.dumps(
+            [provider, model, system_message, prompt, temperature, max_tokens,
+             functions, function_call],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response data, or None on a miss
+        """
+        for index, backend in enumerate(self.backends):
+            entry = backend.get(key)
+            if entry is not None:
+                # Promote to the faster backends that missed
+                for faster in self.backends[:index]:
+                    faster.set(key, *entry)
+                self.hits += 1
+                return entry[0]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None):
+        """
+        Store a response in every backend.
+
+        Args:
+            key: Cache key from make_key
+            value: Response data
+            ttl: Seconds before the entry expires (defaults to default_ttl)
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        for backend in self.backends:
+            backend.set(key, value, expires_at)
+
+    def invalidate(self, key: str):
+        """Remove a response from every backend."""
+        for backend in self.backends:
+            backend.delete(key)
+
+    def clear(self):
+        """Remove every cached response."""
+        for backend in self.backends:
+            backend.clear()
+
+    def close(self):
+        """Close all backends."""
+        for backend in self.backends:
+            backend.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "backends": [type(backend).__name__ for backend in self.backends]
+        }
@@ -0,0 +1,103 @@
+"""
+Retrieval Cache Module
+
+Caches MemoryManager retrieval results so repeated queries - the same
+chapter outlined, drafted, revised and reviewed - skip both query embedding
+and the vector search. Keys combine the embedding model, the query text, the
+metadata filter, top_k and min_score with a collection version that the
+memory manager bumps on every add or delete, so results computed before a
+write can never be served after it.
+
+Chosen libraries:
+- hashlib: Cache key derivation
+- json: Filter canonicalisation
+- response_cache: In-memory LRU storage with optional time to live
+
+Pattern: Version-stamped read-through cache
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from response_cache import MemoryCacheBackend, ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class RetrievalCache:
+    """
+    Query result cache invalidated by a collection version counter.
+
+    Responsibilities:
+    - Derive keys from everything that shapes a retrieval result
+    - Stamp keys with the current collection version
+    - Drop every entry when the collection changes
+    - Track hits and misses
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, max_entries: int = 1024):
+        """
+        Initialize the retrieval cache.
+
+        Args:
+            cache: Backing store (defaults to an in-memory LRU of ``max_entries``)
+            max_entries: Size of the default in-memory LRU
+        """
+        self.cache = cache if cache is not None else ResponseCache([MemoryCacheBackend(max_entries)])
+        self.version = 0
+
+    def bump_version(self):
+        """Record a change to the collection, invalidating every cached result."""
+        self.version += 1
+        self.cache.clear()
+
+    def make_key(
+        self,
+        model: str,
+        query: str,
+        filter_metadata: Optional[Dict[str, Any]],
+        top_k: int,
+        min_score: float,
+        version: Optional[int] = None
+    ) -> str:
+        """
+        Build the cache key for a retrieval.
+
+        Args:
+            model: Embedding model the query would be embedded with
+            query: Query text
+            filter_metadata: Metadata filter
+            top_k: Number of results requested
+            min_score: Similarity threshold
+            version: Collection version the results belong to (defaults to the current one)
+
+        Returns:
+            Cache key
+        """
+        material = json.dumps(
+            [model, query, filter_metadata, top_k, min_score],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        digest = hashlib.sha256(material.encode("utf-8")).hexdigest()
+        return f"retrieval:{self.version if version is None else version}:{digest}"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get cached results as dicts, or None on a miss."""
+        entry = self.cache.get(key)
+        return entry["results"] if entry is not None else None
+
+    def set(self, key: str, results: List[Dict[str, Any]], ttl: Optional[float] = None):
+        """Cache results (as dicts) under a key."""
+        self.cache.set(key, {"results": results}, ttl)
+
+    def clear(self):
+        """Drop every cached result."""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the collection version."""
+        return {**self.cache.get_stats(), "version": self.version}
@@ -0,0 +1,193 @@
+"""
+Streaming Process Module
+
+Runs a subprocess without blocking the event loop and yields its stdout and
+stderr incrementally as they are produced. Output is decoded and hashed chunk
+by chunk, the wall-clock timeout is enforced with a deadline rather than a
+blocking wait, and the whole process group is killed on timeout, on
+cancellation of the consuming task, or when the consumer stops iterating.
+
+Chosen libraries:
+- asyncio: Subprocess pipes, reader tasks and deadlines
+- hashlib: Incremental SHA-256 of each output stream
+- codecs: Incremental UTF-8 decoding across chunk boundaries
+
+Pattern: Async generator over a multiplexed subprocess
+"""
+
+import asyncio
+import codecs
+import hashlib
+import logging
+import os
+import signal
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class OutputChunk(NamedTuple):
+    """A piece of decoded output from one stream."""
+    stream: str  # "stdout" or "stderr"
+    data: str
+
+
+class StreamingProcess:
+    """
+    A subprocess whose output is consumed as an async stream.
+
+    Responsibilities:
+    - Start the process with asyncio.create_subprocess_exec
+    - Multiplex stdout and stderr into one ordered stream of chunks
+    - Hash and accumulate each stream incrementally
+    - Enforce a timeout and kill the process group on timeout or cancellation
+    """
+
+    def __init__(
+        self,
+        argv: Sequence[str],
+        timeout: Optional[float] = None,
+        cwd: Optional[str] = None,
+        env: Optional[Dict[str, str]] = None,
+        read_size: int = 4096
+    ):
+        """
+        Initialize the process wrapper.
+
+        Args:
+            argv: Program and arguments to execute
+            timeout: Seconds of wall-clock time before the process is killed
+            cwd: Working directory for the process
+            env: Environment for the process (inherits the current one if None)
+            read_size: Maximum bytes read from a pipe at a time
+        """
+        self.argv = list(argv)
+        self.timeout = timeout
+        self.cwd = cwd
+        self.env = env
+        self.read_size = read_size
+
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._hashers = {"stdout": hashlib.sha256(), "stderr": hashlib.sha256()}
+        self._decoders = {
+            name: codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for name in self._hashers
+        }
+        self._parts: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+        self._sizes = {"stdout": 0, "stderr": 0}
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Process ID once started."""
+        return self._process.pid if self._process else None
+
+    @property
+    def stdout(self) -> str:
+        """All stdout decoded so far."""
+        return "".join(self._parts["stdout"])
+
+    @property
+    def stderr(self) -> str:
+        """All stderr decoded so far."""
+        return "".join(self._parts["stderr"])
+
+    @property
+    def hashes(self) -> Dict[str, str]:
+        """SHA-256 of each stream's raw bytes (empty string for no output)."""
+        return {
+            name: hasher.hexdigest() if self._sizes[name] else ""
+            for name, hasher in self._hashers.items()
+        }
+
+    async def _pump(self, name: str, pipe: asyncio.StreamReader, queue: asyncio.Queue):
+        """Forward raw chunks from one pipe to the shared queue."""
+        try:
+            while True:
+                data = await pipe.read(self.read_size)
+                if not data:
+                    break
+                await queue.put((name, data))
+        finally:
+            await queue.put((name, None))
+
+    def _accept(self, name: str, data: Optional[bytes]) -> str:
+        """Hash, decode and accumulate one raw chunk (None flushes the decoder)."""
+        if data is None:
+            text = self._decoders[name].decode(b"", final=True)
+        else:
+            self._hashers[name].update(data)
+            self._sizes[name] += len(data)
+            text = self._decoders[name].decode(data)
+        if text:
+            self._parts[name].append(text)
+        return text
+
+    async def stream(self) -> AsyncIterator[OutputChunk]:
+        """
+        Start the process and yield output chunks until it exits.
+
+        Yields:
+            OutputChunk for each piece of decoded output, in arrival order
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout if self.timeout is not None else None
+
+        self._process = await asyncio.create_subprocess_exec(
+            *self.argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=self.cwd,
+            env=self.env,
+            start_new_session=os.name == "posix"
+        )
+        queue: asyncio.Queue = asyncio.Queue()
+        pumps = [
+            asyncio.ensure_future(self._pump("stdout", self._process.stdout, queue)),
+            asyncio.ensure_future(self._pump("stderr", self._process.stderr, queue))
+        ]
+
+        try:
+            open_streams = 2
+            while open_streams:
+                remaining = deadline - loop.time() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError
+                name, data = await asyncio.wait_for(queue.get(), remaining)
+                if data is None:
+                    open_streams -= 1
+                text = self._accept(name, data)
+                if text:
+                    yield OutputChunk(name, text)
+
+            remaining = deadline - loop.time() if deadline is not None else None
+            self.returncode = await asyncio.wait_for(self._process.wait(), remaining)
+
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            logger.warning(f"Process {self.pid} timed out after {self.timeout} seconds")
+        finally:
+            if self._process.returncode is None:
+                await self._kill()
+            for pump in pumps:
+                pump.cancel()
+            await asyncio.gather(*pumps, return_exceptions=True)
+
+    async def _kill(self):
+        """Kill the process and its process group, then reap it."""
+        try:
+            if os.name == "posix":
+                os.killpg(self._process.pid, signal.SIGKILL)
+            else:
+                self._process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        await self._process.wait()
+
+    async def run(self) -> "StreamingProcess":
+        """Run to completion, accumulating output without yielding it."""
+        async for _ in self.stream():
+            pass
+        return self
@@ -0,0 +1,116 @@
+"""
+Local stub of the Ollama HTTP API for testing.
+
+Serves /api/tags and /api/generate (streaming and non-streaming) from a
+background thread, with a configurable per-request delay, and records how
+many requests were in flight at once and how many connections were opened.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class OllamaStubServer:
+    """Threaded Ollama API stub bound to an ephemeral local port."""
+
+    def __init__(self, delay: float = 0.0, tokens=("Hello", " ", "world")):
+        self.delay = delay
+        self.tokens = list(tokens)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "OllamaStubServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "OllamaStubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, data):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self._send_json(200, {"models": [{"name": "stub-model"}]})
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+
+                with stub._lock:
+                    stub.requests += 1
+                    stub.connections.add(self.client_address)
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    if payload.get("model") == "error":
+                        self._send_json(500, {"error": "model failed"})
+                    elif payload.get("stream"):
+                        self._stream(payload)
+                    else:
+                        time.sleep(stub.delay)
+                        self._send_json(200, {
+                            "model": payload.get("model"),
+                            "response": "".join(stub.tokens),
+                            "done": True,
+                            "prompt_eval_count": 3,
+                            "eval_count": len(stub.tokens),
+                            "context": []
+                        })
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _stream(self, payload):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in stub.tokens:
+                    time.sleep(stub.delay)
+                    line = {"model": payload.get("model"), "response": token, "done": False}
+                    self._write_chunk(json.dumps(line).encode("utf-8") + b"\n")
+                done = {"model": payload.get("model"), "response": "", "done": True}
+                self._write_chunk(json.dumps(done).encode("utf-8") + b"\n")
+                self._write_chunk(b"")
+
+        return Handler
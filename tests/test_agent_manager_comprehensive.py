@@ -459,4 +459,265 @@ class TestIntegration:
         
         # Basic integration test
         assert agent_manager is not None
-        assert tool_manager is not None
\ No newline at end of file
+        assert tool_manager is not None
+
+
+class TestDependencyScheduling:
+    """Test the event-driven dependency scheduler."""
+    
+    class RecordingAgent:
+        """Agent that records the order tasks run in."""
+        
+        def __init__(self, delay=0.01):
+            self.delay = delay
+            self.order = []
+            self.in_flight = 0
+            self.max_in_flight = 0
+        
+        async def execute_task(self, task_type, payload):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+                if payload.get("fail"):
+                    raise RuntimeError("task failed")
+                self.order.append(payload["name"])
+                return payload["name"]
+            finally:
+                self.in_flight -= 1
+    
+    async def _wait_for(self, manager, task_ids, timeout=5.0):
+        """Wait until the given tasks have all reached a final state."""
+        final = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not all(manager.tasks[t].status in final for t in task_ids):
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.005)
+    
+    @pytest.mark.asyncio
+    async def test_dependents_run_after_dependencies(self):
+        """Test that a chain of dependencies runs in order."""
+        manager = AgentManager()
+        agent = self.RecordingAgent()
+        manager.register_agent(agent, "worker", "test", [])
+        await manager.start()
+        
+        first = await manager.submit_task("worker", "step", {"name": "a"})
+        second = await manager.submit_task("worker", "step", {"name": "b"}, dependencies=[first])
+        third = await manager.submit_task("worker", "step", {"name": "c"}, dependencies=[second])
+        await self._wait_for(manager, [first, second, third])
+        await manager.stop()
+        
+        assert agent.order == ["a", "b", "c"]
+        assert manager.get_stats()["waiting_tasks"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_ready_tasks_run_by_priority_within_limit(self):
+        """Test that ready tasks are dispatched highest priority first."""
+        manager = AgentManager(max_concurrent_tasks=1)
+        agent = self.RecordingAgent()
+        manager.register_agent(agent, "worker", "test", [])
+        
+        task_ids = [
+            await manager.submit_task("worker", "step", {"name": name}, priority=priority)
+            for name, priority in [("low", 0), ("high", 5), ("medium", 2)]
+        ]
+        await manager.start()
+        await self._wait_for(manager, task_ids)
+        await manager.stop()
+        
+        assert agent.order == ["high", "medium", "low"]
+        assert agent.max_in_flight == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test that independent tasks run concurrently up to the limit."""
+        manager = AgentManager(max_concurrent_tasks=3)
+        agent = self.RecordingAgent(delay=0.05)
+        manager.register_agent(agent, "worker", "test", [])
+        await manager.start()
+        
+        task_ids = [
+            await manager.submit_task("worker", "step", {"name": str(i)})
+            for i in range(8)
+        ]
+        await self._wait_for(manager, task_ids)
+        await manager.stop()
+        
+        assert agent.max_in_flight == 3
+        assert sorted(agent.order) == sorted(str(i) for i in range(8))
+    
+    @pytest.mark.asyncio
+    async def test_failure_cascades_cancellation(self):
+        """Test that dependents of a failed task are cancelled transitively."""
+        manager = AgentManager()
+        agent = self.RecordingAgent()
+        manager.register_agent(agent, "worker", "test", [])
+        await manager.start()
+        
+        failing = await manager.submit_task("worker", "step", {"name": "x", "fail": True})
+        child = await manager.submit_task("worker", "step", {"name": "y"}, dependencies=[failing])
+        grandchild = await manager.submit_task("worker", "step", {"name": "z"}, dependencies=[child])
+        independent = await manager.submit_task("worker", "step", {"name": "w"})
+        await self._wait_for(manager, [failing, child, grandchild, independent])
+        
+        # A task submitted after the failure is cancelled straight away
+        late = await manager.submit_task("worker", "step", {"name": "v"}, dependencies=[failing])
+        await manager.stop()
+        
+        assert manager.tasks[failing].status == TaskStatus.FAILED
+        assert manager.tasks[child].status == TaskStatus.CANCELLED
+        assert manager.tasks[grandchild].status == TaskStatus.CANCELLED
+        assert manager.tasks[late].status == TaskStatus.CANCELLED
+        assert manager.tasks[independent].status == TaskStatus.COMPLETED
+        assert agent.order == ["w"]
+    
+    @pytest.mark.asyncio
+    async def test_cancelling_pending_task_cancels_dependents(self):
+        """Test that cancelling a queued task releases its slot and dependents."""
+        manager = AgentManager(max_concurrent_tasks=1)
+        agent = self.RecordingAgent()
+        manager.register_agent(agent, "worker", "test", [])
+        
+        parent = await manager.submit_task("worker", "step", {"name": "parent"})
+        child = await manager.submit_task("worker", "step", {"name": "child"}, dependencies=[parent])
+        other = await manager.submit_task("worker", "step", {"name": "other"})
+        assert await manager.cancel_task(parent)
+        
+        await manager.start()
+        await self._wait_for(manager, [child, other])
+        await manager.stop()
+        
+        assert manager.tasks[child].status == TaskStatus.CANCELLED
+        assert agent.order == ["other"]
+
+
+class TestAgentPools:
+    """Test per-agent-type pools and work-stealing."""
+    
+    class SlowAgent:
+        """Agent that records which instance ran each task."""
+        
+        def __init__(self, name, log, delay=0.05):
+            self.name = name
+            self.log = log
+            self.delay = delay
+        
+        async def execute_task(self, task_type, payload):
+            self.log.append((self.name, payload["name"]))
+            await asyncio.sleep(self.delay)
+            return self.name
+    
+    async def _wait_for(self, manager, task_ids, timeout=5.0):
+        """Wait until the given tasks have all completed."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not all(manager.tasks[t].status == TaskStatus.COMPLETED for t in task_ids):
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.005)
+    
+    async def _wait_for_pool(self, manager, agent_type, completed, timeout=5.0):
+        """Wait until a pool has counted the given number of completed tasks."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while manager.get_stats()["pools"][agent_type]["completed"] < completed:
+            assert asyncio.get_running_loop().time() < deadline
+            await asyncio.sleep(0.005)
+    
+    @pytest.mark.asyncio
+    async def test_idle_instance_steals_queued_task(self):
+        """Test that an idle instance runs tasks queued for a busy sibling."""
+        manager = AgentManager()
+        log = []
+        manager.register_agent(self.SlowAgent("w1", log), "writer_1", "writer", [], max_concurrent_tasks=1)
+        manager.register_agent(self.SlowAgent("w2", log), "writer_2", "writer", [], max_concurrent_tasks=1)
+        await manager.start()
+        
+        task_ids = [
+            await manager.submit_task("writer_1", "draft", {"name": str(i)})
+            for i in range(4)
+        ]
+        await self._wait_for_pool(manager, "writer", completed=len(task_ids))
+        stats = manager.get_stats()
+        await manager.stop()
+        
+        assert {agent for agent, _ in log} == {"w1", "w2"}
+        assert stats["pools"]["writer"]["stolen"] >= 1
+        assert stats["pools"]["writer"]["running"] == 0
+        assert stats["pools"]["writer"]["completed"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_pool_limit_prevents_starvation(self):
+        """Test that a saturated pool does not block another agent type."""
+        manager = AgentManager(max_concurrent_tasks=4, pool_limits={"research": 2})
+        log = []
+        manager.register_agent(self.SlowAgent("r", log, delay=0.2), "research_agent", "research", [])
+        manager.register_agent(self.SlowAgent("w", log, delay=0.01), "writer_agent", "writer", [])
+        await manager.start()
+        
+        research = [
+            await manager.submit_task("research_agent", "sweep", {"name": f"r{i}"}, priority=5)
+            for i in range(6)
+        ]
+        await asyncio.sleep(0.02)
+        stats = manager.get_stats()["pools"]
+        draft = await manager.submit_task("writer_agent", "draft", {"name": "d"})
+        await self._wait_for(manager, [draft], timeout=0.15)
+        
+        assert stats["research"]["running"] == 2
+        assert stats["research"]["capacity"] == 2
+        assert stats["research"]["utilisation"] == 1.0
+        assert stats["research"]["queued"] == 4
+        # The draft finished while earlier research tasks were still queued or running
+        assert any(manager.tasks[t].status != TaskStatus.COMPLETED for t in research)
+        await manager.stop()
+    
+    @pytest.mark.asyncio
+    async def test_instance_concurrency_and_type_submission(self):
+        """Test several tasks per instance and submitting to an agent type."""
+        manager = AgentManager()
+        log = []
+        manager.register_agent(self.SlowAgent("t", log), "tool_agent", "tool", [], max_concurrent_tasks=3)
+        await manager.start()
+        
+        task_ids = [
+            await manager.submit_task("tool", "run", {"name": str(i)})
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.02)
+        info = manager.get_agent_status("tool_agent")
+        assert info.active_tasks == 3
+        assert info.status == AgentStatus.BUSY
+        
+        await self._wait_for(manager, task_ids)
+        await asyncio.sleep(0)
+        await manager.stop()
+        
+        assert all(manager.tasks[t].agent_id == "tool_agent" for t in task_ids)
+        assert manager.get_agent_status("tool_agent").status == AgentStatus.IDLE
+
+
+
+class TestAuditTrail:
+    """Test the agent manager's audit log integration."""
+    
+    @pytest.mark.asyncio
+    async def test_audit_log_is_bounded_and_queryable(self, tmp_path):
+        """Test that the persistent audit log answers filtered queries."""
+        from audit_log import AuditLog
+        
+        manager = AgentManager(audit_log=AuditLog.with_store(tmp_path, max_entries=5))
+        agent = Mock()
+        agent.execute_task = AsyncMock(return_value="done")
+        manager.register_agent(agent, "worker", "test", [])
+        await manager.start()
+        
+        task_ids = [await manager.submit_task("worker", "step", {}) for _ in range(5)]
+        while not all(manager.tasks[t].status == TaskStatus.COMPLETED for t in task_ids):
+            await asyncio.sleep(0.005)
+        await manager.stop()
+        
+        assert len(manager.get_audit_log(limit=100)) == 5
+        history = await manager.query_audit_log(task_id=task_ids[0])
+        assert [entry["event_type"] for entry in history] == ["task_submitted", "task_completed"]
+        assert len(await manager.query_audit_log(event_type="task_completed")) == 5
+        assert len(await manager.query_audit_log(agent_id="worker", limit=100)) == 11
+        manager.audit_log.close()
@@ -0,0 +1,99 @@
+"""
+Unit tests for the AuditLog module.
+"""
+import threading
+from datetime import datetime, timedelta
+
+from audit_log import AuditLog, SQLiteAuditStore
+
+
+class TestAuditLog:
+    """Test cases for AuditLog functionality."""
+
+    def test_memory_tail_is_bounded(self):
+        """Test that the in-memory log keeps only the newest events."""
+        log = AuditLog(max_entries=3)
+
+        for i in range(10):
+            log.append("task_submitted", {"task_id": f"t{i}"})
+
+        assert len(log) == 3
+        assert [entry["task_id"] for entry in log.tail(10)] == ["t7", "t8", "t9"]
+        assert [entry["task_id"] for entry in log.tail(2)] == ["t8", "t9"]
+
+    def test_memory_query_filters(self):
+        """Test filtering the in-memory tail without a store."""
+        log = AuditLog()
+        log.append("task_submitted", {"task_id": "a", "agent_id": "writer"})
+        log.append("task_completed", {"task_id": "a", "agent_id": "writer"})
+        log.append("task_submitted", {"task_id": "b", "agent_id": "editor"})
+
+        assert len(log.query(task_id="a")) == 2
+        assert [e["task_id"] for e in log.query(event_type="task_submitted")] == ["a", "b"]
+        assert log.query(agent_id="editor")[0]["task_id"] == "b"
+        assert log.query(since=datetime.now() + timedelta(hours=1)) == []
+
+    def test_persistent_queries_survive_restart(self, tmp_path):
+        """Test that events outlive the ring buffer and the process."""
+        log = AuditLog.with_store(tmp_path, max_entries=2)
+        started = datetime.now()
+        for i in range(20):
+            log.append("task_completed" if i % 2 else "task_submitted",
+                       {"task_id": f"t{i % 5}", "agent_id": f"agent{i % 2}"})
+        log.close()
+
+        reopened = AuditLog.with_store(tmp_path)
+        try:
+            assert len(reopened) == 0
+            by_task = reopened.query(task_id="t3")
+            assert len(by_task) == 4
+            assert all(entry["data"]["task_id"] == "t3" for entry in by_task)
+            assert len(reopened.query(agent_id="agent1", event_type="task_completed")) == 10
+            assert len(reopened.query(since=started, until=datetime.now(), limit=1000)) == 20
+            assert [e["task_id"] for e in reopened.query(limit=3)] == ["t2", "t3", "t4"]
+        finally:
+            reopened.close()
+
+    def test_store_rotates_by_size(self, tmp_path):
+        """Test that the store rotates files and queries span them."""
+        store = SQLiteAuditStore(tmp_path, max_bytes=20 * 1024, backup_count=2)
+        payload = "x" * 500
+        for batch in range(30):
+            store.write([
+                {"timestamp": datetime.now().isoformat(), "event_type": "task_completed",
+                 "task_id": f"t{batch}", "agent_id": "a", "data": {"payload": payload}}
+                for _ in range(10)
+            ])
+
+        assert (tmp_path / "audit_log.1.sqlite").exists()
+        assert not (tmp_path / "audit_log.3.sqlite").exists()
+        assert len(store.query(task_id="t29", limit=100)) == 10
+        assert len(store.query(limit=1000)) < 300
+        store.close()
+
+    def test_append_does_not_wait_for_store(self, tmp_path):
+        """Test that appends are queued and flushed in the background."""
+        log = AuditLog.with_store(tmp_path)
+        for i in range(500):
+            log.append("task_submitted", {"task_id": str(i)})
+        log.flush()
+
+        assert len(log.store.query(limit=1000)) == 500
+        log.close()
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        """Test that a stalled writer does not block appends."""
+        log = AuditLog.with_store(tmp_path, max_queue_size=2)
+        release = threading.Event()
+        write = log.store.write
+        log.store.write = lambda entries: (release.wait(5), write(entries))
+
+        for i in range(10):
+            log.append("task_submitted", {"task_id": str(i)})
+        assert log.dropped_writes > 0
+        assert len(log) == 10
+
+        release.set()
+        log.flush()
+        assert len(log.store.query(limit=1000)) == 10 - log.dropped_writes
+        log.close()
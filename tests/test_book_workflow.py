@@ -0,0 +1,144 @@
+"""
+Unit tests for BookWorkflow chapter scheduling.
+"""
+import asyncio
+import sys
+import types
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+try:
+    import book_builder  # noqa: F401
+except ImportError:
+    # The book_builder/ package shadows book_builder.py and cannot be imported
+    # on its own; the workflow only needs the name, as the tests inject a mock
+    sys.modules["book_builder"] = types.SimpleNamespace(BookBuilder=Mock)
+    from book_workflow import BookMetadata, BookWorkflow
+    del sys.modules["book_builder"]
+else:
+    from book_workflow import BookMetadata, BookWorkflow
+
+
+class TestConcurrentChapterGeneration:
+    """Test dependency-ordered concurrent chapter generation."""
+    
+    def _make_workflow(self, max_concurrent_chapters, delay=0.05):
+        """Create a workflow whose agents take a fixed time per call."""
+        state = {"in_flight": 0, "max_in_flight": 0, "prompts": {}}
+        
+        async def write_chapter(chapter_title, writing_prompt, target_word_count, context_chunks):
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+            state["prompts"][chapter_title] = writing_prompt
+            # Later chapters finish first to scramble completion order
+            await asyncio.sleep(delay / (len(state["prompts"]) or 1))
+            state["in_flight"] -= 1
+            return {"content": f"{chapter_title} text", "references_used": [], "retrieval_scores": []}
+        
+        async def revise_chapter(chapter_title, content, revision_focus):
+            return {"revised_content": content, "revision_notes": []}
+        
+        research_agent = Mock()
+        research_agent.start_research = AsyncMock(return_value="topic")
+        research_agent.get_research_results = AsyncMock(return_value=[])
+        research_agent.get_research_summary = AsyncMock(return_value=None)
+        writer_agent = Mock()
+        writer_agent.write_chapter = write_chapter
+        editor_agent = Mock()
+        editor_agent.revise_chapter = revise_chapter
+        memory_manager = Mock()
+        memory_manager.add_memory = AsyncMock()
+        
+        workflow = BookWorkflow(
+            memory_manager=memory_manager,
+            llm_client=Mock(),
+            tool_manager=Mock(),
+            agent_manager=Mock(),
+            research_agent=research_agent,
+            writer_agent=writer_agent,
+            editor_agent=editor_agent,
+            tool_agent=Mock(),
+            book_builder=Mock(),
+            max_concurrent_chapters=max_concurrent_chapters
+        )
+        workflow.current_book = BookMetadata("Test Book", "Testing")
+        workflow.current_book.outline = {
+            "introduction": {"title": "Intro", "key_points": ["Why"]},
+            "chapters": [
+                {"chapter_number": i, "title": f"Chapter {i}", "key_points": [f"Point {i}"]}
+                for i in range(1, 7)
+            ],
+            "conclusion": {"title": "Outro", "key_points": ["Wrap up"]}
+        }
+        return workflow, state
+    
+    def test_invalid_width(self):
+        """Test that a concurrency width below one is rejected."""
+        with pytest.raises(ValueError):
+            self._make_workflow(0)
+    
+    @pytest.mark.asyncio
+    async def test_chapters_run_concurrently_in_order(self):
+        """Test bounded parallelism with deterministic assembly order."""
+        workflow, state = self._make_workflow(max_concurrent_chapters=3)
+        
+        await workflow._generate_chapters()
+        
+        numbers = [chapter.chapter_number for chapter in workflow.current_book.chapters]
+        assert numbers == [0, 1, 2, 3, 4, 5, 6, 999]
+        assert state["max_in_flight"] == 3
+        
+        # The conclusion only starts once every chapter is written
+        conclusion_prompt = state["prompts"]["Outro"]
+        assert all(f"Chapter {i} text" in conclusion_prompt for i in range(1, 7))
+        
+        # Each chapter gets the outline of the chapters before it
+        chapter_prompt = state["prompts"]["Chapter 5"]
+        assert "Chapter 4" in chapter_prompt and "Point 4" in chapter_prompt
+        assert "Next chapter: Chapter 6" in chapter_prompt
+    
+    @pytest.mark.asyncio
+    async def test_unnumbered_chapters_keep_outline_order(self):
+        """Test that chapters without a number are assembled in outline order."""
+        workflow, state = self._make_workflow(max_concurrent_chapters=3)
+        for chapter in workflow.current_book.outline["chapters"]:
+            del chapter["chapter_number"]
+        
+        await workflow._generate_chapters()
+        
+        titles = [chapter.title for chapter in workflow.current_book.chapters]
+        assert titles == ["Intro"] + [f"Chapter {i}" for i in range(1, 7)] + ["Outro"]
+        numbers = [chapter.chapter_number for chapter in workflow.current_book.chapters]
+        assert numbers == [0, 1, 2, 3, 4, 5, 6, 999]
+    
+    @pytest.mark.asyncio
+    async def test_sequential_mode_unchanged(self):
+        """Test that the default width keeps one chapter at a time."""
+        workflow, state = self._make_workflow(max_concurrent_chapters=1)
+        
+        await workflow._generate_chapters()
+        
+        numbers = [chapter.chapter_number for chapter in workflow.current_book.chapters]
+        assert numbers == [0, 1, 2, 3, 4, 5, 6, 999]
+        assert state["max_in_flight"] == 1
+        assert "Chapter 4: Chapter 4" in state["prompts"]["Chapter 5"]
+    
+    @pytest.mark.asyncio
+    async def test_failure_cancels_remaining_chapters(self):
+        """Test that one failed chapter stops the others and propagates."""
+        workflow, state = self._make_workflow(max_concurrent_chapters=2)
+        original = workflow.writer_agent.write_chapter
+        
+        async def failing_write(chapter_title, **kwargs):
+            if chapter_title == "Chapter 2":
+                raise RuntimeError("draft failed")
+            return await original(chapter_title, **kwargs)
+        
+        workflow.writer_agent.write_chapter = failing_write
+        
+        with pytest.raises(RuntimeError):
+            await workflow._generate_chapters()
+        
+        assert "Outro" not in state["prompts"]
+        assert len(workflow.current_book.chapters) < 7
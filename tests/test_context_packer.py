@@ -0,0 +1,197 @@
+"""
+Unit tests for the ContextPacker module.
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import context_packer
+from context_packer import ContextPacker, TokenCountCache, default_token_counter, mmr_order
+
+SOURCE = (
+    "The Fool stands at the edge of a cliff. He carries a small bag and a white rose. "
+    "A dog jumps at his heels, warning or urging him on. The sun rises behind him."
+)
+
+
+def word_count(text):
+    return len(text.split())
+
+
+def chunk(chunk_id, content, score, source_id="deck", filename="deck.pdf", **metadata):
+    metadata = {"original_filename": filename, **{k: str(v) for k, v in metadata.items()}}
+    return SimpleNamespace(
+        chunk_id=chunk_id, content=content, source_id=source_id, score=score, metadata=metadata
+    )
+
+
+def span(chunk_id, start, end, score, index):
+    return chunk(chunk_id, SOURCE[start:end], score, start_char=start, end_char=end, chunk_index=index)
+
+
+def packer(**kwargs):
+    kwargs.setdefault("token_counter", word_count)
+    kwargs.setdefault("min_partial_tokens", 3)
+    return ContextPacker(**kwargs)
+
+
+class TestMMROrder:
+    """Test cases for maximal-marginal-relevance ordering."""
+
+    def test_near_duplicates_are_demoted(self):
+        """Test that a distinct chunk outranks a near-copy of the first pick."""
+        embeddings = np.array([[1.0, 0.0], [0.99, 0.1], [0.0, 1.0]])
+        order = mmr_order([0.9, 0.89, 0.6], embeddings, lambda_mult=0.5, duplicate_threshold=None)
+        assert order == [0, 2, 1]
+
+    def test_duplicates_above_threshold_are_dropped(self):
+        """Test the duplicate cut-off."""
+        embeddings = np.array([[1.0, 0.0], [1.0, 0.001], [0.0, 1.0]])
+        assert mmr_order([0.9, 0.89, 0.6], embeddings, duplicate_threshold=0.95) == [0, 2]
+
+    def test_without_embeddings_orders_by_relevance(self):
+        """Test the fallback ordering."""
+        assert mmr_order([0.2, 0.9, 0.5]) == [1, 2, 0]
+
+
+class TestContextPacker:
+    """Test cases for ContextPacker functionality."""
+
+    def test_budget_is_exact(self):
+        """Test that the packed context never exceeds the budget."""
+        results = [chunk(f"c{i}", "word " * 20, 1.0 - i / 10) for i in range(5)]
+        packed = packer(merge_adjacent=False).pack(results, max_tokens=50)
+
+        assert packed.token_count == word_count(packed.text)
+        assert packed.token_count <= 50
+        assert [r.chunk_id for r in packed.results][:2] == ["c0", "c1"]
+
+    def test_smaller_chunks_fill_space_after_a_large_one(self):
+        """Test that one oversized chunk does not end packing."""
+        results = [
+            chunk("small_1", "one two three", 0.9, source_id="a"),
+            chunk("large", "word " * 100, 0.8, source_id="b"),
+            chunk("small_2", "four five six", 0.7, source_id="c"),
+        ]
+        packed = packer(min_partial_tokens=1000).pack(results, max_tokens=20)
+
+        assert [r.chunk_id for r in packed.results] == ["small_1", "small_2"]
+
+    def test_partial_chunk_is_cut_at_a_sentence(self):
+        """Test that truncation keeps whole sentences."""
+        results = [chunk("c", SOURCE, 0.9)]
+        packed = packer().pack(results, max_tokens=22)
+
+        assert packed.text == "[Source: deck.pdf]\nThe Fool stands at the edge of a cliff. He carries a small bag and a white rose."
+        assert packed.token_count <= 22
+
+    def test_partial_chunk_falls_back_to_words(self):
+        """Test truncation at a word boundary when no sentence fits."""
+        packed = packer().pack([chunk("c", SOURCE, 0.9)], max_tokens=6)
+        assert packed.text == "[Source: deck.pdf]\nThe Fool stands at..."
+
+    def test_overlapping_neighbours_are_merged(self):
+        """Test that overlapping chunks of a source become one passage without repeats."""
+        results = [span("c0", 0, 80, 0.9, 0), span("c1", 60, 150, 0.8, 1)]
+        packed = packer().pack(results, max_tokens=1000)
+
+        assert packed.text == f"[Source: deck.pdf]\n{SOURCE[:150]}"
+        assert [r.chunk_id for r in packed.results] == ["c0", "c1"]
+
+    def test_bridging_chunk_joins_two_passages(self):
+        """Test that a chunk linking two chosen passages merges them."""
+        results = [span("c0", 0, 40, 0.9, 0), span("c2", 81, 123, 0.8, 2), span("c1", 35, 85, 0.7, 1)]
+        packed = packer().pack(results, max_tokens=1000)
+
+        assert packed.text == f"[Source: deck.pdf]\n{SOURCE[:123]}"
+        assert [r.chunk_id for r in packed.results] == ["c0", "c1", "c2"]
+
+    def test_merging_leaves_room_for_more_evidence(self):
+        """Test that overlap saved by merging is spent on other chunks."""
+        results = [
+            span("c0", 0, 80, 0.9, 0),
+            span("c1", 60, 150, 0.8, 1),
+            chunk("other", "Cups signify emotion", 0.5, source_id="other"),
+        ]
+        budget = word_count(f"[Source: deck.pdf]\n{SOURCE[:150]}\n\n[Source: deck.pdf]\nCups signify emotion")
+
+        merged = packer().pack(results, max_tokens=budget)
+        unmerged = packer(merge_adjacent=False, min_partial_tokens=1000).pack(results, max_tokens=budget)
+
+        assert [r.chunk_id for r in merged.results] == ["c0", "c1", "other"]
+        assert len(unmerged.results) < 3
+
+    def test_near_duplicates_do_not_crowd_out_evidence(self):
+        """Test that MMR spends the budget on distinct chunks."""
+        results = [
+            chunk("fool_a", "The Fool begins the journey", 0.9, source_id="a"),
+            chunk("fool_b", "The Fool begins his journey", 0.88, source_id="b"),
+            chunk("cups", "Cups signify emotion and water", 0.6, source_id="c"),
+        ]
+        embeddings = np.array([[1.0, 0.0], [0.999, 0.02], [0.2, 1.0]])
+        budget = 2 * word_count("[Source: deck.pdf]\nThe Fool begins the journey") + 1
+
+        packed = packer(min_partial_tokens=1000).pack(results, max_tokens=budget, embeddings=embeddings)
+
+        assert [r.chunk_id for r in packed.results] == ["fool_a", "cups"]
+
+    def test_token_counts_are_cached(self):
+        """Test that packing the same chunks again hits the cache."""
+        calls = []
+
+        def counting(text):
+            calls.append(text)
+            return word_count(text)
+
+        results = [chunk(f"c{i}", f"chunk number {i}", 0.9, source_id=f"s{i}") for i in range(3)]
+        context_packer = ContextPacker(token_counter=counting)
+        context_packer.pack(results, max_tokens=100)
+        first_calls = len(calls)
+        context_packer.pack(results, max_tokens=100)
+
+        assert len(calls) == first_calls
+        assert context_packer.get_stats()["hits"] > 0
+
+    def test_invalid_lambda(self):
+        """Test that mmr_lambda is validated."""
+        with pytest.raises(ValueError):
+            ContextPacker(token_counter=word_count, mmr_lambda=1.5)
+
+
+class TestDefaultTokenCounter:
+    """Test cases for the default token counter."""
+
+    def test_failed_encoding_load_falls_back(self, monkeypatch):
+        """Test that an encoding that cannot be loaded (e.g. offline) degrades to the estimate."""
+        calls = []
+
+        def unavailable(encoding_name="cl100k_base"):
+            calls.append(encoding_name)
+            raise ConnectionError("encoding download failed")
+
+        monkeypatch.setattr(context_packer, "tiktoken_token_counter", unavailable)
+        counter = default_token_counter()
+        packer = ContextPacker()
+        assert calls == []
+
+        assert counter("abcd" * 10) == 10
+        assert packer.count_tokens("abcd" * 10) == 10
+        counter("more text")
+        assert calls == ["cl100k_base", "cl100k_base"]
+
+
+class TestTokenCountCache:
+    """Test cases for the token-count cache."""
+
+    def test_lru_eviction(self):
+        """Test that the cache is bounded."""
+        cache = TokenCountCache(word_count, max_entries=2)
+        cache.count("a b")
+        cache.count("c")
+        cache.count("a b")
+        cache.count("d e f")
+
+        assert cache.get_stats() == {"hits": 1, "misses": 3, "entries": 2}
+        cache.count("c")
+        assert cache.get_stats()["misses"] == 4
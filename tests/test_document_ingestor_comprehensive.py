@@ -718,6 +718,293 @@ class TestPerformance:
             os.unlink(tmp_file.name)
 
 
+class TestIncrementalSync:
+    """Test manifest-driven directory synchronization."""
+
+    @pytest.fixture
+    def ingestor(self):
+        """Create document ingestor instance."""
+        return DocumentIngestor()
+
+    @pytest.fixture
+    def memory_manager(self):
+        """Create a mock memory manager that echoes stored chunk IDs."""
+        manager = Mock()
+
+        async def store(metadata, chunks, agent_id=None):
+            return [chunk.chunk_id for chunk in chunks]
+
+        async def delete(chunk_ids, source_id="", agent_id=None):
+            return len(chunk_ids)
+
+        manager.store_document_chunks = Mock(side_effect=store)
+        manager.delete_chunks = Mock(side_effect=delete)
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_sync_skips_updates_and_purges(self, ingestor, memory_manager):
+        """Test that only new, changed and deleted files do work."""
+        from ingestion_manifest import IngestionManifest
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            docs = Path(temp_dir) / "docs"
+            docs.mkdir()
+            (docs / "a.txt").write_text("Alpha document content.")
+            (docs / "b.md").write_text("# Beta\n\nBeta document content.")
+            manifest = IngestionManifest(Path(temp_dir) / "manifest.json")
+
+            report = await ingestor.sync_directory(docs, memory_manager, manifest)
+            assert len(report["added"]) == 2
+            assert memory_manager.store_document_chunks.call_count == 2
+
+            report = await ingestor.sync_directory(docs, memory_manager, manifest)
+            assert len(report["unchanged"]) == 2
+            assert memory_manager.store_document_chunks.call_count == 2
+
+            old_chunk_ids = manifest.get(docs / "a.txt").chunk_ids
+            (docs / "a.txt").write_text("Alpha document content, revised and extended.")
+            (docs / "b.md").unlink()
+
+            report = await ingestor.sync_directory(docs, memory_manager, manifest)
+            assert len(report["updated"]) == 1
+            assert len(report["removed"]) == 1
+            deleted = [call.args[0] for call in memory_manager.delete_chunks.call_args_list]
+            assert old_chunk_ids in deleted
+            assert manifest.get(docs / "b.md") is None
+
+
+class TestStreamingPdfIngestion:
+    """Test page-by-page PDF chunking and streaming storage."""
+
+    @pytest.fixture
+    def ingestor(self):
+        """Create document ingestor with small chunks."""
+        return DocumentIngestor(chunk_size=120, chunk_overlap=30)
+
+    @pytest.fixture
+    def pages(self):
+        """Create page texts where sentences cross page boundaries."""
+        return [
+            (1, "The first page opens the book. It ends mid"),
+            (2, "sentence and keeps going. " + "Filler sentence on page two. " * 4),
+            (3, "The final page closes the book."),
+        ]
+
+    def test_page_chunks_match_joined_text(self, ingestor, pages):
+        """Test that streamed chunks equal chunks of the concatenated pages."""
+        joined = "\n".join(text for _, text in pages)
+        expected = asyncio.run(ingestor._chunk_content(joined, "src"))
+        streamed = list(ingestor._iter_page_chunks(pages, "src"))
+
+        assert [c.content for c in streamed] == [c.content for c in expected]
+        for chunk in streamed:
+            assert joined[chunk.start_char:chunk.end_char] == chunk.content
+        assert streamed[0].metadata["page_start"] == "1"
+        assert streamed[0].metadata["page_end"] == "2"
+        assert streamed[-1].metadata["page_end"] == "3"
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_stored_before_last_page_is_read(self, ingestor, pages):
+        """Test that storage starts while pages are still being parsed."""
+        events = []
+
+        def read_pages(file_path):
+            for page_number, text in pages:
+                events.append(f"page {page_number}")
+                yield page_number, text
+
+        async def store(metadata, chunks, agent_id=None):
+            events.append("store")
+            return [chunk.chunk_id for chunk in chunks]
+
+        memory_manager = Mock()
+        memory_manager.store_document_chunks = Mock(side_effect=store)
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(b"%PDF-1.4")
+            pdf_path = f.name
+
+        try:
+            with patch.object(ingestor, "_iter_pdf_pages", side_effect=read_pages):
+                metadata, chunk_ids = await ingestor.ingest_document_streaming(
+                    pdf_path, memory_manager, batch_size=1
+                )
+        finally:
+            os.unlink(pdf_path)
+
+        assert metadata.chunk_count == len(chunk_ids) > 1
+        assert events.index("store") < events.index("page 3")
+
+    @pytest.mark.asyncio
+    async def test_streaming_reports_words_and_partially_stored_chunks(self, ingestor, pages):
+        """Test the word count and that chunks stored before a failure are reported."""
+        async def store(metadata, chunks, agent_id=None):
+            return [chunk.chunk_id for chunk in chunks]
+
+        memory_manager = Mock()
+        memory_manager.store_document_chunks = Mock(side_effect=store)
+
+        def failing_pages(file_path):
+            yield from pages[:2]
+            raise IOError("truncated file")
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(b"%PDF-1.4")
+            pdf_path = f.name
+
+        try:
+            with patch.object(ingestor, "_iter_pdf_pages", side_effect=lambda path: iter(pages)):
+                metadata, chunk_ids = await ingestor.ingest_document_streaming(
+                    pdf_path, memory_manager, batch_size=1
+                )
+            stored = []
+            with patch.object(ingestor, "_iter_pdf_pages", side_effect=failing_pages):
+                with pytest.raises(IOError):
+                    await ingestor.ingest_document_streaming(
+                        pdf_path, memory_manager, batch_size=1, stored_chunk_ids=stored
+                    )
+        finally:
+            os.unlink(pdf_path)
+
+        expected = list(ingestor._iter_page_chunks(pages, metadata.source_id))
+        assert metadata.word_count == sum(chunk.word_count for chunk in expected)
+        assert stored and set(stored) < set(chunk_ids)
+
+
+class TestParallelIngestion:
+    """Test process-pool directory ingestion."""
+
+    @pytest.fixture
+    def ingestor(self):
+        """Create document ingestor instance."""
+        return DocumentIngestor()
+
+    @pytest.mark.asyncio
+    async def test_parallel_ingestion_reports_progress_and_skips_failures(self, ingestor):
+        """Test that every file is reported and a bad file does not stop the run."""
+        memory_manager = Mock()
+
+        async def store(metadata, chunks, agent_id=None):
+            return [chunk.chunk_id for chunk in chunks]
+
+        memory_manager.store_document_chunks = Mock(side_effect=store)
+        progress = []
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            docs = Path(temp_dir)
+            (docs / "a.txt").write_text("Alpha document content.")
+            (docs / "b.md").write_text("# Beta\n\nBeta document content.")
+            (docs / "broken.pdf").write_bytes(b"not a pdf")
+
+            results = await ingestor.ingest_directory_parallel(
+                docs,
+                memory_manager=memory_manager,
+                max_workers=2,
+                progress_callback=lambda *args: progress.append(args)
+            )
+
+        assert len(results) == 2
+        assert memory_manager.store_document_chunks.call_count == 2
+        assert [entry[2] for entry in progress] == [1, 2, 3]
+        statuses = {Path(entry[0]).name: entry[1] for entry in progress}
+        assert statuses == {"a.txt": "ingested", "b.md": "ingested", "broken.pdf": "failed"}
+
+    @pytest.mark.asyncio
+    async def test_parallel_ingestion_bounds_documents_awaiting_storage(self, ingestor):
+        """Test that parsing stays a bounded distance ahead of a slow storage stage."""
+        memory_manager = Mock()
+        started = []
+
+        async def store(metadata, chunks, agent_id=None):
+            await asyncio.sleep(0.01)
+            return [chunk.chunk_id for chunk in chunks]
+
+        original = ingestor.ingest_document
+
+        async def ingest_document(file_path, *args, **kwargs):
+            started.append(file_path)
+            return await original(file_path, *args, **kwargs)
+
+        memory_manager.store_document_chunks = Mock(side_effect=store)
+        ingestor.ingest_document = ingest_document
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            docs = Path(temp_dir)
+            for i in range(12):
+                (docs / f"doc_{i:02d}.txt").write_text(f"Document {i} content.")
+
+            stored = []
+            memory_manager.store_document_chunks.side_effect = lambda *args, **kwargs: (
+                stored.append(len(started)) or store(*args, **kwargs)
+            )
+            results = await ingestor.ingest_directory_parallel(
+                docs, memory_manager=memory_manager, max_workers=1
+            )
+
+        assert len(results) == 12
+        # With one worker, at most one document is parsed ahead of the one being stored
+        assert all(count <= index + 1 for index, count in enumerate(stored, start=1))
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_token_counter_parses_in_process(self):
+        """Test that a lambda token counter does not make every PDF fail in the pool."""
+        ingestor = DocumentIngestor(token_counter=lambda text: len(text.split()))
+        parsed = []
+
+        async def ingest_document(file_path, *args, **kwargs):
+            parsed.append(Path(file_path).name)
+            return Mock(), []
+
+        ingestor.ingest_document = ingest_document
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            docs = Path(temp_dir)
+            (docs / "report.pdf").write_bytes(b"%PDF-1.4")
+            (docs / "notes.txt").write_text("Notes.")
+
+            results = await ingestor.ingest_directory_parallel(docs, max_workers=2)
+
+        assert len(results) == 2
+        assert sorted(parsed) == ["notes.txt", "report.pdf"]
+
+    @pytest.mark.asyncio
+    async def test_parallel_ingestion_keeps_manifest_up_to_date(self, ingestor):
+        """Test that a full ingest records files, replaces old chunks and purges deleted sources."""
+        from ingestion_manifest import IngestionManifest
+
+        memory_manager = Mock()
+
+        async def store(metadata, chunks, agent_id=None):
+            return [chunk.chunk_id for chunk in chunks]
+
+        async def delete(chunk_ids, source_id="", agent_id=None):
+            return len(chunk_ids)
+
+        memory_manager.store_document_chunks = Mock(side_effect=store)
+        memory_manager.delete_chunks = Mock(side_effect=delete)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            docs = Path(temp_dir) / "docs"
+            docs.mkdir()
+            (docs / "kept.txt").write_text("Kept document content.")
+            (docs / "gone.txt").write_text("Document that will be deleted.")
+            manifest = IngestionManifest(Path(temp_dir) / "manifest.json")
+
+            await ingestor.ingest_directory_parallel(docs, memory_manager, max_workers=1, manifest=manifest)
+            first = manifest.get(docs / "kept.txt")
+            gone = manifest.get(docs / "gone.txt")
+            assert first is not None and gone is not None
+
+            (docs / "gone.txt").unlink()
+            await ingestor.ingest_directory_parallel(docs, memory_manager, max_workers=1, manifest=manifest)
+
+            reloaded = IngestionManifest(Path(temp_dir) / "manifest.json")
+            assert reloaded.get(docs / "gone.txt") is None
+            assert reloaded.get(docs / "kept.txt").chunk_ids == first.chunk_ids
+            deleted = [call.args[0] for call in memory_manager.delete_chunks.call_args_list]
+            assert deleted == [first.chunk_ids, gone.chunk_ids]
+
+
 class TestIntegration:
     """Test integration with other components."""
     
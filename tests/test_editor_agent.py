@@ -0,0 +1,126 @@
+"""
+Unit tests for EditorAgent's windowed review.
+"""
+import asyncio
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from editor_agent import EditorAgent
+
+
+class FakeReviewClient:
+    """LLM stand-in that flags the word 'teh' in whatever text it reviews."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.reviewed = []
+
+    async def generate(self, prompt, max_tokens, temperature):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if "Rate the consistency" in prompt:
+            return SimpleNamespace(content="0.9")
+        if "Generate a brief summary" in prompt:
+            return SimpleNamespace(content="Summary")
+
+        text = prompt.split("Text to review:", 1)[1].split("Provide specific suggestions", 1)[0]
+        self.reviewed.append(text)
+        if "grammar and style" not in prompt or "teh" not in text:
+            return SimpleNamespace(content="No issues.")
+        return SimpleNamespace(content=(
+            "**Issue 1**\n"
+            "Severity: high\n"
+            "Original: teh\n"
+            "Suggested: the\n"
+            "Explanation: Typo\n"
+            f"Position: approximately {text.index('teh')}\n"
+        ))
+
+
+def make_chapter(sentences=120, typo_at=(5, 60, 115)):
+    """Build a long chapter with typos in a few sentences."""
+    return " ".join(
+        f"Sentence {i} mentions teh topic." if i in typo_at else f"Sentence {i} is perfectly fine."
+        for i in range(sentences)
+    )
+
+
+class TestWindowedReview:
+    """Test cases for concurrent windowed review."""
+
+    @pytest.mark.asyncio
+    async def test_whole_chapter_is_reviewed(self):
+        """Test that every part of a long chapter reaches a review prompt."""
+        client = FakeReviewClient(delay=0)
+        editor = EditorAgent("editor", client, window_size=600, window_overlap=100)
+        content = make_chapter()
+
+        report_id = await editor.review_content(content, "chapter_1")
+        report = await editor.get_edit_report(report_id)
+
+        assert len(content) > 3000
+        assert "Sentence 119" in "".join(client.reviewed)
+        positions = [s.position for s in report.suggestions]
+        assert positions == [m.start() for m in re.finditer("teh", content)]
+        assert all(content[p:p + 3] == "teh" for p in positions)
+        assert len({s.suggestion_id for s in report.suggestions}) == 3
+        assert report.statistics["word_count"] == len(content.split())
+        assert client.calls == len(editor.window_chunker.chunk_text(content)) * 4 + 1
+
+    @pytest.mark.asyncio
+    async def test_overlap_duplicates_are_merged(self):
+        """Test that an issue seen by two overlapping windows is reported once."""
+        client = FakeReviewClient(delay=0)
+        editor = EditorAgent("editor", client, window_size=300, window_overlap=150)
+        content = make_chapter(sentences=30, typo_at=(10,))
+
+        suggestions, _ = await editor._review_windows(content)
+
+        assert sum("teh" in text for text in client.reviewed) > 1
+        assert len(suggestions) == 1
+        assert suggestions[0].position == content.index("teh")
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently_within_limit(self):
+        """Test that checks overlap up to, but never beyond, the concurrency limit."""
+        client = FakeReviewClient(delay=0.05)
+        editor = EditorAgent("editor", client, window_size=600, window_overlap=0,
+                             max_concurrent_checks=10)
+        content = make_chapter()
+        windows = len(editor.window_chunker.chunk_text(content))
+
+        await editor._review_windows(content)
+
+        assert windows * 4 > 10
+        assert client.calls == windows * 4
+        assert client.max_in_flight == 10
+
+    @pytest.mark.asyncio
+    async def test_llm_consistency_scoring_is_opt_in(self):
+        """Test that LLM consistency scoring averages per-window ratings."""
+        client = FakeReviewClient(delay=0)
+        editor = EditorAgent("editor", client, window_size=600, window_overlap=100,
+                             use_llm_scoring=True)
+        content = make_chapter()
+
+        report = await editor.get_edit_report(await editor.review_content(content, "chapter_1"))
+
+        assert client.calls == len(editor.window_chunker.chunk_text(content)) * 5 + 1
+        assert report.consistency_score == pytest.approx(0.9)
+    
+    def test_parse_position(self):
+        """Test that approximate positions are read from free text."""
+        assert EditorAgent._parse_position("approximately 120") == 120
+        assert EditorAgent._parse_position("unknown") == 0
+        assert EditorAgent._parse_position(None) == 0
@@ -0,0 +1,79 @@
+"""
+Unit tests for the EmbeddingCache module.
+"""
+import pytest
+import tempfile
+from pathlib import Path
+
+from embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache functionality."""
+
+    @pytest.fixture
+    def cache_dir(self):
+        """Create a temporary cache directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    def test_keys_depend_on_model_and_text(self):
+        """Test that cache keys separate models and texts."""
+        key = EmbeddingCache.make_key("model-a", "hello")
+        assert key == EmbeddingCache.make_key("model-a", "hello")
+        assert key != EmbeddingCache.make_key("model-b", "hello")
+        assert key != EmbeddingCache.make_key("model-a", "hello!")
+
+    def test_miss_then_hit(self, cache_dir):
+        """Test that stored embeddings are served from memory."""
+        cache = EmbeddingCache(cache_dir)
+        assert cache.get_many("m", ["alpha"]) == [None]
+
+        cache.put_many("m", ["alpha"], [[0.5, 0.25]])
+        assert cache.get_many("m", ["alpha"]) == [[0.5, 0.25]]
+
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+
+    def test_disk_tier_survives_restart(self, cache_dir):
+        """Test that embeddings persist across cache instances."""
+        cache = EmbeddingCache(cache_dir)
+        cache.put_many("m", ["alpha", "beta"], [[1.0, 2.0], [3.0, 4.0]])
+        cache.close()
+
+        reopened = EmbeddingCache(cache_dir)
+        assert reopened.get_many("m", ["beta", "alpha"]) == [[3.0, 4.0], [1.0, 2.0]]
+        assert reopened.get_stats()["disk_hits"] == 2
+
+    def test_memory_tier_is_lru_bounded(self, cache_dir):
+        """Test that the memory tier evicts the least recently used entry."""
+        cache = EmbeddingCache(cache_dir, max_memory_entries=2)
+        cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+        cache.get_many("m", ["a"])
+        cache.put_many("m", ["c"], [[3.0]])
+
+        assert cache.get_stats()["memory_entries"] == 2
+        cache.get_many("m", ["b"])
+        assert cache.get_stats()["disk_hits"] == 1
+
+    def test_disk_tier_is_size_bounded(self, cache_dir):
+        """Test that the disk tier evicts rows beyond its byte budget."""
+        # Each two-dimensional float32 vector occupies 8 bytes
+        cache = EmbeddingCache(cache_dir, max_disk_bytes=16)
+        cache.put_many("m", ["a"], [[1.0, 1.0]])
+        cache.put_many("m", ["b"], [[2.0, 2.0]])
+        cache.put_many("m", ["c"], [[3.0, 3.0]])
+
+        stats = cache.get_stats()
+        assert stats["disk_entries"] == 2
+        assert stats["disk_bytes"] <= 16
+
+    def test_clear(self, cache_dir):
+        """Test clearing both tiers."""
+        cache = EmbeddingCache(cache_dir)
+        cache.put_many("m", ["a"], [[1.0]])
+        cache.clear()
+
+        assert cache.get_many("m", ["a"]) == [None]
+        assert cache.get_stats()["disk_entries"] == 0
@@ -0,0 +1,76 @@
+"""
+Unit tests for the IngestionManifest module.
+"""
+import os
+import pytest
+import tempfile
+from pathlib import Path
+
+from ingestion_manifest import IngestionManifest
+
+
+class TestIngestionManifest:
+    """Test cases for IngestionManifest functionality."""
+
+    @pytest.fixture
+    def workspace(self):
+        """Create a temporary workspace with one document."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            (root / "docs").mkdir()
+            (root / "docs" / "a.txt").write_text("first version")
+            yield root
+
+    def test_new_file(self, workspace):
+        """Test that unknown files are classified as new."""
+        manifest = IngestionManifest(workspace / "manifest.json")
+        assert manifest.classify(workspace / "docs" / "a.txt") == IngestionManifest.NEW
+
+    def test_record_and_reload(self, workspace):
+        """Test that recorded entries survive a save and reload."""
+        doc = workspace / "docs" / "a.txt"
+        manifest = IngestionManifest(workspace / "manifest.json")
+        manifest.record(doc, "source_a", "checksum_a", ["source_a_chunk_0"])
+        manifest.save()
+
+        reloaded = IngestionManifest(workspace / "manifest.json")
+        entry = reloaded.get(doc)
+        assert entry is not None
+        assert entry.chunk_ids == ["source_a_chunk_0"]
+        assert reloaded.classify(doc) == IngestionManifest.UNCHANGED
+
+    def test_touched_file_with_same_checksum_is_unchanged(self, workspace):
+        """Test that an mtime change alone does not trigger re-ingestion."""
+        doc = workspace / "docs" / "a.txt"
+        manifest = IngestionManifest(workspace / "manifest.json")
+        manifest.record(doc, "source_a", "checksum_a", [])
+
+        stat = doc.stat()
+        os.utime(doc, (stat.st_atime, stat.st_mtime + 10))
+
+        assert manifest.classify(doc) == IngestionManifest.CHANGED
+        assert manifest.classify(doc, "checksum_a") == IngestionManifest.UNCHANGED
+        assert manifest.classify(doc) == IngestionManifest.UNCHANGED
+
+    def test_modified_file_is_changed(self, workspace):
+        """Test that different content is classified as changed."""
+        doc = workspace / "docs" / "a.txt"
+        manifest = IngestionManifest(workspace / "manifest.json")
+        manifest.record(doc, "source_a", "checksum_a", [])
+
+        doc.write_text("second, longer version")
+        assert manifest.classify(doc, "checksum_b") == IngestionManifest.CHANGED
+
+    def test_missing_sources(self, workspace):
+        """Test that deleted files under the synced directory are reported."""
+        doc = workspace / "docs" / "a.txt"
+        manifest = IngestionManifest(workspace / "manifest.json")
+        manifest.record(doc, "source_a", "checksum_a", ["source_a_chunk_0"])
+
+        assert manifest.missing_sources(workspace / "docs") == []
+        doc.unlink()
+        missing = manifest.missing_sources(workspace / "docs")
+        assert [entry.source_id for entry in missing] == ["source_a"]
+
+        manifest.remove(missing[0].source_path)
+        assert manifest.get(doc) is None
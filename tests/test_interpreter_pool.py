@@ -0,0 +1,97 @@
+"""
+Unit tests for the InterpreterPool module.
+"""
+import asyncio
+import sys
+import time
+
+import pytest
+
+from interpreter_pool import InterpreterPool
+
+
+class TestInterpreterPool:
+    """Test cases for InterpreterPool functionality."""
+
+    @pytest.mark.asyncio
+    async def test_runs_script_and_captures_output(self):
+        """Test stdout, stderr and exit codes."""
+        pool = InterpreterPool(size=1)
+        try:
+            ok = await pool.run("import sys\nprint('out')\nprint('err', file=sys.stderr)", timeout=10)
+            assert (ok.returncode, ok.stdout, ok.stderr) == (0, "out\n", "err\n")
+
+            failed = await pool.run("raise ValueError('boom')", timeout=10)
+            assert failed.returncode == 1
+            assert "ValueError: boom" in failed.stderr
+
+            exited = await pool.run("import sys\nsys.exit(3)", timeout=10)
+            assert exited.returncode == 3
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_warm_workers_are_reused(self):
+        """Test that runs after start() are served by pre-started workers."""
+        pool = InterpreterPool(size=2)
+        try:
+            await pool.start()
+            await pool.run("pass", timeout=10)
+            await pool.run("pass", timeout=10)
+
+            stats = pool.get_stats()
+            assert stats["warm_starts"] == 2
+            assert stats["cold_starts"] == 0
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_runs_are_isolated(self):
+        """Test that state does not leak between scripts."""
+        pool = InterpreterPool(size=1)
+        try:
+            await pool.run("import builtins\nbuiltins.leaked = 1", timeout=10)
+            result = await pool.run("import builtins\nprint(hasattr(builtins, 'leaked'))", timeout=10)
+            assert result.stdout.strip() == "False"
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_run(self):
+        """Test that a runaway script is killed at the timeout."""
+        pool = InterpreterPool(size=1)
+        try:
+            start = time.perf_counter()
+            result = await pool.run("while True:\n    pass", timeout=0.5)
+            assert result.timed_out
+            assert time.perf_counter() - start < 5
+            assert pool.get_stats()["timeouts"] == 1
+        finally:
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_do_not_block(self):
+        """Test that scripts run concurrently without blocking the loop."""
+        pool = InterpreterPool(size=4)
+        try:
+            await pool.start()
+            start = time.perf_counter()
+            results = await asyncio.gather(*(
+                pool.run("import time\ntime.sleep(0.5)", timeout=10) for _ in range(4)
+            ))
+            assert [r.returncode for r in results] == [0, 0, 0, 0]
+            assert time.perf_counter() - start < 1.5
+        finally:
+            await pool.close()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="resource limits are POSIX only")
+    @pytest.mark.asyncio
+    async def test_memory_limit_enforced(self):
+        """Test that allocations beyond max_memory_mb fail."""
+        pool = InterpreterPool(size=1, max_memory_mb=200)
+        try:
+            result = await pool.run("data = bytearray(512 * 1024 * 1024)", timeout=10)
+            assert result.returncode != 0
+            assert "MemoryError" in result.stderr
+        finally:
+            await pool.close()
@@ -0,0 +1,118 @@
+"""
+Unit tests for the lexical_index module.
+"""
+import pytest
+import tempfile
+from pathlib import Path
+
+from lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+CHUNKS = {
+    "fool": "The Fool is card zero of the Major Arcana, a traveller at the cliff's edge.",
+    "magician": "The Magician channels will; his table holds a cup, a sword, a wand and a pentacle.",
+    "cups": "The suit of cups concerns emotion. The Ace of Cups overflows with water.",
+    "history": "Tarot decks first appeared in fifteenth-century Italy as playing cards.",
+}
+
+
+def build(index_directory=None):
+    index = BM25Index(index_directory)
+    index.add_documents(list(CHUNKS), list(CHUNKS.values()))
+    return index
+
+
+class TestTokenize:
+    """Test cases for the tokenizer."""
+
+    def test_lowercases_and_drops_stopwords(self):
+        """Test basic normalisation."""
+        assert tokenize("The Fool and the Magician") == ["fool", "magician"]
+
+    def test_strips_possessives(self):
+        """Test that possessives match their base word."""
+        assert tokenize("the Fool's journey") == ["fool", "journey"]
+        assert tokenize("the Fool’s journey") == ["fool", "journey"]
+
+
+class TestBM25Index:
+    """Test cases for BM25Index functionality."""
+
+    @pytest.fixture
+    def index_dir(self):
+        """Create a temporary index directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    def test_exact_term_ranks_first(self):
+        """Test that a rare exact term finds its document."""
+        results = build().search("Magician", top_k=2)
+        assert results[0][0] == "magician"
+        assert len(results) == 1
+
+    def test_term_frequency_and_rarity_order_results(self):
+        """Test that repeated rare terms outrank single mentions."""
+        results = build().search("cups card", top_k=4)
+        assert results[0][0] == "cups"
+        assert {doc_id for doc_id, _ in results} == {"cups", "fool"}
+
+    def test_allowed_ids_restrict_results(self):
+        """Test filtering to a set of document IDs."""
+        results = build().search("cups card", allowed_ids={"fool"})
+        assert [doc_id for doc_id, _ in results] == ["fool"]
+
+    def test_unknown_or_empty_query(self):
+        """Test queries with no indexed terms."""
+        index = build()
+        assert index.search("zzz") == []
+        assert index.search("the and of") == []
+
+    def test_remove_and_replace_documents(self):
+        """Test incremental removal and re-indexing."""
+        index = build()
+        index.remove_documents(["magician", "missing"])
+        assert index.search("Magician") == []
+        assert len(index) == 3
+
+        index.add_documents(["cups"], ["Now about the Magician instead."])
+        assert [doc_id for doc_id, _ in index.search("Magician")] == ["cups"]
+        assert index.search("emotion") == []
+        assert len(index) == 3
+
+    def test_postings_persist_across_instances(self, index_dir):
+        """Test that the on-disk index reloads without re-adding documents."""
+        index = build(index_dir)
+        index.remove_documents(["history"])
+        expected = index.search("cups card")
+        index.close()
+
+        reopened = BM25Index(index_dir)
+        assert len(reopened) == 3
+        assert reopened.search("cups card") == expected
+        assert reopened.search("Italy") == []
+        reopened.close()
+
+    def test_clear(self, index_dir):
+        """Test that clearing empties memory and disk."""
+        index = build(index_dir)
+        index.clear()
+        assert index.search("Fool") == []
+        index.close()
+
+        assert len(BM25Index(index_dir)) == 0
+
+
+class TestReciprocalRankFusion:
+    """Test cases for reciprocal-rank fusion."""
+
+    def test_items_in_both_lists_rise(self):
+        """Test that agreement between rankings wins."""
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "b"]], k=60)
+        assert [item for item, _ in fused][:2] == ["c", "b"]
+        assert {item for item, _ in fused} == {"a", "b", "c", "d"}
+
+    def test_scores_follow_formula(self):
+        """Test the 1 / (k + rank) contribution."""
+        fused = dict(reciprocal_rank_fusion([["a"], ["b", "a"]], k=10))
+        assert fused["a"] == pytest.approx(1 / 11 + 1 / 12)
+        assert fused["b"] == pytest.approx(1 / 11)
@@ -5,14 +5,21 @@ Tests all providers, error handling, and edge cases.
 import pytest
 import os
 import asyncio
+import tempfile
+import time
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 import sys
 from datetime import datetime
 
+import httpx
+
 # Add the workspace to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from llm_client import LLMClient, LLMResponse, LLMRequest, OpenAIProvider, OllamaProvider
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from tests.fixtures.ollama_stub import OllamaStubServer
 
 try:
     from openai import RateLimitError
@@ -193,62 +200,207 @@ class TestOpenAIProvider:
 
 
 class TestOllamaProvider:
-    """Test Ollama provider functionality."""
+    """Test Ollama provider functionality against a local stub server."""
+    
+    @pytest.fixture
+    def stub_server(self):
+        """Run a local Ollama API stub."""
+        with OllamaStubServer() as server:
+            yield server
     
     def test_ollama_provider_initialization(self):
         """Test Ollama provider initialization."""
         provider = OllamaProvider()
         assert provider.base_url == "http://localhost:11434"
         assert isinstance(provider.available_models, list)
+        
+        with pytest.raises(ValueError):
+            OllamaProvider(max_concurrent_requests=0)
     
     @pytest.mark.asyncio
-    async def test_ollama_generate(self):
+    async def test_ollama_generate(self, stub_server):
         """Test Ollama generation."""
-        provider = OllamaProvider()
+        provider = OllamaProvider(stub_server.url)
+        assert provider.available_models == ["stub-model"]
         
-        # Mock the requests.post call
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "response": "Test response",
-            "model": "llama2",
-            "done": True,
-            "prompt_eval_count": 10,
-            "eval_count": 5,
-            "context": []
-        }
-        
-        with patch('requests.post', return_value=mock_response):
+        try:
             request = LLMRequest(prompt="Test prompt")
             response = await provider.generate(request)
-            
-            assert response.content == "Test response"
-            assert response.model == "llama2"
-            assert response.provider == "ollama"
+        finally:
+            await provider.aclose()
+        
+        assert response.content == "Hello world"
+        assert response.model == "stub-model"
+        assert response.provider == "ollama"
+        assert response.usage["total_tokens"] == 6
     
     @pytest.mark.asyncio
     async def test_ollama_connection_error(self):
         """Test Ollama connection error handling."""
-        provider = OllamaProvider()
+        provider = OllamaProvider("http://127.0.0.1:9")
         
-        with patch('requests.post', side_effect=Exception("Connection error")):
+        try:
             request = LLMRequest(prompt="Test prompt")
-            with pytest.raises(Exception, match="Connection error"):
+            with pytest.raises(httpx.ConnectError):
                 await provider.generate(request)
+        finally:
+            await provider.aclose()
     
     @pytest.mark.asyncio
-    async def test_ollama_server_error(self):
+    async def test_ollama_server_error(self, stub_server):
         """Test Ollama server error handling."""
-        provider = OllamaProvider()
-        
-        mock_response = MagicMock()
-        mock_response.status_code = 500
-        mock_response.text = "Internal Server Error"
+        provider = OllamaProvider(stub_server.url)
         
-        with patch('requests.post', return_value=mock_response):
-            request = LLMRequest(prompt="Test prompt")
+        try:
+            request = LLMRequest(prompt="Test prompt", model="error")
             with pytest.raises(Exception, match="Ollama API error: 500"):
                 await provider.generate(request)
+        finally:
+            await provider.aclose()
+    
+    @pytest.mark.asyncio
+    async def test_ollama_stream_is_incremental(self, stub_server):
+        """Test that streamed tokens arrive before the response completes."""
+        stub_server.delay = 0.2
+        provider = OllamaProvider(stub_server.url)
+        
+        try:
+            start = time.perf_counter()
+            arrivals = []
+            async for token in provider.generate_stream(LLMRequest(prompt="Test prompt")):
+                arrivals.append((token, time.perf_counter() - start))
+        finally:
+            await provider.aclose()
+        
+        assert "".join(token for token, _ in arrivals) == "Hello world"
+        assert arrivals[0][1] < 0.5
+        assert arrivals[-1][1] >= 0.6
+    
+    @pytest.mark.asyncio
+    async def test_ollama_concurrency_limit_and_pooling(self, stub_server):
+        """Test that generations overlap up to the limit over pooled connections."""
+        stub_server.delay = 0.3
+        provider = OllamaProvider(stub_server.url, max_concurrent_requests=4)
+        
+        try:
+            start = time.perf_counter()
+            # The event loop stays responsive while requests are in flight
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.05)
+                    ticks += 1
+            
+            ticker_task = asyncio.ensure_future(ticker())
+            responses = await asyncio.gather(*(
+                provider.generate(LLMRequest(prompt=f"Prompt {i}")) for i in range(8)
+            ))
+            elapsed = time.perf_counter() - start
+            ticker_task.cancel()
+        finally:
+            await provider.aclose()
+        
+        assert len(responses) == 8
+        assert stub_server.max_in_flight == 4
+        # Two waves of four requests instead of eight sequential ones
+        assert elapsed < 8 * stub_server.delay * 0.6
+        assert ticks >= 5
+        assert len(stub_server.connections) <= 4
+
+
+class TestResponseCaching:
+    """Test the opt-in response cache in LLMClient."""
+    
+    @pytest.fixture
+    def client(self):
+        """Create an LLM client with an in-memory response cache."""
+        client = LLMClient(response_cache=ResponseCache())
+        provider = client.providers[client.primary_provider]
+        counter = {"calls": 0}
+        
+        async def generate(request):
+            counter["calls"] += 1
+            return LLMResponse(
+                content=f"Answer {counter['calls']}", model="m", provider=client.primary_provider
+            )
+        
+        provider.generate = generate
+        client.calls = counter
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_is_served_from_cache(self, client):
+        """Test that an identical request does not reach the provider twice."""
+        first = await client.generate("Outline the book", temperature=0.2)
+        second = await client.generate("Outline the book", temperature=0.2)
+        
+        assert client.calls["calls"] == 1
+        assert second.content == first.content
+        assert second.metadata["cached"] == "true"
+    
+    @pytest.mark.asyncio
+    async def test_key_includes_generation_parameters(self, client):
+        """Test that different parameters miss the cache."""
+        await client.generate("Outline the book", temperature=0.2)
+        await client.generate("Outline the book", temperature=0.9)
+        await client.generate("Outline the book", temperature=0.2, max_tokens=100)
+        await client.generate("Outline the book", temperature=0.2, system_message="Be brief")
+        
+        assert client.calls["calls"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_bypass_and_ttl(self, client):
+        """Test that bypassed calls skip the cache and expired entries are refreshed."""
+        await client.generate("Brainstorm titles")
+        await client.generate("Brainstorm titles", use_cache=False)
+        assert client.calls["calls"] == 2
+        
+        await client.generate("Summarize", cache_ttl=0)
+        await client.generate("Summarize")
+        assert client.calls["calls"] == 4
+    
+    @pytest.mark.asyncio
+    async def test_disk_cache_survives_new_client(self, client):
+        """Test that a replayed build reuses responses persisted on disk."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client.response_cache = ResponseCache.with_disk(temp_dir)
+            await client.generate("Write chapter 1")
+            client.response_cache.close()
+            
+            client.response_cache = ResponseCache.with_disk(temp_dir)
+            response = await client.generate("Write chapter 1")
+            client.response_cache.close()
+        
+        assert client.calls["calls"] == 1
+        assert response.metadata["cached"] == "true"
+
+
+class TestRateLimiting:
+    """Test rate limiting of provider calls in LLMClient."""
+    
+    @pytest.mark.asyncio
+    async def test_calls_are_metered_and_cache_hits_are_free(self):
+        """Test that provider calls pass through the limiter but cache hits do not."""
+        limiter = RateLimiter()
+        client = LLMClient(response_cache=ResponseCache(), rate_limiter=limiter)
+        limiter.set_limits(client.primary_provider, requests_per_minute=100)
+        
+        async def generate(request):
+            return LLMResponse(
+                content="ok", model="m", provider=client.primary_provider,
+                usage={"total_tokens": 12}
+            )
+        
+        client.providers[client.primary_provider].generate = generate
+        await client.generate("Same prompt")
+        await client.generate("Same prompt")
+        await client.generate("Other prompt", use_cache=False)
+        
+        stats = client.get_rate_limit_stats()[client.primary_provider]
+        assert stats["total_requests"] == 2
+        assert stats["total_tokens"] == 24
 
 
 class TestProviderSelection:
@@ -46,6 +46,21 @@ class TestMemoryManagerCore:
         assert isinstance(stats, dict)
         assert 'total_chunks' in stats
         assert 'collection_name' in stats
+    
+    @pytest.mark.asyncio
+    async def test_repeated_text_is_embedded_once(self, memory_manager):
+        """Test that the embedding cache serves repeated texts."""
+        with patch.object(
+            memory_manager, '_generate_local_embeddings', wraps=memory_manager._generate_local_embeddings
+        ) as mock_embed:
+            first = await memory_manager._generate_embedding("The Fool card")
+            second = await memory_manager._generate_embedding("The Fool card")
+        
+        assert mock_embed.call_count == 1
+        assert first == pytest.approx(second, abs=1e-6)
+        stats = memory_manager.get_stats()['embedding_cache']
+        assert stats['misses'] == 1
+        assert stats['memory_hits'] == 1
 
 
 class TestMemoryEntry:
@@ -715,6 +730,260 @@ class TestPerformance:
         assert all(isinstance(result, list) for result in results)
 
 
+class TestBatchedEmbedding:
+    """Test batched embedding and storage."""
+
+    @pytest.fixture
+    def memory_manager(self):
+        """Create memory manager instance with a small batch size."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield MemoryManager(persist_directory=temp_dir, embedding_batch_size=4)
+
+    @pytest.fixture
+    def sample_metadata(self):
+        """Create sample document metadata."""
+        return DocumentMetadata(
+            source_id="batch_source",
+            original_filename="batch.pdf",
+            file_type=".pdf",
+            file_size=100,
+            ingestion_timestamp=datetime.now(),
+            chunk_count=10,
+            checksum="batch_checksum"
+        )
+
+    @pytest.fixture
+    def sample_chunks(self):
+        """Create ten sample document chunks."""
+        return [
+            DocumentChunk(
+                chunk_id=f"batch_{i}",
+                source_id="batch_source",
+                chunk_index=i,
+                content=f"Batched chunk {i}",
+                metadata={"chunk_index": str(i)},
+                word_count=3,
+                char_count=15
+            )
+            for i in range(10)
+        ]
+
+    def test_invalid_batch_settings(self):
+        """Test that batch settings are validated."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(ValueError):
+                MemoryManager(persist_directory=temp_dir, embedding_batch_size=0)
+            with pytest.raises(ValueError):
+                MemoryManager(persist_directory=temp_dir, max_inflight_batches=0)
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_embedded_and_added_in_batches(
+        self, memory_manager, sample_metadata, sample_chunks
+    ):
+        """Test that embedding and collection writes are batched."""
+        embed_batches = []
+
+        async def fake_embeddings(texts):
+            embed_batches.append(len(texts))
+            return [[0.1] * 384 for _ in texts]
+
+        with patch.object(memory_manager, "_generate_embeddings", side_effect=fake_embeddings), \
+             patch.object(memory_manager.collection, "add") as mock_add:
+            result = await memory_manager.store_document_chunks(sample_metadata, sample_chunks)
+
+        assert result == [f"batch_{i}" for i in range(10)]
+        assert embed_batches == [4, 4, 2]
+        assert [len(call.kwargs["ids"]) for call in mock_add.call_args_list] == [4, 4, 2]
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_propagates(
+        self, memory_manager, sample_metadata, sample_chunks
+    ):
+        """Test that a failed batch aborts the store."""
+        async def failing_embeddings(texts):
+            raise RuntimeError("embedding failed")
+
+        with patch.object(memory_manager, "_generate_embeddings", side_effect=failing_embeddings):
+            with pytest.raises(RuntimeError):
+                await memory_manager.store_document_chunks(sample_metadata, sample_chunks)
+
+
+class TestBatchedRetrieval:
+    """Test multi-query retrieval."""
+
+    @pytest.fixture
+    def memory_manager(self):
+        """Create memory manager instance."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield MemoryManager(persist_directory=temp_dir)
+
+    async def store_tarot_chunks(self, memory_manager):
+        """Store a few tarot chunks."""
+        metadata = DocumentMetadata(
+            source_id="tarot_source",
+            original_filename="tarot.pdf",
+            file_type=".pdf",
+            file_size=100,
+            ingestion_timestamp=datetime.now(),
+            chunk_count=3,
+            checksum="tarot_checksum"
+        )
+        contents = [
+            "The Fool begins the journey through the Major Arcana",
+            "The suit of cups is associated with emotion and water",
+            "Astrology links each card to a planet or sign"
+        ]
+        chunks = [
+            DocumentChunk(
+                chunk_id=f"tarot_{i}",
+                source_id="tarot_source",
+                chunk_index=i,
+                content=content,
+                metadata={"chunk_index": str(i)},
+                word_count=len(content.split()),
+                char_count=len(content)
+            )
+            for i, content in enumerate(contents)
+        ]
+        await memory_manager.store_document_chunks(metadata, chunks)
+        return memory_manager
+
+    @pytest.mark.asyncio
+    async def test_queries_share_one_embedding_call_and_one_query(self, memory_manager):
+        """Test that N queries cost one embedding batch and one ChromaDB request."""
+        stored = await self.store_tarot_chunks(memory_manager)
+        queries = ["The Fool", "cups and emotion", "astrology planets"]
+        with patch.object(stored, "_generate_embeddings", wraps=stored._generate_embeddings) as mock_embed, \
+             patch.object(stored.collection, "query", wraps=stored.collection.query) as mock_query:
+            batch = await stored.retrieve_many(queries, top_k=2)
+
+        assert mock_embed.call_count == 1
+        assert mock_query.call_count == 1
+        assert batch.queries == queries
+        assert [len(results) for results in batch.results] == [2, 2, 2]
+        assert batch.results[0][0].chunk_id == "tarot_0"
+        assert batch.results[1][0].chunk_id == "tarot_1"
+
+    @pytest.mark.asyncio
+    async def test_merged_results_are_deduplicated(self, memory_manager):
+        """Test that the merged view keeps each chunk once with its best score."""
+        stored = await self.store_tarot_chunks(memory_manager)
+        batch = await stored.retrieve_many(["The Fool", "Fool journey"], top_k=3)
+
+        merged_ids = [result.chunk_id for result in batch.merged]
+        assert len(merged_ids) == len(set(merged_ids)) == 3
+        scores = [result.score for result in batch.merged]
+        assert scores == sorted(scores, reverse=True)
+        best_fool = max(
+            result.score for results in batch.results for result in results
+            if result.chunk_id == "tarot_0"
+        )
+        assert batch.merged[0].chunk_id == "tarot_0"
+        assert batch.merged[0].score == best_fool
+
+    @pytest.mark.asyncio
+    async def test_matches_single_query_retrieval(self, memory_manager):
+        """Test that batched and single-query retrieval agree."""
+        stored = await self.store_tarot_chunks(memory_manager)
+        batch = await stored.retrieve_many(["cups and emotion"], top_k=3)
+        single = await stored.retrieve_relevant_chunks("cups and emotion", top_k=3)
+
+        assert [r.chunk_id for r in batch.results[0]] == [r.chunk_id for r in single]
+
+    @pytest.mark.asyncio
+    async def test_per_query_filters_are_grouped(self, memory_manager):
+        """Test that each distinct filter costs one request."""
+        stored = await self.store_tarot_chunks(memory_manager)
+        with patch.object(stored.collection, "query", wraps=stored.collection.query) as mock_query:
+            batch = await stored.retrieve_many(
+                ["The Fool", "cups", "astrology"],
+                query_filters=[{"chunk_index": "0"}, {"chunk_index": "1"}, {"chunk_index": "0"}]
+            )
+
+        assert mock_query.call_count == 2
+        assert [r.chunk_id for r in batch.results[0]] == ["tarot_0"]
+        assert [r.chunk_id for r in batch.results[1]] == ["tarot_1"]
+        assert [r.chunk_id for r in batch.results[2]] == ["tarot_0"]
+
+    @pytest.mark.asyncio
+    async def test_empty_and_misaligned_queries(self, memory_manager):
+        """Test edge cases."""
+        batch = await memory_manager.retrieve_many([])
+        assert batch.results == [] and batch.merged == []
+
+        with pytest.raises(ValueError):
+            await memory_manager.retrieve_many(["a", "b"], query_filters=[None])
+
+
+class TestQueryCache:
+    """Test the retrieval result cache."""
+
+    @pytest.fixture
+    def memory_manager(self):
+        """Create memory manager instance."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield MemoryManager(persist_directory=temp_dir)
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_skips_embedding_and_search(self, memory_manager):
+        """Test that a repeated retrieval is served from the cache."""
+        await memory_manager.add_agent_notes(content="The Fool begins the journey", agent_id="writer")
+        first = await memory_manager.retrieve_relevant_chunks("The Fool", top_k=3)
+
+        with patch.object(memory_manager, "_generate_embeddings") as mock_embed, \
+             patch.object(memory_manager.collection, "query") as mock_query:
+            second = await memory_manager.retrieve_relevant_chunks("The Fool", top_k=3)
+
+        assert mock_embed.call_count == 0
+        assert mock_query.call_count == 0
+        assert [r.dict() for r in second] == [r.dict() for r in first]
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_cached_results(self, memory_manager):
+        """Test that adds and deletes are visible to the next retrieval."""
+        first_note = await memory_manager.add_agent_notes(content="The Fool begins", agent_id="writer")
+        assert len(await memory_manager.retrieve_relevant_chunks("The Fool", top_k=5)) == 1
+
+        await memory_manager.add_agent_notes(content="The Fool continues", agent_id="editor")
+        assert len(await memory_manager.retrieve_relevant_chunks("The Fool", top_k=5)) == 2
+
+        await memory_manager.delete_chunks([first_note])
+        results = await memory_manager.retrieve_relevant_chunks("The Fool", top_k=5)
+        assert first_note not in [r.chunk_id for r in results]
+        assert memory_manager.get_stats()["query_cache"]["version"] == 3
+
+
+class TestProvenanceLogging:
+    """Test background provenance logging."""
+
+    @pytest.mark.asyncio
+    async def test_retrievals_are_traceable_to_a_context(self):
+        """Test that chunks retrieved for a chapter can be looked up."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            memory_manager = MemoryManager(persist_directory=temp_dir, enable_provenance_index=True)
+            note_id = await memory_manager.add_agent_notes(
+                content="The Fool begins the journey", agent_id="writer"
+            )
+            await memory_manager.get_context_for_generation(
+                ["The Fool", "journey"], context_id="chapter_1"
+            )
+
+            assert [c["chunk_id"] for c in memory_manager.chunks_for_context("chapter_1")] == [note_id]
+            assert memory_manager.query_provenance(action="agent_note")[0]["chunk_ids"] == [note_id]
+            memory_manager.close()
+
+            with open(Path(temp_dir) / "provenance.log", encoding="utf-8") as f:
+                assert len(f.readlines()) == 3
+
+    def test_query_requires_index(self):
+        """Test that provenance queries need the SQLite index."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            memory_manager = MemoryManager(persist_directory=temp_dir)
+            with pytest.raises(RuntimeError):
+                memory_manager.chunks_for_context("chapter_1")
+            memory_manager.close()
+
+
 class TestIntegration:
     """Test integration with other components."""
     
@@ -0,0 +1,161 @@
+"""
+Unit tests for the ProvenanceLog module.
+"""
+import gzip
+import json
+import threading
+import time
+
+import pytest
+
+from provenance_log import ProvenanceLog, SQLiteProvenanceIndex
+
+
+def retrieval(query, chunk_ids, context_id=None):
+    return {
+        "timestamp": "2024-01-01T00:00:00",
+        "action": "retrieval",
+        "query": query,
+        "context_id": context_id,
+        "result_count": len(chunk_ids),
+        "chunk_ids": chunk_ids,
+        "scores": [1.0 - i / 10 for i in range(len(chunk_ids))]
+    }
+
+
+def read_lines(path):
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class BlockingIndex:
+    """Index stand-in that holds the writer until released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+
+    def write(self, entries):
+        self.release.wait(5)
+        self.batches.append(len(entries))
+
+    def close(self):
+        pass
+
+
+class TestProvenanceLog:
+    """Test cases for ProvenanceLog functionality."""
+
+    def test_events_are_written_as_json_lines(self, tmp_path):
+        """Test that flushed events land in the log in order."""
+        log = ProvenanceLog(tmp_path / "provenance.log")
+        for i in range(50):
+            assert log.append(retrieval(f"q{i}", [f"c{i}"]))
+        log.flush()
+
+        lines = read_lines(tmp_path / "provenance.log")
+        assert [line["query"] for line in lines] == [f"q{i}" for i in range(50)]
+        assert log.get_stats()["written"] == 50
+        log.close()
+
+    def test_append_does_not_wait_for_the_writer(self, tmp_path):
+        """Test that a stalled writer does not slow down appends."""
+        index = BlockingIndex()
+        log = ProvenanceLog(tmp_path / "provenance.log", index=index)
+
+        start = time.perf_counter()
+        for i in range(100):
+            log.append(retrieval(f"q{i}", ["c"]))
+        assert time.perf_counter() - start < 0.5
+
+        index.release.set()
+        log.close()
+        assert sum(index.batches) == 100
+        assert len(index.batches) < 100
+
+    def test_full_queue_drops_and_counts(self, tmp_path):
+        """Test that the bounded queue sheds events instead of blocking."""
+        index = BlockingIndex()
+        log = ProvenanceLog(tmp_path / "provenance.log", max_queue_size=2, index=index)
+
+        assert log.append(retrieval("first", ["c"]))
+        deadline = time.time() + 5
+        while log.get_stats()["queued"] and time.time() < deadline:
+            time.sleep(0.01)
+        assert log.append(retrieval("second", ["c"]))
+        assert log.append(retrieval("third", ["c"]))
+        assert not log.append(retrieval("dropped", ["c"]))
+
+        index.release.set()
+        log.close()
+        assert log.get_stats()["dropped"] == 1
+        assert [line["query"] for line in read_lines(tmp_path / "provenance.log")] == [
+            "first", "second", "third"
+        ]
+
+    def test_rotation_compresses_backups(self, tmp_path):
+        """Test size-based rotation into a bounded set of gzip files."""
+        log = ProvenanceLog(tmp_path / "provenance.log", max_bytes=2048, backup_count=2, batch_size=10)
+        for i in range(200):
+            log.append(retrieval(f"q{i}", [f"chunk_{i}_{j}" for j in range(5)]))
+        log.close()
+
+        assert log.get_stats()["rotations"] > 2
+        assert not (tmp_path / "provenance.3.log.gz").exists()
+        active_path = tmp_path / "provenance.log"
+        files = [tmp_path / "provenance.2.log.gz", tmp_path / "provenance.1.log.gz"]
+        if active_path.exists():
+            files.append(active_path)
+        queries = [int(line["query"][1:]) for path in files for line in read_lines(path)]
+        assert queries == list(range(queries[0], 200))
+
+    def test_close_is_idempotent(self, tmp_path):
+        """Test closing twice."""
+        log = ProvenanceLog(tmp_path / "provenance.log", index=SQLiteProvenanceIndex(tmp_path / "p.sqlite"))
+        log.append(retrieval("q", ["c"]))
+        log.close()
+        log.close()
+        assert len(read_lines(tmp_path / "provenance.log")) == 1
+
+
+class TestSQLiteProvenanceIndex:
+    """Test cases for the queryable provenance index."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        """Create an index with retrievals for two chapters."""
+        index = SQLiteProvenanceIndex(tmp_path / "provenance.sqlite")
+        index.write([
+            {"timestamp": "2024-01-01T00:00:00", "action": "store", "source_id": "deck",
+             "chunk_count": 3, "chunk_ids": ["c1", "c2", "c3"]},
+            retrieval("fool", ["c1", "c2"], context_id="chapter_1"),
+            retrieval("fool journey", ["c1", "c3"], context_id="chapter_1"),
+            retrieval("cups", ["c2"], context_id="chapter_2"),
+        ])
+        yield index
+        index.close()
+
+    def test_chunks_for_context(self, index):
+        """Test tracing a chapter back to the chunks that fed it."""
+        chunks = index.chunks_for_context("chapter_1")
+        assert [chunk["chunk_id"] for chunk in chunks] == ["c1", "c2", "c3"]
+        assert chunks[0]["retrievals"] == 2
+        assert chunks[0]["best_score"] == pytest.approx(1.0)
+        assert index.chunks_for_context("missing") == []
+
+    def test_query_by_chunk_and_action(self, index):
+        """Test indexed event lookups."""
+        events = index.query(chunk_id="c2")
+        assert [event["action"] for event in events] == ["store", "retrieval", "retrieval"]
+        assert events[1]["chunk_ids"] == ["c1", "c2"]
+
+        assert [e["context_id"] for e in index.query(action="retrieval", limit=2)] == ["chapter_1", "chapter_2"]
+        assert index.query(source_id="deck")[0]["chunk_count"] == 3
+
+    def test_events_persist(self, index, tmp_path):
+        """Test reopening the index."""
+        index.close()
+        reopened = SQLiteProvenanceIndex(tmp_path / "provenance.sqlite")
+        assert len(reopened.query(context_id="chapter_1")) == 2
+        reopened.close()
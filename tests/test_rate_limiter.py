@@ -0,0 +1,91 @@
+"""
+Unit tests for the RateLimiter module.
+"""
+import asyncio
+
+import pytest
+
+from rate_limiter import RateLimiter, TokenBucket, get_shared_rate_limiter
+
+
+class TestRateLimiter:
+    """Test cases for RateLimiter functionality."""
+
+    def test_invalid_limits(self):
+        """Test that non-positive limits are rejected."""
+        with pytest.raises(ValueError):
+            RateLimiter().set_limits("openai", requests_per_minute=0)
+
+    def test_shared_limiter_is_process_wide(self):
+        """Test that every caller gets the same shared limiter."""
+        assert get_shared_rate_limiter() is get_shared_rate_limiter()
+
+    def test_has_limits(self):
+        """Test that configured providers are reported."""
+        limiter = RateLimiter()
+        assert not limiter.has_limits("openai")
+        limiter.set_limits("openai", requests_per_minute=60)
+        assert limiter.has_limits("openai")
+        assert not limiter.has_limits("ollama")
+
+    def test_api_config_does_not_override_existing_limits(self):
+        """Test that a second consumer configuring the limiter keeps the first one's limits."""
+        limiter = RateLimiter()
+        limiter.configure_from_api_config({"openai": {"requests_per_minute": 60}, "ollama": {}})
+        limiter.configure_from_api_config({"openai": {"requests_per_minute": 5, "tokens_per_minute": 100}})
+
+        stats = limiter.get_stats()
+        assert stats["openai"]["requests_per_minute"] == 60
+        assert stats["openai"]["tokens_per_minute"] is None
+        assert "ollama" not in stats
+
+    def test_bucket_refills_over_time(self):
+        """Test that an empty bucket reports the time until refill."""
+        bucket = TokenBucket(capacity=10, refill_per_second=100)
+        bucket.consume(10)
+        assert 0 < bucket.time_until_available(5) <= 0.05
+
+    @pytest.mark.asyncio
+    async def test_unlimited_provider_does_not_wait(self):
+        """Test that providers without limits pass straight through."""
+        limiter = RateLimiter()
+        assert await limiter.acquire("ollama", tokens=10**6) == 0.0
+        assert limiter.get_stats() == {}
+
+    @pytest.mark.asyncio
+    async def test_token_budget_paces_concurrent_callers(self):
+        """Test that concurrent calls are spaced by the token budget in FIFO order."""
+        limiter = RateLimiter()
+        # 600 tokens/minute refills 10 tokens per second
+        limiter.set_limits("openai", tokens_per_minute=600)
+        await limiter.acquire("openai", tokens=600)
+
+        order = []
+
+        async def call(index):
+            waited = await limiter.acquire("openai", tokens=2)
+            order.append(index)
+            return waited
+
+        waits = await asyncio.gather(*(call(i) for i in range(3)))
+
+        assert order == [0, 1, 2]
+        # Each caller waits for the refill behind the one before it
+        assert waits == sorted(waits)
+        assert waits[-1] >= 0.5
+        stats = limiter.get_stats()["openai"]
+        assert stats["max_queue_depth"] == 3
+        assert stats["queue_depth"] == 0
+        assert stats["delayed_requests"] == 3
+        assert stats["max_wait_seconds"] >= 0.5
+
+    @pytest.mark.asyncio
+    async def test_overestimates_are_refunded(self):
+        """Test that reconciling actual usage returns unused tokens."""
+        limiter = RateLimiter()
+        limiter.set_limits("openai", tokens_per_minute=600)
+        await limiter.acquire("openai", tokens=600)
+        limiter.record_usage("openai", estimated_tokens=600, actual_tokens=100)
+
+        assert await limiter.acquire("openai", tokens=400) < 0.05
+        assert limiter.get_stats()["openai"]["total_tokens"] == 500
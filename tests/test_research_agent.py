@@ -0,0 +1,272 @@
+"""
+Unit tests for ResearchAgent's concurrent web research and research reuse.
+"""
+import asyncio
+import json
+import re
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from research_agent import ResearchAgent, ResearchTopic
+from research_store import ResearchStore
+
+
+class FakeSearchTools:
+    """Tool manager stand-in returning canned web search hits per query."""
+
+    def __init__(self, hits_by_query, delay=0.05):
+        self.hits_by_query = hits_by_query
+        self.delay = delay
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute_tool(self, request):
+        self.queries.append(request["args"]["query"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        hits = self.hits_by_query.get(request["args"]["query"], [])
+        return SimpleNamespace(status="success", output={"results": hits})
+
+
+class FakeAnalysisClient:
+    """LLM stand-in answering batched analysis prompts with a JSON array."""
+
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.prompts = []
+
+    async def generate(self, prompt, max_tokens, temperature):
+        self.prompts.append(prompt)
+        if self.reply is not None:
+            return SimpleNamespace(content=self.reply)
+        ids = [int(i) for i in re.findall(r"^\s*\[(\d+)\]$", prompt, re.MULTILINE)]
+        entries = [
+            {"id": i, "summary": f"summary {i}", "key_points": [f"point {i}a", f"point {i}b"]}
+            for i in ids
+        ]
+        return SimpleNamespace(content="Here you go:\n" + json.dumps(entries))
+
+
+def make_topic(keywords=("tarot", "history")):
+    return ResearchTopic(
+        topic_id="topic_1",
+        title="Tarot",
+        description="origins",
+        keywords=list(keywords),
+        created_at=datetime.now()
+    )
+
+
+def hit(n, url=None, snippet=None):
+    return {
+        "title": f"Result {n}",
+        "url": url if url is not None else f"https://example.com/{n}",
+        "snippet": snippet or f"Snippet number {n} about the long history of tarot decks, from Italian card games to occult revival in Europe and beyond."
+    }
+
+
+def make_agent(tools, client, **kwargs):
+    return ResearchAgent("r1", memory_manager=None, llm_client=client, tool_manager=tools, **kwargs)
+
+
+class TestWebResearch:
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently(self):
+        tools = FakeSearchTools({})
+        agent = make_agent(tools, FakeAnalysisClient())
+
+        await agent._research_from_web(make_topic())
+
+        assert len(tools.queries) == 3
+        assert tools.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_blank_and_repeated_queries_are_skipped(self):
+        tools = FakeSearchTools({})
+        agent = make_agent(tools, FakeAnalysisClient())
+
+        await agent._research_from_web(make_topic(keywords=()))
+
+        assert tools.queries == ["Tarot origins", "Tarot research findings"]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_dropped_before_llm_work(self):
+        tools = FakeSearchTools({
+            "Tarot origins": [hit(1), hit(2)],
+            "tarot history": [hit(1), hit(3, snippet=hit(2)["snippet"].upper())],
+            "Tarot research findings": [hit(4)],
+        })
+        client = FakeAnalysisClient()
+        agent = make_agent(tools, client)
+
+        results = await agent._research_from_web(make_topic())
+
+        assert [r.source_url for r in results] == [
+            "https://example.com/1", "https://example.com/2", "https://example.com/4"
+        ]
+        assert len({r.result_id for r in results}) == 3
+        assert len(client.prompts) == 1
+        assert results[1].summary == "summary 1"
+        assert results[1].key_points == ["point 1a", "point 1b"]
+
+    @pytest.mark.asyncio
+    async def test_snippets_analysed_in_batches(self):
+        tools = FakeSearchTools({"Tarot origins": [hit(n) for n in range(10)]})
+        client = FakeAnalysisClient()
+        agent = make_agent(tools, client, analysis_batch_size=4)
+
+        results = await agent._research_from_web(make_topic())
+
+        assert len(results) == 10
+        assert len(client.prompts) == 3
+        assert [r.summary for r in results[4:8]] == [f"summary {i}" for i in range(4)]
+
+    @pytest.mark.asyncio
+    async def test_unparseable_reply_falls_back_to_snippet(self):
+        tools = FakeSearchTools({"Tarot origins": [hit(1), hit(2, snippet="Short snippet.")]})
+        agent = make_agent(tools, FakeAnalysisClient(reply="I cannot do that."))
+
+        results = await agent._research_from_web(make_topic())
+
+        assert results[0].summary.startswith(hit(1)["snippet"])
+        assert results[0].key_points == []
+        assert results[1].summary == "Short snippet."
+
+
+class FakeEmbeddingMemory:
+    """Memory manager stand-in that embeds topic text as keyword indicators."""
+
+    VOCABULARY = ["tarot", "origins", "history", "astrology", "stars"]
+
+    async def embed_texts(self, texts):
+        return [
+            [1.0 if word in text.lower() else 0.0 for word in self.VOCABULARY]
+            for text in texts
+        ]
+
+    async def retrieve_many(self, queries, top_k):
+        return SimpleNamespace(queries=queries, results=[[] for _ in queries], merged=[])
+
+    async def add_agent_notes(self, **kwargs):
+        return "note"
+
+
+class FakeRetrievalMemory:
+    """Memory manager stand-in recording batched retrieval calls."""
+
+    def __init__(self, merged):
+        self.merged = merged
+        self.calls = []
+
+    async def retrieve_many(self, queries, top_k):
+        self.calls.append((queries, top_k))
+        return SimpleNamespace(queries=queries, results=[[] for _ in queries], merged=self.merged)
+
+
+class TestMemoryResearch:
+
+    @pytest.mark.asyncio
+    async def test_topic_queries_are_retrieved_in_one_batch(self):
+        chunk = SimpleNamespace(
+            content=hit(1)["snippet"], chunk_id="chunk_1", score=0.8,
+            metadata={"original_filename": "tarot.pdf"}
+        )
+        memory = FakeRetrievalMemory([chunk])
+        agent = ResearchAgent("r1", memory, FakeAnalysisClient(), FakeSearchTools({}))
+
+        results = await agent._research_from_memory(make_topic(keywords=("tarot", "history", "tarot")))
+
+        assert memory.calls == [(["Tarot origins tarot history tarot", "tarot", "history"], agent.max_memory_results)]
+        assert [r.citations for r in results] == [["chunk_1"]]
+        assert results[0].source_title == "tarot.pdf"
+        assert results[0].summary == "summary 0"
+
+
+class FakeSummaryClient(FakeAnalysisClient):
+    """Analysis stand-in that also answers research-summary prompts."""
+
+    async def generate(self, prompt, max_tokens, temperature):
+        if "JSON array" in prompt:
+            return await super().generate(prompt, max_tokens, temperature)
+        self.prompts.append(prompt)
+        return SimpleNamespace(content="- Tarot began as a card game")
+
+
+async def run_topic(agent, topic):
+    agent.active_topics[topic.topic_id] = topic
+    await agent._conduct_research(topic.topic_id)
+
+
+class TestResearchStoreReuse:
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = ResearchStore(tmp_path)
+        yield store
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_processed_sources_reused_across_runs(self, store):
+        hits = {"Tarot origins": [hit(1), hit(2)]}
+        first_client = FakeAnalysisClient()
+        await make_agent(FakeSearchTools(hits), first_client, research_store=store)._research_from_web(make_topic())
+
+        hits["Tarot origins"].append(hit(3))
+        second_client = FakeAnalysisClient()
+        results = await make_agent(
+            FakeSearchTools(hits), second_client, research_store=store
+        )._research_from_web(make_topic())
+
+        assert [r.summary for r in results[:2]] == ["summary 0", "summary 1"]
+        assert len(second_client.prompts) == 1
+        assert "[1]" not in second_client.prompts[0]
+        assert hit(3)["snippet"] in second_client.prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_topic_reuses_stored_research(self, store):
+        hits = {"Tarot origins": [hit(1), hit(2)]}
+        first = ResearchAgent(
+            "r1", FakeEmbeddingMemory(), FakeSummaryClient(), FakeSearchTools(hits), research_store=store
+        )
+        await run_topic(first, make_topic())
+
+        tools = FakeSearchTools(hits)
+        client = FakeSummaryClient()
+        second = ResearchAgent("r2", FakeEmbeddingMemory(), client, tools, research_store=store)
+        topic = make_topic()
+        topic.topic_id = "topic_2"
+        topic.keywords = ["tarot", "origins", "history"]
+        await run_topic(second, topic)
+
+        assert topic.status == "completed"
+        assert tools.queries == []
+        assert client.prompts == []
+        results = await second.get_research_results("topic_2")
+        assert [r.source_url for r in results] == ["https://example.com/1", "https://example.com/2"]
+        assert all(r.topic_id == "topic_2" for r in results)
+        summary = await second.get_research_summary("topic_2")
+        assert summary.topic_id == "topic_2"
+
+    @pytest.mark.asyncio
+    async def test_unrelated_topic_is_researched_afresh(self, store):
+        hits = {"Tarot origins": [hit(1)], "Astrology stars": [hit(9)]}
+        first = ResearchAgent(
+            "r1", FakeEmbeddingMemory(), FakeSummaryClient(), FakeSearchTools(hits), research_store=store
+        )
+        await run_topic(first, make_topic())
+
+        tools = FakeSearchTools(hits)
+        second = ResearchAgent("r2", FakeEmbeddingMemory(), FakeSummaryClient(), tools, research_store=store)
+        topic = make_topic(keywords=())
+        topic.topic_id, topic.title, topic.description = "topic_2", "Astrology", "stars"
+        await run_topic(second, topic)
+
+        assert "Astrology stars" in tools.queries
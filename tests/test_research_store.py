@@ -0,0 +1,112 @@
+"""
+Unit tests for the ResearchStore module.
+"""
+import pytest
+import tempfile
+import time
+from pathlib import Path
+
+from research_store import ResearchStore, content_hash, normalize_url
+
+
+def source(url, content="Tarot decks began as Italian card games.", summary="Italian origins"):
+    return {
+        "url": url,
+        "source_type": "web",
+        "title": "History of tarot",
+        "content": content,
+        "summary": summary,
+        "key_points": ["Italy", "Card games"]
+    }
+
+
+class TestNormalisation:
+    """Test cases for URL and content normalisation."""
+
+    def test_equivalent_urls_normalise_together(self):
+        """Test that cosmetic URL differences are ignored."""
+        expected = normalize_url("https://example.com/tarot?a=1&b=2")
+        assert normalize_url("HTTPS://www.Example.com/tarot/?b=2&a=1#intro") == expected
+        assert normalize_url("https://example.com/tarot?a=1&utm_source=x&b=2&fbclid=y") == expected
+        assert normalize_url("https://example.com/other") != expected
+
+    def test_missing_url(self):
+        """Test that blank URLs normalise to an empty string."""
+        assert normalize_url(None) == ""
+        assert normalize_url("  ") == ""
+
+    def test_content_hash_ignores_case_and_whitespace(self):
+        """Test that content hashes collapse whitespace and case."""
+        assert content_hash("The  Fool\nbegins") == content_hash("the fool begins")
+        assert content_hash("the fool begins") != content_hash("the fool ends")
+        assert content_hash("   ") == ""
+
+
+class TestResearchStore:
+    """Test cases for ResearchStore functionality."""
+
+    @pytest.fixture
+    def store_dir(self):
+        """Create a temporary store directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    def test_sources_found_by_url_or_content(self, store_dir):
+        """Test lookups by normalised URL and by content hash."""
+        store = ResearchStore(store_dir)
+        store.put_sources([source("https://example.com/tarot")])
+
+        by_url, by_content, missing = store.get_sources(
+            ["https://www.example.com/tarot/", "https://mirror.example.org/copy", "https://example.com/new"],
+            ["Different text", "tarot decks began as  Italian card games.", "Unseen text"]
+        )
+
+        assert by_url["summary"] == "Italian origins"
+        assert by_url["key_points"] == ["Italy", "Card games"]
+        assert by_content["summary"] == "Italian origins"
+        assert missing is None
+        assert store.get_stats()["source_hits"] == 2
+        store.close()
+
+    def test_sources_survive_restart(self, store_dir):
+        """Test that sources persist across store instances."""
+        store = ResearchStore(store_dir)
+        store.put_sources([source("https://example.com/tarot")])
+        store.close()
+
+        reopened = ResearchStore(store_dir)
+        assert reopened.get_sources(["https://example.com/tarot"], [""])[0] is not None
+        reopened.close()
+
+    def test_sources_expire_after_ttl(self, store_dir):
+        """Test that expired sources are not served and are purged."""
+        store = ResearchStore(store_dir, source_ttl=0.05)
+        store.put_sources([source("https://example.com/tarot")])
+        time.sleep(0.1)
+
+        assert store.get_sources(["https://example.com/tarot"], [""]) == [None]
+        assert store.purge_expired() == 1
+        store.close()
+
+    def test_similar_topic_reused_above_threshold(self, store_dir):
+        """Test embedding-similarity matching of topics."""
+        store = ResearchStore(store_dir, topic_similarity_threshold=0.9)
+        store.put_topic("t1", "Tarot history", [1.0, 0.0, 0.0], {"title": "Tarot history", "results": []})
+
+        match = store.find_similar_topic([0.95, 0.1, 0.0])
+        assert match["title"] == "Tarot history"
+        assert match["similarity"] > 0.9
+
+        assert store.find_similar_topic([0.0, 1.0, 0.0]) is None
+        assert store.find_similar_topic([1.0, 0.0]) is None
+        assert store.get_stats()["topic_hits"] == 1
+        store.close()
+
+    def test_topics_expire_after_ttl(self, store_dir):
+        """Test that expired topics are not matched."""
+        store = ResearchStore(store_dir, topic_ttl=0.05)
+        store.put_topic("t1", "Tarot history", [1.0, 0.0], {"title": "Tarot history"})
+        time.sleep(0.1)
+
+        assert store.find_similar_topic([1.0, 0.0]) is None
+        store.close()
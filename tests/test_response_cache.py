@@ -0,0 +1,72 @@
+"""
+Unit tests for the ResponseCache module.
+"""
+import pytest
+import tempfile
+import time
+from pathlib import Path
+
+from response_cache import MemoryCacheBackend, ResponseCache, SQLiteCacheBackend
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache functionality."""
+
+    @pytest.fixture
+    def cache_dir(self):
+        """Create a temporary cache directory."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield Path(temp_dir)
+
+    def test_key_covers_every_parameter(self):
+        """Test that changing any generation parameter changes the key."""
+        base = ("ollama", "llama2", "system", "prompt", 0.7, 2000)
+        key = ResponseCache.make_key(*base)
+        assert key == ResponseCache.make_key(*base)
+
+        for index, value in enumerate(["openai", "mistral", None, "other", 0.2, 100]):
+            changed = list(base)
+            changed[index] = value
+            assert ResponseCache.make_key(*changed) != key
+
+    def test_memory_backend_is_lru_bounded(self):
+        """Test that the memory backend evicts the least recently used entry."""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set("a", {"content": "A"})
+        backend.set("b", {"content": "B"})
+        backend.get("a")
+        backend.set("c", {"content": "C"})
+
+        assert backend.get("b") is None
+        assert backend.get("a") == ({"content": "A"}, None)
+
+    def test_ttl_expiry(self, cache_dir):
+        """Test that expired entries are not served from any backend."""
+        cache = ResponseCache.with_disk(cache_dir)
+        cache.set("k", {"content": "stale"}, ttl=0.05)
+        assert cache.get("k") == {"content": "stale"}
+
+        time.sleep(0.1)
+        assert cache.get("k") is None
+        assert len(cache.backends[1]) == 0
+
+    def test_disk_hits_are_promoted_to_memory(self, cache_dir):
+        """Test that a disk hit is copied into the memory backend."""
+        cache = ResponseCache.with_disk(cache_dir)
+        cache.set("k", {"content": "kept"})
+        cache.close()
+
+        reopened = ResponseCache.with_disk(cache_dir)
+        assert len(reopened.backends[0]) == 0
+        assert reopened.get("k") == {"content": "kept"}
+        assert len(reopened.backends[0]) == 1
+        assert reopened.get_stats()["hits"] == 1
+
+    def test_clear(self, cache_dir):
+        """Test clearing every backend."""
+        cache = ResponseCache([MemoryCacheBackend(), SQLiteCacheBackend(cache_dir)])
+        cache.set("k", {"content": "x"})
+        cache.clear()
+
+        assert cache.get("k") is None
+        assert cache.get_stats()["misses"] == 1
@@ -0,0 +1,67 @@
+"""
+Unit tests for the RetrievalCache module.
+"""
+
+from retrieval_cache import RetrievalCache
+
+RESULTS = [{"content": "The Fool", "chunk_id": "c1", "source_id": "deck", "score": 0.9, "metadata": {}}]
+
+
+class TestRetrievalCache:
+    """Test cases for RetrievalCache functionality."""
+
+    def test_keys_cover_every_parameter(self):
+        """Test that each retrieval parameter changes the key."""
+        cache = RetrievalCache()
+        base = dict(model="m", query="fool", filter_metadata={"a": "1"}, top_k=5, min_score=0.0)
+        key = cache.make_key(**base)
+
+        for change in (
+            {"model": "other"}, {"query": "cups"}, {"filter_metadata": None},
+            {"top_k": 6}, {"min_score": 0.5}
+        ):
+            assert cache.make_key(**{**base, **change}) != key
+        assert cache.make_key(**{**base, "filter_metadata": {"a": "1"}}) == key
+
+    def test_results_round_trip(self):
+        """Test storing and reading results."""
+        cache = RetrievalCache()
+        key = cache.make_key("m", "fool", None, 5, 0.0)
+        assert cache.get(key) is None
+
+        cache.set(key, RESULTS)
+        assert cache.get(key) == RESULTS
+        assert cache.get_stats()["hits"] == 1
+
+    def test_version_bump_invalidates(self):
+        """Test that a collection change makes earlier results unreachable."""
+        cache = RetrievalCache()
+        stale_key = cache.make_key("m", "fool", None, 5, 0.0)
+        cache.set(stale_key, RESULTS)
+
+        cache.bump_version()
+
+        assert cache.get(cache.make_key("m", "fool", None, 5, 0.0)) is None
+        assert cache.get(stale_key) is None
+        assert cache.get_stats()["version"] == 1
+
+    def test_results_stored_under_an_old_version_are_not_served(self):
+        """Test that a retrieval racing a write cannot publish stale results."""
+        cache = RetrievalCache()
+        version = cache.version
+        cache.bump_version()
+
+        # The in-flight retrieval finishes after the write
+        cache.set(cache.make_key("m", "fool", None, 5, 0.0, version), RESULTS)
+
+        assert cache.get(cache.make_key("m", "fool", None, 5, 0.0)) is None
+
+    def test_entries_are_bounded(self):
+        """Test the default LRU size."""
+        cache = RetrievalCache(max_entries=2)
+        keys = [cache.make_key("m", f"q{i}", None, 5, 0.0) for i in range(3)]
+        for key in keys:
+            cache.set(key, RESULTS)
+
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[2]) == RESULTS
@@ -0,0 +1,120 @@
+"""
+Unit tests for the StreamingProcess module.
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import time
+
+import pytest
+
+from agent_manager import AgentManager, TaskStatus
+from streaming_process import OutputChunk, StreamingProcess
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="uses /bin/sh")
+
+
+def shell(command, timeout=10):
+    return StreamingProcess(["/bin/sh", "-c", command], timeout=timeout)
+
+
+def pid_alive(pid):
+    """True if the process exists and is not a zombie awaiting reaping."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return True
+
+
+class TestStreamingProcess:
+    """Test cases for StreamingProcess functionality."""
+
+    @pytest.mark.asyncio
+    async def test_output_arrives_before_exit(self):
+        """Test that chunks are yielded while the process is still running."""
+        process = shell("echo first; sleep 0.5; echo second")
+        start = time.perf_counter()
+        arrivals = []
+
+        async for chunk in process.stream():
+            arrivals.append((chunk, time.perf_counter() - start))
+
+        assert arrivals[0][0] == OutputChunk("stdout", "first\n")
+        assert arrivals[0][1] < 0.4
+        assert process.stdout == "first\nsecond\n"
+        assert process.returncode == 0
+
+    @pytest.mark.asyncio
+    async def test_streams_are_separated_and_hashed(self):
+        """Test per-stream accumulation and incremental hashes."""
+        process = await shell("printf 'out'; printf 'err' >&2; exit 4").run()
+
+        assert process.stdout == "out"
+        assert process.stderr == "err"
+        assert process.returncode == 4
+        assert process.hashes == {
+            "stdout": hashlib.sha256(b"out").hexdigest(),
+            "stderr": hashlib.sha256(b"err").hexdigest()
+        }
+
+    @pytest.mark.asyncio
+    async def test_no_output_has_empty_hash(self):
+        """Test that silent streams hash to an empty string."""
+        process = await shell("true").run()
+        assert process.hashes == {"stdout": "", "stderr": ""}
+
+    @pytest.mark.asyncio
+    async def test_multibyte_characters_split_across_reads(self):
+        """Test decoding when a character straddles two reads."""
+        process = StreamingProcess(
+            [sys.executable, "-c", "import sys; sys.stdout.write('é' * 50)"],
+            read_size=3
+        )
+        await process.run()
+        assert process.stdout == "é" * 50
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_process_group(self):
+        """Test that a timeout kills the shell and its children."""
+        process = shell("sleep 30 & echo $!; wait", timeout=0.5)
+        start = time.perf_counter()
+        await process.run()
+
+        child = int(process.stdout.split()[0])
+        assert process.timed_out
+        assert process.returncode is None
+        assert time.perf_counter() - start < 5
+        await asyncio.sleep(0.1)
+        assert not pid_alive(child)
+
+    @pytest.mark.asyncio
+    async def test_cancel_task_kills_process(self):
+        """Test that AgentManager.cancel_task stops a streaming command."""
+        started = asyncio.Event()
+        pids = []
+
+        class ShellAgent:
+            async def execute_task(self, task_type, payload):
+                process = shell("echo $$; sleep 30", timeout=60)
+                async for chunk in process.stream():
+                    pids.append(int(chunk.data))
+                    started.set()
+
+        manager = AgentManager()
+        manager.register_agent(ShellAgent(), "tool_agent", "tool", [])
+        await manager.start()
+        task_id = await manager.submit_task("tool_agent", "run", {})
+        await asyncio.wait_for(started.wait(), 5)
+
+        assert await manager.cancel_task(task_id)
+        await asyncio.sleep(0.2)
+        await manager.stop()
+
+        assert manager.tasks[task_id].status == TaskStatus.CANCELLED
+        assert not pid_alive(pids[0])
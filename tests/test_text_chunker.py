@@ -0,0 +1,77 @@
+"""
+Unit tests for the TextChunker module.
+"""
+import pytest
+
+from text_chunker import TextChunker, approximate_token_count
+
+
+def word_count(text):
+    """Count whitespace-separated words as tokens."""
+    return len(text.split())
+
+
+class TestTextChunker:
+    """Test cases for TextChunker functionality."""
+
+    def test_invalid_settings(self):
+        """Test that impossible sizes are rejected."""
+        with pytest.raises(ValueError):
+            TextChunker(chunk_size=0)
+        with pytest.raises(ValueError):
+            TextChunker(chunk_size=10, chunk_overlap=10)
+
+    def test_offsets_map_back_to_source(self):
+        """Test that every chunk is the exact source span it reports."""
+        text = "  First sentence here!  Second one?\n\nThird \"quoted.\" Fourth... Fifth."
+        chunker = TextChunker(chunk_size=30, chunk_overlap=10)
+
+        chunks = chunker.chunk_text(text)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert text[chunk.start:chunk.end] == chunk.content
+        assert chunks[0].content.startswith("First sentence here!")
+        assert chunks[-1].content.endswith("Fifth.")
+
+    def test_token_aware_sizing_and_overlap(self):
+        """Test that chunks respect a pluggable token budget and overlap."""
+        text = " ".join(f"Sentence number {i} has six words." for i in range(10))
+        chunker = TextChunker(chunk_size=20, chunk_overlap=6, token_counter=word_count)
+
+        chunks = chunker.chunk_text(text)
+
+        assert all(chunk.token_count <= 20 for chunk in chunks)
+        for previous, current in zip(chunks, chunks[1:]):
+            # The last whole sentence is carried into the next chunk
+            last_sentence = "Sentence number " + previous.content.rsplit("Sentence number ", 1)[1]
+            assert current.content.startswith(last_sentence)
+            assert current.start < previous.end
+
+    def test_oversized_sentence_is_split_at_words(self):
+        """Test that a sentence larger than a chunk is split between words."""
+        text = "word " * 50
+        chunker = TextChunker(chunk_size=12, chunk_overlap=0, token_counter=word_count)
+
+        chunks = chunker.chunk_text(text)
+
+        assert len(chunks) == 5
+        assert all(chunk.content.split() == ["word"] * chunk.token_count for chunk in chunks)
+
+    def test_parts_carry_sentences_and_labels(self):
+        """Test that sentences span parts and chunks report part labels."""
+        pages = [("Page one starts a", 1), ("sentence that ends here. Page two.", 2), ("Three.", 3)]
+        joined = "\n".join(text for text, _ in pages)
+        chunker = TextChunker(chunk_size=45, chunk_overlap=0)
+
+        chunks = list(chunker.iter_chunks(pages))
+
+        assert [chunk.content for chunk in chunks] == [c.content for c in chunker.chunk_text(joined)]
+        assert chunks[0].content == "Page one starts a\nsentence that ends here."
+        assert (chunks[0].first_label, chunks[0].last_label) == (1, 2)
+        assert (chunks[-1].first_label, chunks[-1].last_label) == (2, 3)
+
+    def test_approximate_token_count(self):
+        """Test the default token estimate used for context budgets."""
+        assert approximate_token_count("a" * 40) == 10
+        assert approximate_token_count("a") == 1
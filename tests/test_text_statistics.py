@@ -0,0 +1,103 @@
+"""
+Unit tests for the text statistics module.
+"""
+import time
+
+import pytest
+
+import numpy as np
+
+import text_statistics
+
+from text_statistics import (
+    _terminology_drift, compute_text_statistics, consistency_score, readability_score, split_sections
+)
+
+
+PLAIN = (
+    "The team built a small garden. They planted beans and peas in spring. "
+    "Every morning they watered the rows. By summer the garden was full of green plants. "
+)
+DENSE = (
+    "Notwithstanding considerable methodological heterogeneity, contemporary epidemiological "
+    "investigations systematically demonstrate statistically significant associations "
+    "between socioeconomic characteristics and cardiovascular morbidity. "
+)
+
+
+class TestTextStatistics:
+    """Test cases for local text statistics."""
+
+    def test_readability_orders_plain_above_dense(self):
+        """Test Flesch scores separate plain and dense prose."""
+        plain = compute_text_statistics(PLAIN * 5)
+        dense = compute_text_statistics(DENSE * 5)
+
+        assert plain.flesch_reading_ease > dense.flesch_reading_ease
+        assert plain.flesch_kincaid_grade < dense.flesch_kincaid_grade
+        assert readability_score(plain) > readability_score(dense)
+        assert dense.lexical_density > plain.lexical_density
+
+    def test_sentence_lengths_and_passive_voice(self):
+        """Test sentence length statistics and passive-voice detection."""
+        text = "The report was written by Ana. Ana read it. The results were carefully checked by Ben."
+        stats = compute_text_statistics(text)
+
+        assert stats.sentence_count == 3
+        assert stats.word_count == 16
+        assert stats.sentence_length_mean == pytest.approx(16 / 3)
+        assert stats.sentence_length_variance > 0
+        assert stats.passive_voice_ratio == pytest.approx(2 / 3)
+
+    def test_terminology_drift(self):
+        """Test that swapping a key term between sections registers as drift."""
+        steady = "# One\nThe model uses a neural network. The network learns weights.\n" \
+                 "# Two\nThe network improves as the model trains. The network is evaluated."
+        drifting = "# One\nThe model uses a neural network. The network learns weights.\n" \
+                   "# Two\nThe model trains a classifier. The model predicts labels."
+
+        assert len(split_sections(steady)) == 2
+        steady_stats = compute_text_statistics(steady)
+        drifting_stats = compute_text_statistics(drifting)
+        assert steady_stats.terminology_drift < drifting_stats.terminology_drift
+        assert consistency_score(steady_stats) > consistency_score(drifting_stats)
+
+    def test_terminology_drift_keeps_widely_used_terms(self):
+        """Test that capping the vocabulary keeps the terms shared between sections."""
+        # Term 0 appears in both sections; terms 1 and 2 repeat within one section each
+        word_ids = np.array([0, 1, 1, 0, 2, 2])
+        word_sections = np.array([0, 0, 0, 1, 1, 1])
+        is_content = np.ones(3, dtype=bool)
+
+        assert _terminology_drift(word_ids, word_sections, is_content, 2, max_terms=1) == pytest.approx(0.0)
+        assert _terminology_drift(word_ids, word_sections, is_content, 2) > 0.0
+
+    def test_empty_text(self):
+        """Test that empty text yields neutral scores."""
+        stats = compute_text_statistics("")
+
+        assert stats.word_count == 0
+        assert readability_score(stats) == 0.5
+        assert consistency_score(stats) == 0.7
+
+    def test_manuscript_scores_quickly(self, monkeypatch):
+        """Test that per-word work scales with the vocabulary, not the manuscript length."""
+        manuscript = "\n\n".join(f"# Chapter {i}\n" + PLAIN * 80 for i in range(20))
+        scored = []
+        syllable_counts = text_statistics._syllable_counts
+
+        def counting(words):
+            scored.append(len(words))
+            return syllable_counts(words)
+
+        monkeypatch.setattr(text_statistics, "_syllable_counts", counting)
+
+        started = time.perf_counter()
+        stats = compute_text_statistics(manuscript)
+        elapsed = time.perf_counter() - started
+
+        assert stats.word_count > 40000
+        assert len(scored) == 1
+        assert scored[0] < stats.word_count / 100
+        # Generous bound: a per-occurrence implementation takes far longer
+        assert elapsed < 10
@@ -0,0 +1,133 @@
+"""
+Unit tests for the ToolResultCache module.
+"""
+import asyncio
+import time
+
+import pytest
+
+from response_cache import ResponseCache
+from tool_result_cache import ToolResultCache
+
+
+class CountingTool:
+    """Tool stand-in that counts executions and returns response data."""
+
+    def __init__(self, status="success", delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    async def run(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"status": self.status, "output": {"results": [self.calls]}}
+
+
+class TestToolResultCache:
+    """Test cases for ToolResultCache functionality."""
+
+    def test_keys_canonicalise_arguments(self):
+        """Test that argument order does not affect the key."""
+        key = ToolResultCache.make_key("web_search", {"query": "tarot", "limit": 5})
+        assert key == ToolResultCache.make_key("web_search", {"limit": 5, "query": "tarot"})
+        assert key != ToolResultCache.make_key("web_search", {"query": "tarot", "limit": 6})
+        assert key != ToolResultCache.make_key("other_tool", {"query": "tarot", "limit": 5})
+
+    @pytest.mark.asyncio
+    async def test_successful_results_are_reused(self):
+        """Test that a repeated call is served from the cache."""
+        cache = ToolResultCache()
+        tool = CountingTool()
+
+        first, first_cached = await cache.get_or_run("web_search", {"query": "tarot"}, tool.run)
+        second, second_cached = await cache.get_or_run("web_search", {"query": "tarot"}, tool.run)
+
+        assert tool.calls == 1
+        assert (first_cached, second_cached) == (False, True)
+        assert second == first
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["by_tool"]["web_search"] == {"hits": 1, "misses": 1, "coalesced": 0}
+
+    @pytest.mark.asyncio
+    async def test_failed_results_are_not_cached(self):
+        """Test that error responses are executed again."""
+        cache = ToolResultCache()
+        tool = CountingTool(status="error")
+
+        await cache.get_or_run("web_search", {"query": "tarot"}, tool.run)
+        await cache.get_or_run("web_search", {"query": "tarot"}, tool.run)
+
+        assert tool.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_copies(self):
+        """Test that mutating a returned result does not corrupt the cache."""
+        cache = ToolResultCache()
+        tool = CountingTool()
+
+        first, _ = await cache.get_or_run("web_search", {"query": "tarot"}, tool.run)
+        first["output"]["results"].append("mutated")
+        second, _ = await cache.get_or_run("web_search", {"query": "tarot"}, tool.run)
+
+        assert second["output"]["results"] == [1]
+
+    @pytest.mark.asyncio
+    async def test_ttl_expires_results(self):
+        """Test that results expire after the per-call TTL."""
+        cache = ToolResultCache()
+        tool = CountingTool()
+
+        await cache.get_or_run("web_search", {"query": "tarot"}, tool.run, ttl=0.05)
+        time.sleep(0.1)
+        await cache.get_or_run("web_search", {"query": "tarot"}, tool.run, ttl=0.05)
+
+        assert tool.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_calls_execute_once(self):
+        """Test that in-flight calls are coalesced."""
+        cache = ToolResultCache()
+        tool = CountingTool(delay=0.1)
+
+        results = await asyncio.gather(*(
+            cache.get_or_run("web_search", {"query": "tarot"}, tool.run) for _ in range(5)
+        ))
+
+        assert tool.calls == 1
+        assert [cached for _, cached in results].count(False) == 1
+        assert cache.get_stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_waiters_retry_when_leader_is_cancelled(self):
+        """Test that cancelling the first call does not cancel coalesced callers."""
+        cache = ToolResultCache()
+        tool = CountingTool(delay=0.1)
+
+        leader = asyncio.ensure_future(cache.get_or_run("web_search", {"query": "tarot"}, tool.run))
+        await asyncio.sleep(0.01)
+        follower = asyncio.ensure_future(cache.get_or_run("web_search", {"query": "tarot"}, tool.run))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        result, _ = await follower
+        assert result["status"] == "success"
+        assert tool.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_results_persist_with_disk_backend(self, tmp_path):
+        """Test memoization across cache instances sharing a disk store."""
+        tool = CountingTool()
+        first = ToolResultCache(ResponseCache.with_disk(tmp_path))
+        await first.get_or_run("web_search", {"query": "tarot"}, tool.run)
+        first.cache.close()
+
+        second = ToolResultCache(ResponseCache.with_disk(tmp_path))
+        _, cached = await second.get_or_run("web_search", {"query": "tarot"}, tool.run)
+        second.cache.close()
+
+        assert cached
+        assert tool.calls == 1
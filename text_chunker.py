@@ -0,0 +1,306 @@
+"""
+Text Chunker Module
+
+Splits text into overlapping, sentence-aligned chunks sized by a pluggable
+token counter. Chunking works over character offsets into the source, so it
+runs in linear time and every chunk records the exact span it came from.
+
+Chosen libraries:
+- re: Sentence boundary detection that keeps the original punctuation
+- collections.deque: Sliding window of sentences
+- tiktoken (optional): Exact token counts for OpenAI models
+
+Pattern: Streaming sliding-window chunker over sentence segments
+"""
+
+import logging
+import re
+from collections import deque
+from functools import lru_cache, partial
+from typing import Callable, Deque, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A sentence ends at a run of terminal punctuation, optionally followed by
+# closing quotes or brackets, and then whitespace
+SENTENCE_BOUNDARY = re.compile(r'([.!?]+["\'”’)\]]*)(\s+)')
+WORD = re.compile(r'\S+')
+BOUNDARY_CHARS = frozenset('.!?"\'”’)]')
+
+
+def character_count(text: str) -> int:
+    """Count characters; sizes chunks in characters."""
+    return len(text)
+
+
+def approximate_token_count(text: str) -> int:
+    """Estimate tokens as one per four characters, as MemoryManager budgets."""
+    return max(1, len(text) // 4)
+
+
+def tiktoken_token_counter(encoding_name: str = "cl100k_base") -> Callable[[str], int]:
+    """
+    Build an exact token counter backed by tiktoken.
+
+    The counter is picklable, so it can be handed to worker processes.
+
+    Args:
+        encoding_name: Name of the tiktoken encoding
+
+    Returns:
+        Function returning the number of tokens in a text
+    """
+    _get_tiktoken_encoding(encoding_name)
+    return partial(_count_tiktoken_tokens, encoding_name)
+
+
+@lru_cache(maxsize=None)
+def _get_tiktoken_encoding(encoding_name: str):
+    """Load a tiktoken encoding once per process."""
+    try:
+        import tiktoken
+    except ImportError as e:
+        raise ValueError("Exact token counting requires the tiktoken package") from e
+
+    return tiktoken.get_encoding(encoding_name)
+
+
+def _count_tiktoken_tokens(encoding_name: str, text: str) -> int:
+    """Count tokens with a tiktoken encoding."""
+    return len(_get_tiktoken_encoding(encoding_name).encode(text, disallowed_special=()))
+
+
+class TextSegment(NamedTuple):
+    """A sentence (or part of one) located in the source text."""
+    start: int
+    end: int
+    text: str
+    gap: str
+    token_count: int
+    first_label: Optional[int]
+    last_label: Optional[int]
+
+
+class TextChunk(NamedTuple):
+    """A chunk of source text with its exact character span."""
+    content: str
+    start: int
+    end: int
+    token_count: int
+    first_label: Optional[int]
+    last_label: Optional[int]
+
+
+class TextChunker:
+    """
+    Sentence-aligned chunker with token-aware sizing.
+
+    Responsibilities:
+    - Split text into sentences without losing punctuation or whitespace
+    - Group sentences into chunks of at most ``chunk_size`` tokens
+    - Carry whole trailing sentences of up to ``chunk_overlap`` tokens forward
+    - Record source offsets and part labels (e.g. page numbers) per chunk
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        token_counter: Optional[Callable[[str], int]] = None
+    ):
+        """
+        Initialize the chunker.
+
+        Args:
+            chunk_size: Maximum number of tokens per chunk
+            chunk_overlap: Maximum number of tokens repeated from the previous chunk
+            token_counter: Function counting tokens in a text (defaults to characters)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be non-negative and smaller than chunk_size")
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.token_counter = token_counter or character_count
+
+    def chunk_text(self, text: str) -> List[TextChunk]:
+        """Chunk a complete text; offsets index into ``text``."""
+        return list(self.iter_chunks([(text, None)]))
+
+    def iter_chunks(self, parts: Iterable[Tuple[str, Optional[int]]]) -> Iterator[TextChunk]:
+        """
+        Lazily chunk a text delivered in labelled parts.
+
+        Parts are treated as joined by newlines, and offsets index into that
+        joined text. Sentences may span parts; each chunk reports the labels
+        of the first and last part it touches.
+
+        Args:
+            parts: (text, label) pairs, e.g. (page text, page number)
+
+        Yields:
+            Chunks in source order
+        """
+        window: Deque[TextSegment] = deque()
+        window_tokens = 0
+
+        for segment in self._iter_segments(parts):
+            if window and window_tokens + segment.token_count > self.chunk_size:
+                yield self._make_chunk(window, window_tokens)
+
+                # Keep whole trailing sentences as overlap, leaving room for the next one
+                while window and (
+                    window_tokens > self.chunk_overlap
+                    or window_tokens + segment.token_count > self.chunk_size
+                ):
+                    window_tokens -= window.popleft().token_count
+
+            window.append(segment)
+            window_tokens += segment.token_count
+
+        if window:
+            yield self._make_chunk(window, window_tokens)
+
+    def _iter_segments(self, parts: Iterable[Tuple[str, Optional[int]]]) -> Iterator[TextSegment]:
+        """
+        Split labelled parts into sentence segments with source offsets.
+
+        Sentences longer than the chunk size are further split at word
+        boundaries.
+        """
+        buffer = ""
+        buffer_start = 0
+        part_end = 0
+        # (offset, label) of the parts overlapping the buffer
+        labels: Deque[Tuple[int, Optional[int]]] = deque()
+
+        def label_at(offset: int) -> Optional[int]:
+            label = labels[0][1]
+            for start, part_label in labels:
+                if start > offset:
+                    break
+                label = part_label
+            return label
+
+        def segment(start: int, end: int, next_start: int) -> Optional[TextSegment]:
+            text = buffer[start - buffer_start:end - buffer_start]
+            stripped = text.lstrip()
+            if not stripped:
+                return None
+            start += len(text) - len(stripped)
+            return TextSegment(
+                start=start,
+                end=end,
+                text=stripped,
+                gap=buffer[end - buffer_start:next_start - buffer_start],
+                token_count=self.token_counter(stripped),
+                first_label=label_at(start),
+                last_label=label_at(end - 1)
+            )
+
+        for index, (text, label) in enumerate(parts):
+            separator = "\n" if index else ""
+            labels.append((part_end + len(separator), label))
+
+            # Only the tail of the carried text can start a boundary that
+            # completes in the new part, so the rest is not scanned again
+            scan_from = len(buffer)
+            while scan_from and (buffer[scan_from - 1].isspace()
+                                 or buffer[scan_from - 1] in BOUNDARY_CHARS):
+                scan_from -= 1
+
+            buffer += separator + text
+            part_end += len(separator) + len(text)
+
+            consumed = 0
+            for match in SENTENCE_BOUNDARY.finditer(buffer, scan_from):
+                # Whitespace at the end of the buffer may continue into the next part
+                if match.end() == len(buffer):
+                    break
+                found = segment(buffer_start + consumed, buffer_start + match.end(1),
+                                buffer_start + match.end())
+                if found:
+                    yield from self._fit(found, label_at)
+                consumed = match.end()
+
+            buffer = buffer[consumed:]
+            buffer_start += consumed
+            while len(labels) > 1 and labels[1][0] <= buffer_start:
+                labels.popleft()
+
+        if buffer:
+            end = buffer_start + len(buffer.rstrip())
+            found = segment(buffer_start, end, buffer_start + len(buffer))
+            if found:
+                yield from self._fit(found, label_at)
+
+    def _fit(
+        self,
+        sentence: TextSegment,
+        label_at: Callable[[int], Optional[int]]
+    ) -> Iterator[TextSegment]:
+        """Split a sentence that exceeds the chunk size at word boundaries."""
+        if sentence.token_count <= self.chunk_size:
+            yield sentence
+            return
+
+        words = [
+            (match.start(), match.end(), self.token_counter(match.group()))
+            for match in WORD.finditer(sentence.text)
+        ]
+        piece_start = 0
+        piece_tokens = 0
+        for i, (start, _end, tokens) in enumerate(words):
+            if piece_tokens and piece_tokens + tokens > self.chunk_size:
+                yield self._sub_segment(sentence, label_at, words[piece_start][0], words[i - 1][1], start)
+                piece_start = i
+                piece_tokens = 0
+            piece_tokens += tokens
+
+        last_start = words[piece_start][0]
+        yield self._sub_segment(sentence, label_at, last_start, words[-1][1], None)
+
+    def _sub_segment(
+        self,
+        sentence: TextSegment,
+        label_at: Callable[[int], Optional[int]],
+        start: int,
+        end: int,
+        next_start: Optional[int]
+    ) -> TextSegment:
+        """Build a segment covering part of a sentence."""
+        text = sentence.text[start:end]
+        gap = sentence.text[end:next_start] if next_start is not None else sentence.gap
+        start += sentence.start
+        end += sentence.start
+        return TextSegment(
+            start=start,
+            end=end,
+            text=text,
+            gap=gap,
+            token_count=self.token_counter(text),
+            first_label=label_at(start),
+            last_label=label_at(end - 1)
+        )
+
+    @staticmethod
+    def _make_chunk(window: Deque[TextSegment], window_tokens: int) -> TextChunk:
+        """Assemble a chunk from the segments in the window."""
+        last = window[-1]
+        content = "".join(segment.text + segment.gap for segment in window)
+        content = content[:len(content) - len(last.gap)]
+        labels = [
+            label for segment in window
+            for label in (segment.first_label, segment.last_label)
+            if label is not None
+        ]
+        return TextChunk(
+            content=content,
+            start=window[0].start,
+            end=last.end,
+            token_count=window_tokens,
+            first_label=min(labels) if labels else None,
+            last_label=max(labels) if labels else None
+        )
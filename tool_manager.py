@@ -5,8 +5,7 @@ Implements an MCP-style registry, sandboxing policy, safe execution, and logging
 Manages tool registration, execution, and safety controls.
 
 Chosen libraries:
-- subprocess: Safe subprocess execution
-- asyncio: Asynchronous tool execution
+- asyncio: Asynchronous tool execution and subprocess streaming
 - pydantic: Data validation and type safety
 - json: Tool result serialization
 
@@ -19,17 +18,19 @@ import hashlib
 import json
 import logging
 import os
-import subprocess
-import tempfile
 import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 import pydantic
 
+from interpreter_pool import InterpreterPool
+from streaming_process import OutputChunk, StreamingProcess
+from tool_result_cache import ToolResultCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -72,6 +73,8 @@ class ToolDefinition(pydantic.BaseModel):
     max_memory_mb: int = 100
     allowed_directories: List[str] = []
     environment_variables: Dict[str, str] = {}
+    cacheable: bool = False  # Whether identical calls may reuse a successful result
+    cache_ttl: Optional[float] = None  # Seconds a cached result stays valid (None: cache default)
 
 
 class Tool(ABC):
@@ -85,6 +88,26 @@ class Tool(ABC):
         """Execute the tool with given arguments."""
         pass
     
+    async def stream(self, args: Dict[str, Any]) -> AsyncIterator[Union[OutputChunk, ToolResponse]]:
+        """
+        Execute the tool, yielding output as it is produced.
+        
+        Tools that cannot stream yield only their final response.
+        
+        Yields:
+            OutputChunk items followed by the final ToolResponse
+        """
+        yield await self.execute(args)
+    
+    async def aclose(self):
+        """
+        Release resources held by the tool.
+        
+        Intentionally a no-op by default; tools holding processes or
+        connections override it.
+        """
+        return None
+    
     def validate_args(self, args: Dict[str, Any]) -> bool:
         """Validate tool arguments."""
         # Check required parameters
@@ -103,7 +126,21 @@ class Tool(ABC):
 
 
 class PythonScriptTool(Tool):
-    """Tool for executing Python scripts."""
+    """Tool for executing Python scripts in pooled interpreter workers."""
+    
+    def __init__(self, definition: ToolDefinition, pool: Optional[InterpreterPool] = None):
+        """
+        Initialize the Python script tool.
+        
+        Args:
+            definition: Tool definition
+            pool: Interpreter pool to run scripts in (one is created if None)
+        """
+        super().__init__(definition)
+        self.pool = pool or InterpreterPool(
+            max_memory_mb=definition.max_memory_mb,
+            cwd=definition.allowed_directories[0] if definition.allowed_directories else None
+        )
     
     async def execute(self, args: Dict[str, Any]) -> ToolResponse:
         """Execute a Python script."""
@@ -126,99 +163,21 @@ class PythonScriptTool(Tool):
                     error_message="No script provided"
                 )
             
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(script)
-                temp_file = f.name
-            
-            try:
-                # Execute script in subprocess
-                result = subprocess.run(
-                    ["python", temp_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=self.definition.timeout,
-                    cwd=self.definition.allowed_directories[0] if self.definition.allowed_directories else None
-                )
-                
-                runtime = time.time() - start_time
-                
-                # Calculate hashes
-                hashes = {
-                    "script": hashlib.sha256(script.encode()).hexdigest(),
-                    "stdout": hashlib.sha256(result.stdout.encode()).hexdigest() if result.stdout else "",
-                    "stderr": hashlib.sha256(result.stderr.encode()).hexdigest() if result.stderr else ""
-                }
-                
-                return ToolResponse(
-                    status="success" if result.returncode == 0 else "error",
-                    output=result.stdout,
-                    stdout=result.stdout,
-                    stderr=result.stderr,
-                    runtime=runtime,
-                    hashes=hashes,
-                    error_message=result.stderr if result.returncode != 0 else ""
-                )
-                
-            finally:
-                # Clean up temporary file
-                os.unlink(temp_file)
-                
-        except subprocess.TimeoutExpired:
-            return ToolResponse(
-                status="timeout",
-                output=None,
-                runtime=time.time() - start_time,
-                error_message=f"Tool execution timed out after {self.definition.timeout} seconds"
-            )
-        except Exception as e:
-            return ToolResponse(
-                status="error",
-                output=None,
-                runtime=time.time() - start_time,
-                error_message=str(e)
-            )
-
-
-class ShellCommandTool(Tool):
-    """Tool for executing shell commands."""
-    
-    async def execute(self, args: Dict[str, Any]) -> ToolResponse:
-        """Execute a shell command."""
-        start_time = time.time()
-        
-        try:
-            # Validate arguments
-            if not self.validate_args(args):
-                return ToolResponse(
-                    status="error",
-                    output=None,
-                    error_message="Invalid arguments"
-                )
+            # Execute script in a fresh, pre-started interpreter
+            result = await self.pool.run(script, timeout=self.definition.timeout)
+            runtime = time.time() - start_time
             
-            command = args.get("command", "")
-            if not command:
+            if result.timed_out:
                 return ToolResponse(
-                    status="error",
+                    status="timeout",
                     output=None,
-                    error_message="No command provided"
+                    runtime=runtime,
+                    error_message=f"Tool execution timed out after {self.definition.timeout} seconds"
                 )
             
-            # Execute command
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=self.definition.timeout,
-                cwd=self.definition.allowed_directories[0] if self.definition.allowed_directories else None
-            )
-            
-            runtime = time.time() - start_time
-            
             # Calculate hashes
             hashes = {
-                "command": hashlib.sha256(command.encode()).hexdigest(),
+                "script": hashlib.sha256(script.encode()).hexdigest(),
                 "stdout": hashlib.sha256(result.stdout.encode()).hexdigest() if result.stdout else "",
                 "stderr": hashlib.sha256(result.stderr.encode()).hexdigest() if result.stderr else ""
             }
@@ -233,20 +192,101 @@ class ShellCommandTool(Tool):
                 error_message=result.stderr if result.returncode != 0 else ""
             )
             
-        except subprocess.TimeoutExpired:
+        except Exception as e:
             return ToolResponse(
-                status="timeout",
+                status="error",
                 output=None,
                 runtime=time.time() - start_time,
-                error_message=f"Tool execution timed out after {self.definition.timeout} seconds"
+                error_message=str(e)
             )
+    
+    async def aclose(self):
+        """Stop the tool's idle interpreter workers."""
+        await self.pool.close()
+
+
+class ShellCommandTool(Tool):
+    """Tool for executing shell commands with streamed output."""
+    
+    @staticmethod
+    def _shell_argv(command: str) -> List[str]:
+        """Build the argv that runs a command line through the platform shell."""
+        if os.name == "nt":
+            return ["cmd", "/c", command]
+        return ["/bin/sh", "-c", command]
+    
+    async def execute(self, args: Dict[str, Any]) -> ToolResponse:
+        """Execute a shell command."""
+        response = None
+        async for item in self.stream(args):
+            response = item
+        return response
+    
+    async def stream(self, args: Dict[str, Any]) -> AsyncIterator[Union[OutputChunk, ToolResponse]]:
+        """Execute a shell command, yielding stdout/stderr chunks and then the response."""
+        start_time = time.time()
+        
+        # Validate arguments
+        if not self.validate_args(args):
+            yield ToolResponse(
+                status="error",
+                output=None,
+                error_message="Invalid arguments"
+            )
+            return
+        
+        command = args.get("command", "")
+        if not command:
+            yield ToolResponse(
+                status="error",
+                output=None,
+                error_message="No command provided"
+            )
+            return
+        
+        process = StreamingProcess(
+            self._shell_argv(command),
+            timeout=self.definition.timeout,
+            cwd=self.definition.allowed_directories[0] if self.definition.allowed_directories else None
+        )
+        
+        try:
+            async for chunk in process.stream():
+                yield chunk
         except Exception as e:
-            return ToolResponse(
+            yield ToolResponse(
                 status="error",
                 output=None,
                 runtime=time.time() - start_time,
                 error_message=str(e)
             )
+            return
+        
+        runtime = time.time() - start_time
+        
+        if process.timed_out:
+            yield ToolResponse(
+                status="timeout",
+                output=None,
+                stdout=process.stdout,
+                stderr=process.stderr,
+                runtime=runtime,
+                error_message=f"Tool execution timed out after {self.definition.timeout} seconds"
+            )
+            return
+        
+        # Hashes were computed incrementally while streaming
+        hashes = {"command": hashlib.sha256(command.encode()).hexdigest(), **process.hashes}
+        
+        yield ToolResponse(
+            status="success" if process.returncode == 0 else "error",
+            output=process.stdout,
+            stdout=process.stdout,
+            stderr=process.stderr,
+            runtime=runtime,
+            hashes=hashes,
+            error_message=process.stderr if process.returncode != 0 else ""
+        )
 
 
 class WebSearchTool(Tool):
@@ -328,7 +368,9 @@ class ToolManager:
         self,
         allow_unsafe: bool = False,
         allow_restricted: bool = False,
-        log_file: Optional[str] = None
+        log_file: Optional[str] = None,
+        python_workers: int = 2,
+        result_cache: Optional[ToolResultCache] = None
     ):
         """
         Initialize the tool manager.
@@ -337,11 +379,15 @@ class ToolManager:
             allow_unsafe: Whether to allow unsafe tools
             allow_restricted: Whether to allow restricted tools
             log_file: Path to log file for tool executions
+            python_workers: Warm interpreters kept ready for Python scripts
+            result_cache: Memoization store for cacheable tools (in-memory if None)
         """
         self.allow_unsafe = allow_unsafe
         self.allow_restricted = allow_restricted
         self.tools: Dict[str, Tool] = {}
         self.log_file = log_file or "tool_executions.log"
+        self.python_workers = python_workers
+        self.result_cache = result_cache if result_cache is not None else ToolResultCache()
         
         # Initialize with default tools
         self._register_default_tools()
@@ -363,7 +409,14 @@ class ToolManager:
             max_memory_mb=100,
             allowed_directories=[str(Path.cwd())]
         )
-        self.register_tool(PythonScriptTool(python_tool_def))
+        self.register_tool(PythonScriptTool(
+            python_tool_def,
+            pool=InterpreterPool(
+                size=self.python_workers,
+                max_memory_mb=python_tool_def.max_memory_mb,
+                cwd=python_tool_def.allowed_directories[0]
+            )
+        ))
         
         # Shell command tool (restricted)
         shell_tool_def = ToolDefinition(
@@ -389,7 +442,9 @@ class ToolManager:
                 "query": {"type": str, "description": "Search query"}
             },
             required_parameters=["query"],
-            timeout=10
+            timeout=10,
+            cacheable=True,
+            cache_ttl=6 * 3600
         )
         self.register_tool(WebSearchTool(search_tool_def))
     
@@ -436,6 +491,88 @@ class ToolManager:
         Returns:
             Tool execution response
         """
+        denied = self._check_permissions(request)
+        if denied is not None:
+            return denied
+        
+        tool = self.tools[request.tool_name]
+        
+        # Execute tool, reusing a memoized result for cacheable tools
+        try:
+            cached = False
+            if tool.definition.cacheable:
+                data, cached = await self.result_cache.get_or_run(
+                    request.tool_name,
+                    request.args,
+                    lambda: self._execute_as_dict(tool, request.args),
+                    ttl=tool.definition.cache_ttl
+                )
+                response = ToolResponse(**data)
+            else:
+                response = await tool.execute(request.args)
+            
+            # Log execution
+            await self._log_execution(request, response, cached=cached)
+            
+            return response
+            
+        except Exception as e:
+            error_response = ToolResponse(
+                status="error",
+                output=None,
+                error_message=str(e)
+            )
+            await self._log_execution(request, error_response)
+            return error_response
+    
+    @staticmethod
+    async def _execute_as_dict(tool: Tool, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a tool and return its response as cacheable data."""
+        return (await tool.execute(args)).dict()
+    
+    async def stream_tool(self, request: ToolRequest) -> AsyncIterator[Union[OutputChunk, ToolResponse]]:
+        """
+        Execute a tool with safety checks, yielding output as it is produced.
+        
+        Cancelling the consuming task (e.g. via AgentManager.cancel_task)
+        kills any process the tool started.
+        
+        Args:
+            request: Tool execution request
+            
+        Yields:
+            OutputChunk items followed by the final ToolResponse
+        """
+        denied = self._check_permissions(request)
+        if denied is not None:
+            yield denied
+            return
+        
+        tool = self.tools[request.tool_name]
+        if tool.definition.cacheable:
+            # Cached tools return whole results; serve them as a single item
+            yield await self.execute_tool(request)
+            return
+        
+        response = None
+        try:
+            async for item in tool.stream(request.args):
+                if isinstance(item, ToolResponse):
+                    response = item
+                yield item
+        except Exception as e:
+            response = ToolResponse(
+                status="error",
+                output=None,
+                error_message=str(e)
+            )
+            yield response
+        finally:
+            if response is not None:
+                await self._log_execution(request, response)
+    
+    def _check_permissions(self, request: ToolRequest) -> Optional[ToolResponse]:
+        """Return an error response if the tool is missing or not permitted."""
         # Check if tool exists
         if request.tool_name not in self.tools:
             return ToolResponse(
@@ -461,25 +598,9 @@ class ToolManager:
                 error_message=f"Tool {request.tool_name} requires unsafe permissions"
             )
         
-        # Execute tool
-        try:
-            response = await tool.execute(request.args)
-            
-            # Log execution
-            await self._log_execution(request, response)
-            
-            return response
-            
-        except Exception as e:
-            error_response = ToolResponse(
-                status="error",
-                output=None,
-                error_message=str(e)
-            )
-            await self._log_execution(request, error_response)
-            return error_response
+        return None
     
-    async def _log_execution(self, request: ToolRequest, response: ToolResponse):
+    async def _log_execution(self, request: ToolRequest, response: ToolResponse, cached: bool = False):
         """Log tool execution."""
         log_entry = {
             "timestamp": datetime.now().isoformat(),
@@ -490,12 +611,21 @@ class ToolManager:
             "status": response.status,
             "runtime": response.runtime,
             "hashes": response.hashes,
-            "error_message": response.error_message
+            "error_message": response.error_message,
+            "cached": cached
         }
         
         with open(self.log_file, "a", encoding="utf-8") as f:
             f.write(json.dumps(log_entry) + "\n")
     
+    async def aclose(self):
+        """Release resources held by registered tools."""
+        for tool in self.tools.values():
+            try:
+                await tool.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close tool {tool.definition.name}: {e}")
+    
     def update_safety_settings(
         self,
         allow_unsafe: Optional[bool] = None,
@@ -527,6 +657,11 @@ class ToolManager:
             for tool in self.tools.values():
                 category_counts[tool.definition.category.value] += 1
             stats["tools_by_category"] = category_counts
+            stats["result_cache"] = self.result_cache.get_stats()
+            
+            python_tool = self.tools.get("python_script")
+            if isinstance(python_tool, PythonScriptTool):
+                stats["python_workers"] = python_tool.pool.get_stats()
             
             return stats
             
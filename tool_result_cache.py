@@ -0,0 +1,146 @@
+"""
+Tool Result Cache Module
+
+Memoizes tool results keyed on the tool name and its canonicalised
+arguments, so identical calls from different agents (e.g. the same web
+search issued by several research components) execute once. Storage is a
+ResponseCache, so results can live in memory, on disk, or both, with a
+per-tool time to live. Identical calls that arrive while the first is still
+running wait for its result instead of executing again.
+
+Chosen libraries:
+- hashlib: Cache key derivation
+- json: Argument canonicalisation
+- asyncio: Coalescing of concurrent identical calls
+
+Pattern: Read-through memoization with single-flight execution
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class ToolResultCache:
+    """
+    Memoization layer for tool executions.
+
+    Responsibilities:
+    - Derive cache keys from tool names and canonicalised arguments
+    - Serve cached results and store successful new ones
+    - Coalesce concurrent identical calls into one execution
+    - Track hits, misses and coalesced calls per tool
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        """
+        Initialize the tool result cache.
+
+        Args:
+            cache: Backing store for results (defaults to an in-memory LRU)
+        """
+        self.cache = cache if cache is not None else ResponseCache()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def canonicalize_args(args: Dict[str, Any]) -> str:
+        """Serialise arguments so that equivalent dicts produce the same text."""
+        return json.dumps(args, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+    @classmethod
+    def make_key(cls, tool_name: str, args: Dict[str, Any]) -> str:
+        """Build the cache key for a tool call."""
+        material = f"{tool_name}\n{cls.canonicalize_args(args)}"
+        return "tool:" + hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _count(self, tool_name: str, outcome: str):
+        counts = self._stats.setdefault(tool_name, {"hits": 0, "misses": 0, "coalesced": 0})
+        counts[outcome] += 1
+
+    async def get_or_run(
+        self,
+        tool_name: str,
+        args: Dict[str, Any],
+        run: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: Optional[float] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return a cached result, or run the tool and cache a successful result.
+
+        Args:
+            tool_name: Name of the tool
+            args: Tool arguments
+            run: Coroutine factory executing the tool and returning response data
+            ttl: Seconds before the cached result expires (None uses the cache default)
+
+        Returns:
+            Response data and whether it was served without executing the tool
+        """
+        key = self.make_key(tool_name, args)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count(tool_name, "hits")
+            return copy.deepcopy(cached), True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._count(tool_name, "coalesced")
+            try:
+                return copy.deepcopy(await asyncio.shield(pending)), True
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The call we were waiting on was cancelled; run it ourselves
+                return await self.get_or_run(tool_name, args, run, ttl)
+
+        self._count(tool_name, "misses")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await run()
+            if result.get("status") == "success":
+                self.cache.set(key, copy.deepcopy(result), ttl)
+            future.set_result(result)
+            return result, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark retrieved so an unobserved failure is not logged
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, tool_name: str, args: Dict[str, Any]):
+        """Drop the cached result for one tool call."""
+        self.cache.invalidate(self.make_key(tool_name, args))
+
+    def clear(self):
+        """Drop every cached tool result."""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters overall and per tool."""
+        totals = {"hits": 0, "misses": 0, "coalesced": 0}
+        for counts in self._stats.values():
+            for outcome, value in counts.items():
+                totals[outcome] += value
+
+        served = totals["hits"] + totals["coalesced"]
+        calls = served + totals["misses"]
+        return {
+            **totals,
+            "hit_rate": served / calls if calls else 0.0,
+            "by_tool": {name: dict(counts) for name, counts in self._stats.items()}
+        }
@@ -258,13 +258,18 @@ class WriterAgent:
         """Gather research content using RAG."""
         research_parts = []
         
-        # Search memory for relevant content
-        query = f"{outline.title} {' '.join(outline.key_points)}"
+        # Search memory for the chapter and each section in one batched retrieval
+        queries = [f"{outline.title} {' '.join(outline.key_points)}"]
+        queries.extend(
+            f"{outline.title} {section.get('title', '')} {section.get('content', '')}".strip()
+            for section in outline.sections
+        )
         
         try:
             context, retrieval_results = await self.memory_manager.get_context_for_generation(
-                query=query,
-                max_tokens=3000
+                query=list(dict.fromkeys(queries)),
+                max_tokens=3000,
+                context_id=outline.chapter_id
             )
             research_parts.append(context)
         except Exception as e: